@@ -0,0 +1,175 @@
+import os
+import time
+import json
+import hashlib
+import logging
+import sqlite3
+import threading
+
+
+LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE_ENABLED", "1") == "1"
+LLM_CACHE_PATH = os.environ.get(
+    "LLM_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "instance", "llm_cache.db"),
+)
+# Seconds a cached response stays valid (default 30 days)
+LLM_CACHE_TTL = int(os.environ.get("LLM_CACHE_TTL", str(30 * 24 * 3600)))
+# Least recently used responses are evicted above this many entries
+LLM_CACHE_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", "50000"))
+# Expired and overflowing responses are evicted every this many writes, or sooner once the cache is full
+LLM_CACHE_EVICT_EVERY = int(os.environ.get("LLM_CACHE_EVICT_EVERY", "500"))
+
+
+class LLMCache:
+    """Persistent SQLite cache of LLM responses keyed by (model, prompt, input hash)"""
+
+    def __init__(self, path=LLM_CACHE_PATH, ttl=LLM_CACHE_TTL, max_entries=LLM_CACHE_MAX_ENTRIES, evict_every=LLM_CACHE_EVICT_EVERY):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+        # upper bound of the cached responses (writes may replace rows), recounted by every eviction
+        self.entries = None
+        self.writes_since_evict = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+        self.connection = None
+
+    def connect(self):
+        if self.connection is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self.connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL
+                )
+                """
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_llm_cache_last_used_at ON llm_cache (last_used_at)"
+            )
+            self.connection.commit()
+            self.entries = self.connection.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        return self.connection
+
+    def make_key(self, model, prompt, query, **options):
+        """Hash the model, the prompt and the input into a cache key"""
+        input_hash = hashlib.sha256(str(query).encode("utf-8")).hexdigest()
+        raw = json.dumps([model, prompt, input_hash, options], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Return the cached response, or None when it is missing or expired"""
+        now = time.time()
+        with self.lock:
+            connection = self.connect()
+            row = connection.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    connection.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    connection.commit()
+                self.misses += 1
+                return None
+            connection.execute(
+                "UPDATE llm_cache SET last_used_at = ? WHERE key = ?", (now, key)
+            )
+            connection.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key, model, response):
+        now = time.time()
+        with self.lock:
+            connection = self.connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, response, created_at, last_used_at) VALUES (?, ?, ?, ?, ?)",
+                (key, model, response, now, now),
+            )
+            self.entries += 1
+            self.writes_since_evict += 1
+            if self.entries > self.max_entries or self.writes_since_evict >= self.evict_every:
+                self.evict(connection, now)
+            connection.commit()
+
+    def evict(self, connection, now):
+        """Drop expired responses, then the least recently used ones above max_entries.
+
+        A full cache is trimmed a tenth below max_entries, so it is not evicted again on the next write.
+        """
+        expired = connection.execute(
+            "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,)
+        ).rowcount
+        entries = connection.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        overflow = 0
+        if entries > self.max_entries:
+            overflow = entries - (self.max_entries - self.max_entries // 10)
+            connection.execute(
+                "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY last_used_at ASC LIMIT ?)",
+                (overflow,),
+            )
+        self.entries = entries - overflow
+        self.writes_since_evict = 0
+        self.evictions += max(expired, 0) + overflow
+
+    def lookup(self, model, prompt, query, **options):
+        """Return (key, cached response); the key is None when the cache is disabled or failing"""
+        if not LLM_CACHE_ENABLED:
+            return None, None
+        try:
+            key = self.make_key(model, prompt, query, **options)
+            return key, self.get(key)
+        except sqlite3.Error as e:
+            logging.error(f"LLM cache lookup failed: {e}")
+            return None, None
+
+    def store(self, key, model, response):
+        if key is None or response is None:
+            return
+        try:
+            self.set(key, model, response)
+        except sqlite3.Error as e:
+            logging.error(f"LLM cache store failed: {e}")
+
+    def cached(self, model, prompt, query, fetch, **options):
+        """Return the cached response for this call, calling fetch() and storing its result on a miss"""
+        key, response = self.lookup(model, prompt, query, **options)
+        if response is not None:
+            return response
+        response = fetch()
+        self.store(key, model, response)
+        return response
+
+    async def acached(self, model, prompt, query, fetch, **options):
+        """Same as cached(), for a coroutine function fetch"""
+        key, response = self.lookup(model, prompt, query, **options)
+        if response is not None:
+            return response
+        response = await fetch()
+        self.store(key, model, response)
+        return response
+
+    def stats(self):
+        """Return hit/miss counters and the number of cached responses"""
+        with self.lock:
+            entries = self.connect().execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+        }
+
+
+llm_cache = LLMCache()
@@ -25,6 +25,10 @@ class Opportunity(db.Model):
     url = db.Column(db.String(512), unique=True)
     found = db.Column(db.Boolean, default=False, nullable=False)
     three_matched_scores_and_recommended_partners_ids = db.Column(db.Text)
+    # hash of the scraped detail page (or of the extracted fields), unchanged pages skip re-extraction
+    fingerprint = db.Column(db.String(64))
+    # last write of the row, the reports are rebuilt when it moves
+    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow, index=True)
 
 
 
@@ -38,6 +42,63 @@ class Partner(db.Model):
     website = db.Column(db.String(512))
     linkedindata = db.Column(JSON)
 
+class Embedding(db.Model):
+    __tablename__ = 'embedding'
+
+    id = db.Column(db.Integer, primary_key=True)
+    owner_type = db.Column(db.String(32), nullable=False)  # 'opportunity' or 'partner'
+    owner_id = db.Column(db.Integer, nullable=False)
+    text_hash = db.Column(db.String(64), nullable=False)  # hash of the embedded text
+    vector = db.Column(db.LargeBinary, nullable=False)  # float32 array
+
+    __table_args__ = (
+        db.UniqueConstraint('owner_type', 'owner_id', name='uq_embedding_owner'),
+    )
+
+class CrawlState(db.Model):
+    __tablename__ = 'crawl_state'
+
+    bank = db.Column(db.String(128), primary_key=True)
+    # JSON list of the newest listing URLs seen, the high-water mark of incremental crawls
+    last_seen_urls = db.Column(db.Text)
+    last_published = db.Column(db.String(64))  # newest publish date seen, when the source has one
+    last_mode = db.Column(db.String(16))  # 'incremental' or 'full'
+    new_projects = db.Column(db.Integer, default=0, nullable=False)
+    last_crawl_at = db.Column(db.DateTime)
+    last_full_crawl_at = db.Column(db.DateTime)
+    # checkpoint of an unfinished crawl: JSON listing cursor and detail URLs still to extract
+    cursor = db.Column(db.Text)
+    pending_urls = db.Column(db.Text)
+    # JSON list of detail URLs an unfinished full crawl already extracted, skipped when it resumes
+    done_urls = db.Column(db.Text)
+    finished = db.Column(db.Boolean, default=True, nullable=False)
+    # worker currently crawling this bank, and until when its lease holds without a checkpoint
+    lease_owner = db.Column(db.String(128))
+    lease_expires_at = db.Column(db.DateTime)
+
+    def get_last_seen_urls(self):
+        return json.loads(self.last_seen_urls) if self.last_seen_urls else []
+
+    def set_last_seen_urls(self, urls):
+        self.last_seen_urls = json.dumps(urls)
+
+    def get_cursor(self):
+        return json.loads(self.cursor) if self.cursor else {}
+
+    def get_pending_urls(self):
+        return json.loads(self.pending_urls) if self.pending_urls else []
+
+    def get_done_urls(self):
+        return json.loads(self.done_urls) if self.done_urls else []
+
+class ScrapeLock(db.Model):
+    __tablename__ = 'scrape_lock'
+
+    # named lock shared by every scraping worker, held until released or expired
+    name = db.Column(db.String(64), primary_key=True)
+    owner = db.Column(db.String(128))
+    expires_at = db.Column(db.DateTime)
+
 class Match(db.Model):
     __tablename__ = 'match'
 
@@ -46,6 +107,43 @@ class Match(db.Model):
     partner = db.Column(db.Integer)
     score = db.Column(db.Float)
 
+class PartnerJob(db.Model):
+    __tablename__ = 'partner_job'
+
+    id = db.Column(db.String(36), primary_key=True)
+    # identifies the opportunity searched, so identical requests share one job
+    key = db.Column(db.String(128), index=True, nullable=False)
+    opportunity_id = db.Column(db.Integer)
+    status = db.Column(db.String(16), default="queued", nullable=False)  # queued, running, done, failed
+    processed = db.Column(db.Integer, default=0, nullable=False)
+    total = db.Column(db.Integer, default=0, nullable=False)
+    result = db.Column(db.Text)  # JSON list of the current top 3 partners
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+    __table_args__ = (
+        # at most one queued or running job per key, also when requests race across processes
+        db.Index(
+            'uq_partner_job_active_key', 'key', unique=True,
+            sqlite_where=db.text("status IN ('queued', 'running')"),
+            postgresql_where=db.text("status IN ('queued', 'running')"),
+        ),
+    )
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "opportunity_id": self.opportunity_id,
+            "status": self.status,
+            "processed": self.processed,
+            "total": self.total,
+            "partners": json.loads(self.result) if self.result else [],
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
 class User(db.Model):
     __tablename__ = 'user'
 
@@ -0,0 +1,60 @@
+import re
+
+from sqlalchemy import text
+
+from app.models import db
+
+
+# Dialects with a full-text index, created by the a3f9d5b1c8e4 migration: an FTS5 table kept in sync
+# by triggers on SQLite, a generated tsvector column with a GIN index on PostgreSQL
+SEARCH_DIALECTS = ("sqlite", "postgresql")
+
+# PostgreSQL weight of each indexed column, also used to restrict filters to one column
+PG_WEIGHTS = {"project_name": "A", "sector": "B", "country": "C", "summary": "D"}
+
+
+def dialect():
+    return db.engine.dialect.name
+
+
+def search_terms(value):
+    return re.findall(r"\w+", (value or "").lower())
+
+
+def search_subquery(q=None, country=None, sector=None):
+    """Return a subquery of (id, rank) for opportunities matching the search, lower rank is better.
+
+    Returns None when the database has no full-text index or there is nothing to search.
+    """
+    terms = search_terms(q)
+    country_terms = search_terms(country)
+    sector_terms = search_terms(sector)
+    if not (terms or country_terms or sector_terms) or dialect() not in SEARCH_DIALECTS:
+        return None
+
+    if dialect() == "sqlite":
+        def fts_expression(words, column=None):
+            expression = " AND ".join(f'"{word}"*' for word in words)
+            return f"{column} : ({expression})" if column else f"({expression})"
+
+        parts = []
+        if terms:
+            parts.append(fts_expression(terms))
+        if country_terms:
+            parts.append(fts_expression(country_terms, "country"))
+        if sector_terms:
+            parts.append(fts_expression(sector_terms, "sector"))
+        statement = text(
+            "SELECT rowid AS id, bm25(opportunity_fts, 10.0, 2.0, 2.0, 1.0) AS rank "
+            "FROM opportunity_fts WHERE opportunity_fts MATCH :match"
+        ).bindparams(match=" AND ".join(parts))
+    else:
+        lexemes = [f"{word}:*" for word in terms]
+        lexemes += [f"{word}:*{PG_WEIGHTS['country']}" for word in country_terms]
+        lexemes += [f"{word}:*{PG_WEIGHTS['sector']}" for word in sector_terms]
+        statement = text(
+            "SELECT id, -ts_rank(search_vector, to_tsquery('simple', :query)) AS rank "
+            "FROM opportunity WHERE search_vector @@ to_tsquery('simple', :query)"
+        ).bindparams(query=" & ".join(lexemes))
+
+    return statement.columns(id=db.Integer, rank=db.Float).subquery("search")
@@ -0,0 +1,119 @@
+import os
+import json
+import uuid
+import hashlib
+import logging
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy.exc import IntegrityError
+
+from app.models import db, PartnerJob
+from app.report_writer import request_reports
+from app.scrapers_score_of_companies.company_scraper_scorer import (
+    get_three_suitable_matched_scores_and_companies_data,
+)
+
+
+# Partner searches running at the same time in this process. Jobs live in this process's queue only:
+# after a restart their rows go stale and the next request for the same key starts a new job
+PARTNER_JOB_WORKERS = int(os.environ.get("PARTNER_JOB_WORKERS", "2"))
+# A queued/running job that has not reported progress for this many seconds is considered dead
+PARTNER_JOB_STALE_AFTER = int(os.environ.get("PARTNER_JOB_STALE_AFTER", "900"))
+
+ACTIVE_STATUSES = ("queued", "running")
+FINISHED_STATUSES = ("done", "failed")
+
+executor = ThreadPoolExecutor(max_workers=PARTNER_JOB_WORKERS, thread_name_prefix="partner-job")
+
+
+def job_key(project_data):
+    """Key identifying the searched opportunity, so identical requests share one job"""
+    if project_data.get("id"):
+        return f"opportunity:{project_data['id']}"
+    raw = json.dumps(project_data, sort_keys=True, default=str)
+    return "data:" + hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def active_partner_job(key):
+    return PartnerJob.query.filter(PartnerJob.key == key, PartnerJob.status.in_(ACTIVE_STATUSES)).first()
+
+
+def submit_partner_job(app, project_data):
+    """Start a partner search in the background and return (job, created).
+
+    If a live job for the same opportunity already exists it is returned instead; the
+    unique index on active keys decides between requests racing in different processes.
+    """
+    key = job_key(project_data)
+    now = datetime.datetime.utcnow()
+    fresh_after = now - datetime.timedelta(seconds=PARTNER_JOB_STALE_AFTER)
+    # a job whose worker died, e.g. in a restart, gives up its key once it is stale
+    PartnerJob.query.filter(
+        PartnerJob.key == key,
+        PartnerJob.status.in_(ACTIVE_STATUSES),
+        PartnerJob.updated_at < fresh_after,
+    ).update({"status": "failed", "error": "worker stopped before the search finished", "updated_at": now})
+    db.session.commit()
+
+    job = active_partner_job(key)
+    if job is not None:
+        return job, False
+
+    job = PartnerJob(
+        id=str(uuid.uuid4()),
+        key=key,
+        opportunity_id=project_data.get("id"),
+        status="queued",
+        processed=0,
+        total=0,
+    )
+    db.session.add(job)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # another process queued the same search first
+        db.session.rollback()
+        job = active_partner_job(key)
+        if job is None:
+            raise
+        return job, False
+
+    executor.submit(run_partner_job, app, job.id, project_data)
+    return job, True
+
+
+def get_partner_job(job_id):
+    return db.session.get(PartnerJob, job_id)
+
+
+def update_partner_job(job_id, **values):
+    values["updated_at"] = datetime.datetime.utcnow()
+    PartnerJob.query.filter_by(id=job_id).update(values)
+    db.session.commit()
+
+
+def run_partner_job(app, job_id, project_data):
+    """Run one partner search on a worker thread, recording progress and partial top 3"""
+    with app.app_context():
+        try:
+            update_partner_job(job_id, status="running")
+
+            def on_progress(processed, total, top_three):
+                update_partner_job(
+                    job_id, processed=processed, total=total, result=json.dumps(top_three)
+                )
+
+            partners = get_three_suitable_matched_scores_and_companies_data(
+                project_data, progress_callback=on_progress
+            )
+            update_partner_job(job_id, status="done", result=json.dumps(partners))
+            if project_data.get("id"):
+                # the search marked the opportunity as found, which the reports show
+                request_reports(app)
+        except Exception as e:
+            logging.error(f"Partner job {job_id} failed: {e}")
+            db.session.rollback()
+            update_partner_job(job_id, status="failed", error=str(e))
+        finally:
+            db.session.remove()
@@ -0,0 +1,234 @@
+import os
+import csv
+import json
+import hashlib
+import logging
+import datetime
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from openpyxl import Workbook
+
+from app.models import db, Opportunity
+
+
+# Rows fetched from the database per round trip while writing a report
+REPORT_CHUNK_SIZE = int(os.environ.get("REPORT_CHUNK_SIZE", "1000"))
+# Directory of the prebuilt report files
+REPORTS_DIR = os.environ.get(
+    "REPORTS_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), "reports")
+)
+# Report versions kept on disk, older ones are deleted
+REPORT_KEEP_VERSIONS = int(os.environ.get("REPORT_KEEP_VERSIONS", "7"))
+MANIFEST_PATH = os.path.join(REPORTS_DIR, "latest.json")
+# Seconds a client asking for a report that is still being built is told to wait (Retry-After)
+REPORT_RETRY_AFTER = int(os.environ.get("REPORT_RETRY_AFTER", "30"))
+
+REPORT_FORMATS = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Report header and the Opportunity column it is read from
+REPORT_COLUMNS = [
+    ("Project Name", Opportunity.project_name),
+    ("Client", Opportunity.client),
+    ("Country", Opportunity.country),
+    ("Sector", Opportunity.sector),
+    ("Summary", Opportunity.summary),
+    ("Submission Deadline", Opportunity.deadline),
+    ("Program", Opportunity.program),
+    ("Budget", Opportunity.budget),
+    ("URL", Opportunity.url),
+    ("Found", Opportunity.found),
+]
+
+
+def iter_report_rows(chunk_size=REPORT_CHUNK_SIZE):
+    """Yield report rows as tuples, newest first, reading the table in chunks through a server-side cursor"""
+    statement = (
+        db.select(*[column for _, column in REPORT_COLUMNS])
+        .order_by(Opportunity.id.desc())
+        .execution_options(yield_per=chunk_size)
+    )
+    for row in db.session.execute(statement):
+        yield tuple(row)
+
+
+def write_opportunities_xlsx(fileobj):
+    """Write the opportunities report to a binary file object with constant memory use"""
+    # write-only workbooks stream rows to disk instead of keeping cell objects in memory
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Opportunities")
+    sheet.append([header for header, _ in REPORT_COLUMNS])
+    for row in iter_report_rows():
+        sheet.append(row)
+    workbook.save(fileobj)
+
+
+def write_opportunities_csv(path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([header for header, _ in REPORT_COLUMNS])
+        for row in iter_report_rows():
+            writer.writerow(row)
+
+
+def write_opportunities_parquet(path):
+    """Write the report as Parquet in row groups of REPORT_CHUNK_SIZE, if pyarrow is installed"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        logging.warning("pyarrow is not installed, skipping the Parquet report")
+        return False
+
+    headers = [header for header, _ in REPORT_COLUMNS]
+    schema = pa.schema(
+        [(header, pa.bool_() if header == "Found" else pa.string()) for header in headers]
+    )
+
+    def flush(writer, chunk):
+        columns = list(zip(*chunk))
+        writer.write_table(pa.Table.from_arrays([pa.array(column, type=field.type) for column, field in zip(columns, schema)], schema=schema))
+
+    with pq.ParquetWriter(path, schema) as writer:
+        chunk = []
+        for row in iter_report_rows():
+            chunk.append(row)
+            if len(chunk) >= REPORT_CHUNK_SIZE:
+                flush(writer, chunk)
+                chunk = []
+        if chunk:
+            flush(writer, chunk)
+    return True
+
+
+def report_digest():
+    """Hash the row count, newest id, last write and found count of the opportunities, so reports are only rebuilt when they changed.
+
+    One aggregate query instead of reading the table: inserts move the count and
+    the newest id, updates move updated_at, deletes move the count, and partner
+    searches marking an opportunity as found move the found count.
+    """
+    count, newest_id, last_update, found = db.session.execute(
+        db.select(
+            db.func.count(Opportunity.id),
+            db.func.max(Opportunity.id),
+            db.func.max(Opportunity.updated_at),
+            db.func.sum(db.case((Opportunity.found, 1), else_=0)),
+        )
+    ).one()
+    raw = json.dumps([count, newest_id, last_update, found], default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def load_report_manifest():
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def replace_atomically(path, write):
+    """Call write with a temporary file next to path and move it over path if write returns True.
+
+    Every call gets its own temporary file, so the web app and the worker can
+    build reports at the same time and readers never see a half written file.
+    """
+    with tempfile.NamedTemporaryFile(
+        dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp", delete=False
+    ) as f:
+        tmp_path = f.name
+    try:
+        written = write(tmp_path)
+        if written:
+            os.replace(tmp_path, path)
+        return written
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def write_manifest(path, manifest):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return True
+
+
+def materialize_reports(force=False):
+    """Write versioned xlsx, CSV and Parquet reports to REPORTS_DIR when opportunities changed.
+
+    Returns the manifest of the current report version.
+    """
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    digest = report_digest()
+    manifest = load_report_manifest()
+    if not force and manifest and manifest.get("digest") == digest and all(
+        os.path.exists(os.path.join(REPORTS_DIR, name)) for name in manifest["files"].values()
+    ):
+        print("Opportunities did not change, keeping the current reports.")
+        return manifest
+
+    version = f"{datetime.datetime.utcnow():%Y%m%d-%H%M%S}-{digest[:8]}"
+    writers = {
+        "xlsx": lambda path: write_opportunities_xlsx(path) or True,
+        "csv": lambda path: write_opportunities_csv(path) or True,
+        "parquet": write_opportunities_parquet,
+    }
+    files = {}
+    for report_format, writer in writers.items():
+        name = f"opportunities_{version}.{report_format}"
+        if replace_atomically(os.path.join(REPORTS_DIR, name), writer):
+            files[report_format] = name
+
+    manifest = {
+        "version": version,
+        "digest": digest,
+        "created_at": datetime.datetime.utcnow().isoformat(),
+        "files": files,
+    }
+    replace_atomically(MANIFEST_PATH, lambda path: write_manifest(path, manifest))
+    logging.info(f"Reports materialised as version {version}")
+
+    prune_old_reports()
+    return manifest
+
+
+def prune_old_reports():
+    versions = sorted(
+        {name[len("opportunities_"):].rsplit(".", 1)[0] for name in os.listdir(REPORTS_DIR) if name.startswith("opportunities_") and not name.endswith(".tmp")},
+        reverse=True,
+    )
+    for version in versions[REPORT_KEEP_VERSIONS:]:
+        for report_format in REPORT_FORMATS:
+            path = os.path.join(REPORTS_DIR, f"opportunities_{version}.{report_format}")
+            if os.path.exists(path):
+                os.remove(path)
+
+
+# Builds the reports requested by the web app before any scrape cycle wrote them, one at a time
+report_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="report")
+report_build_lock = threading.Lock()
+report_build = None
+
+
+def build_reports(app):
+    with app.app_context():
+        try:
+            materialize_reports()
+        except Exception as e:
+            logging.error(f"Error materialising reports: {e}")
+        finally:
+            db.session.remove()
+
+
+def request_reports(app):
+    """Start building the reports in the background unless a build is already running"""
+    global report_build
+    with report_build_lock:
+        if report_build is None or report_build.done():
+            report_build = report_executor.submit(build_reports, app)
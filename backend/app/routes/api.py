@@ -1,93 +1,155 @@
-from flask import Blueprint, request, jsonify, send_file, current_app
+from flask import Blueprint, request, jsonify, send_file, current_app, Response, stream_with_context
 from app.models import Opportunity, Partner, Session
 from app.models import db
-from app.scrapers_score_of_companies.company_scraper_scorer import (
-    get_three_suitable_matched_scores_and_companies_data,
-)
+from app.opportunity_search import search_subquery
+from app.report_writer import request_reports, load_report_manifest, REPORTS_DIR, REPORT_FORMATS, REPORT_RETRY_AFTER
+from app.partner_jobs import submit_partner_job, get_partner_job, FINISHED_STATUSES
 
-from app.scrapers_of_projects.scheduled_scraper import run_scraping
 
 import os
+import json
+import time
 
-import pandas as pd
-import io
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 from app.chatbot import create_user_session, delete_user_session, chat_with_AI, get_session_messages_dict, get_user_sessions_dict
 
 api_bp = Blueprint("api", __name__)
 
 
+# Columns a client may request with ?fields=
+OPPORTUNITY_FIELDS = [
+    "id",
+    "project_name",
+    "client",
+    "country",
+    "sector",
+    "summary",
+    "deadline",
+    "program",
+    "budget",
+    "url",
+    "found",
+]
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+# Seconds a partner job stream stays open; clients still waiting then poll /get-partners/<job_id>
+PARTNER_STREAM_MAX_SECONDS = int(os.environ.get("PARTNER_STREAM_MAX_SECONDS", "300"))
+
+
 @api_bp.route("/fetchopportunities", methods=["GET"])
 @jwt_required()
 def list_opportunities():
     """
-    List all opportunities, optionally filtered by country/sector.
+    List opportunities newest first, optionally filtered by country/sector.
+
+    ?q= runs a full-text search over project name, country, sector and summary
+    and orders the results by relevance instead.
+
+    Pagination is keyset based: pass the X-Next-Cursor header of a response as
+    ?cursor= to get the next page, and ?limit= to set the page size. ?fields=
+    is a comma separated list of columns to return. With ?with_total=1 the
+    number of matching opportunities is sent in the X-Total-Count header; it
+    costs a count over all matches, so clients ask for it on the first page only.
     """
+    q = request.args.get("q")
     country = request.args.get("country")
     sector = request.args.get("sector")
-    print("starting to send opportunities")
-    print("country is ", country)
-    print("sector is ", sector)
+
+    try:
+        limit = min(max(int(request.args.get("limit", DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    cursor = request.args.get("cursor")
+    if cursor is not None:
+        # a malformed cursor must not silently restart from the first page
+        if not cursor.isdecimal():
+            return jsonify({"error": "cursor must be a non-negative integer"}), 400
+        cursor = int(cursor)
+
+    fields = OPPORTUNITY_FIELDS
+    if request.args.get("fields"):
+        fields = [field.strip() for field in request.args["fields"].split(",") if field.strip()]
+        unknown = [field for field in fields if field not in OPPORTUNITY_FIELDS]
+        if unknown:
+            return jsonify({"error": f"Unknown fields: {', '.join(unknown)}"}), 400
+        # id is always needed to build the next cursor
+        if "id" not in fields:
+            fields = ["id"] + fields
+
     query = Opportunity.query
-    print("query is ", query)
-    if country:
-        query = query.filter(Opportunity.country.ilike(f"%{country}%"))
-    if sector:
-        query = query.filter(Opportunity.sector.ilike(f"%{sector}%"))
-    print("filtered query is ", query)
-    results = query.order_by(Opportunity.id.desc()).all()
-    # print("results are ", results)
-    out = []
-    for o in results:
-        out.append(
-            {
-                "id": o.id,
-                "project_name": o.project_name,
-                "client": o.client,
-                "country": o.country,
-                "sector": o.sector,
-                "summary": o.summary,
-                "deadline": o.deadline,
-                "program": o.program,
-                "budget": o.budget,
-                "url": o.url,
-                "found": o.found,
-            }
+    search = search_subquery(q, country, sector)
+    if search is not None:
+        query = query.join(search, Opportunity.id == search.c.id)
+    else:
+        # No full-text index on this database
+        if q:
+            query = query.filter(
+                Opportunity.project_name.ilike(f"%{q}%") | Opportunity.summary.ilike(f"%{q}%")
+            )
+        if country:
+            query = query.filter(Opportunity.country.ilike(f"%{country}%"))
+        if sector:
+            query = query.filter(Opportunity.sector.ilike(f"%{sector}%"))
+    total = query.order_by(None).count() if request.args.get("with_total") in ("1", "true") else None
+
+    query = query.with_entities(*[getattr(Opportunity, field) for field in fields])
+    if q and search is not None:
+        # Ranked results page by position instead of by id
+        offset = cursor or 0
+        rows = (
+            query.order_by(search.c.rank, Opportunity.id.desc())
+            .offset(offset)
+            .limit(limit)
+            .all()
         )
-    return jsonify(out)
+        next_cursor = offset + limit
+    else:
+        if cursor is not None:
+            query = query.filter(Opportunity.id < cursor)
+        rows = query.order_by(Opportunity.id.desc()).limit(limit).all()
+        next_cursor = rows[-1].id if rows else None
+
+    out = [dict(row._mapping) for row in rows]
+    response = jsonify(out)
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
+    if len(rows) == limit:
+        response.headers["X-Next-Cursor"] = str(next_cursor)
+    return response
 
 
 @api_bp.route("/opportunities/report", methods=["GET"])
 @jwt_required()
 def download_report():
     """
-    Generate and return an Excel report of all opportunities.
+    Return the prebuilt report of all opportunities (?format=xlsx|csv|parquet, default xlsx).
+
+    Answers 503 with Retry-After while the very first reports are still being built.
     """
+    report_format = request.args.get("format", "xlsx")
+    if report_format not in REPORT_FORMATS:
+        return jsonify({"error": f"format must be one of {', '.join(REPORT_FORMATS)}"}), 400
     try:
-        results = Opportunity.query.order_by(Opportunity.id.desc()).all()
-        rows = []
-        for o in results:
-            rows.append(
-                {
-                    "Project Name": o.project_name,
-                    "Client": o.client,
-                    "Country": o.country,
-                    "Sector": o.sector,
-                    "Summary": o.summary,
-                    "Submission Deadline": o.deadline,
-                    "Program": o.program,
-                    "Budget": o.budget,
-                    "URL": o.url,
-                    "Found": o.found,
-                }
-            )
-        df = pd.DataFrame(rows)
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine="openpyxl") as writer:
-            df.to_excel(writer, index=False, sheet_name="Opportunities")
-        output.seek(0)
+        # Reports are materialised after each scrape cycle, only the very first download starts a build
+        manifest = load_report_manifest()
+        if manifest is None:
+            request_reports(current_app._get_current_object())
+            response = jsonify({"error": "Report is being generated, retry later"})
+            response.headers["Retry-After"] = str(REPORT_RETRY_AFTER)
+            return response, 503
+        name = manifest["files"].get(report_format)
+        if name is None:
+            return jsonify({"error": f"{report_format} report is not available"}), 404
+
+        # conditional send answers If-None-Match with 304 Not Modified
         return send_file(
-            output, download_name="opportunities_report.xlsx", as_attachment=True
+            os.path.join(REPORTS_DIR, name),
+            download_name=f"opportunities_report.{report_format}",
+            as_attachment=True,
+            mimetype=REPORT_FORMATS[report_format],
+            etag=f"{manifest['digest']}-{report_format}",
+            conditional=True,
+            max_age=0,
         )
     except Exception as e:
         current_app.logger.error(f"Error generating report: {e}")
@@ -98,8 +160,10 @@ def download_report():
 @jwt_required()
 def find_partners_for_opportunity():
     """
-    Given opportunity details, find suitable partners.
+    Given opportunity details, start a background search for suitable partners.
     Expects JSON with opportunity_id or full opportunity data.
+    Returns the job immediately; poll /get-partners/<job_id> or stream
+    /get-partners/<job_id>/stream for progress and the top 3 partners.
     """
     data = request.json
     if not data:
@@ -131,32 +195,74 @@ def find_partners_for_opportunity():
                 if existing:
                     project_data["id"] = existing.id
         
-        three_suitable_matched_score_and_companies_data = (
-            get_three_suitable_matched_scores_and_companies_data(project_data)
-        )
-
-        return jsonify(three_suitable_matched_score_and_companies_data)
+        job, created = submit_partner_job(current_app._get_current_object(), project_data)
+        response = job.to_dict()
+        response["created"] = created
+        return jsonify(response), 202
     except Exception as e:
         current_app.logger.error(f"Error finding partners: {e}")
         import traceback
         traceback.print_exc()
         return jsonify({"error": f"Failed to find partners: {str(e)}"}), 500
+
+
+@api_bp.route("/get-partners/<job_id>", methods=["GET"])
+@jwt_required()
+def get_partners_job(job_id):
+    """
+    Return status, progress and current top 3 partners of a partner search job.
+    """
+    job = get_partner_job(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_dict())
+
+
+@api_bp.route("/get-partners/<job_id>/stream", methods=["GET"])
+@jwt_required()
+def stream_partners_job(job_id):
+    """
+    Stream progress of a partner search job as server-sent events until it finishes.
+
+    The stream ends with a "timeout" event after PARTNER_STREAM_MAX_SECONDS, after
+    which the client polls /get-partners/<job_id> for the rest of the job.
+    """
+    if not get_partner_job(job_id):
+        return jsonify({"error": "Job not found"}), 404
+
+    def events():
+        last_update = None
+        ends_at = time.monotonic() + PARTNER_STREAM_MAX_SECONDS
+        while True:
+            db.session.expire_all()
+            job = get_partner_job(job_id)
+            if job is None:
+                yield f"event: error\ndata: {json.dumps({'error': 'Job not found'})}\n\n"
+                break
+            if job.updated_at != last_update:
+                last_update = job.updated_at
+                yield f"data: {json.dumps(job.to_dict())}\n\n"
+            if job.status in FINISHED_STATUSES:
+                break
+            if time.monotonic() >= ends_at:
+                yield f"event: timeout\ndata: {json.dumps({'poll': f'/api/get-partners/{job_id}'})}\n\n"
+                break
+            time.sleep(1)
+
+    return Response(stream_with_context(events()), mimetype="text/event-stream")
  
 
-# user want to fine new opportunities. In this case, scraping is executed and if there is one oppotunity adn click star to thisgithub.o
 @api_bp.route("/scrape_latest_opportunities", methods=["GET"])
 @jwt_required()
 def find_new_opportunities():
     """
-    Placeholder for finding new opportunities from external sources.
+    Scraping on request was removed, the scraping worker keeps opportunities up to date.
     """
-
-    # scrape to find latest opportunities
-    run_scraping()
-
-    # This is a placeholder. In a real implementation, you would integrate
-    # with external APIs or web scraping logic to find new opportunities.
-    return jsonify({"message": "Functionality not yet implemented."}), 501
+    # Scraping runs in the worker process (app.scrapers_of_projects.worker), not in the web app
+    return jsonify({
+        "message": "Scraping runs in the scraping worker on its schedule; "
+                   "run `python -m app.scrapers_of_projects.worker --once` for a manual run."
+    }), 410
 
 
 # user want to get message from AI chatbot
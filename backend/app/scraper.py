@@ -1,11 +1,15 @@
-from apscheduler.schedulers.background import BackgroundScheduler
+import asyncio
 
+from app import create_app
+from app.scrapers_of_projects.scheduled_scraper import run_scraping
 
-def scrape_all_sources():
-    # TODO: Implement scraping logic for all banks/donors
-    print("Scraping all sources...")
 
+def scrape_all_sources(full_crawl=None):
+    """Scrape every bank once, in an app context of its own.
 
-scheduler = BackgroundScheduler()
-scheduler.add_job(scrape_all_sources, "interval", days=1)
-scheduler.start()
+    Scheduled scraping is run by the scraping worker
+    (python -m app.scrapers_of_projects.worker), see start_scheduler.
+    """
+    app = create_app()
+    with app.app_context():
+        return asyncio.run(run_scraping(full_crawl=full_crawl))
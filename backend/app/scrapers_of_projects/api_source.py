@@ -0,0 +1,54 @@
+import os
+
+import httpx
+
+
+# Seconds to wait for a single API response
+API_TIMEOUT = float(os.environ.get("API_TIMEOUT", "30"))
+# Connections kept open per bank while it is being scraped over HTTP
+API_MAX_CONNECTIONS = int(os.environ.get("API_MAX_CONNECTIONS", "8"))
+
+
+class ApiSource:
+    """Base class for banks that publish their projects through a public JSON/XML feed.
+
+    Subclasses list project records over plain HTTP so that the scraper does not
+    need to start a browser. Every record must use the same keys as the fields
+    dictionary built by `extract_project_data` (title, client, country, sector,
+    summary, deadline, program, budget, url); other keys, like `published`, are
+    informational and not stored.
+    """
+
+    def open_client(self):
+        """Return a pooled async HTTP client, used as `async with source.open_client() as client`"""
+        return httpx.AsyncClient(
+            timeout=API_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=API_MAX_CONNECTIONS,
+                max_keepalive_connections=API_MAX_CONNECTIONS,
+            ),
+            headers={"Accept": "application/json"},
+            follow_redirects=True,
+        )
+
+    async def get_json(self, client, url, params=None):
+        """GET a JSON document and raise on HTTP errors"""
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def list_projects(self, client, page):
+        """Return the project records of one page, or an empty list when there are no more"""
+        raise NotImplementedError("The 'list_projects' method must be implemented in subclasses.")
+
+
+def format_amount(amount):
+    """Format a USD amount from an API feed the way bank detail pages show it"""
+    try:
+        value = float(str(amount).replace(",", ""))
+    except (TypeError, ValueError):
+        return str(amount or "")
+    if value <= 0:
+        return "Not defined"
+    return f"US$ {value / 1_000_000:.2f} million"
+
@@ -0,0 +1,95 @@
+import os
+import uuid
+import socket
+import datetime
+
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+
+from app.models import db, CrawlState, ScrapeLock
+
+
+# Seconds a bank stays leased without being renewed before another worker may take it over. The lease
+# is renewed by a heartbeat every third of it and at every checkpoint, and must outlast a page (PAGE_TIME_BUDGET)
+BANK_LEASE_TTL = int(os.environ.get("BANK_LEASE_TTL", "1800"))
+
+# Seconds a named lock (scheduler, full run) holds without being renewed
+SCRAPE_LOCK_TTL = int(os.environ.get("SCRAPE_LOCK_TTL", "300"))
+
+# Identifies this process as lease owner
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def ensure_crawl_state(bank):
+    """Create the crawl_state row of a bank if it does not exist yet"""
+    if db.session.get(CrawlState, bank) is not None:
+        return
+    try:
+        db.session.add(CrawlState(bank=bank, new_projects=0, finished=True))
+        db.session.commit()
+    except IntegrityError:
+        # another worker created it first
+        db.session.rollback()
+
+
+def acquire_bank_lease(bank, owner=WORKER_ID, ttl=BANK_LEASE_TTL):
+    """Take the lease of a bank if it is free, expired or already ours; return whether we hold it"""
+    ensure_crawl_state(bank)
+    now = datetime.datetime.utcnow()
+    # a single conditional UPDATE, so two workers can never both win
+    acquired = CrawlState.query.filter(
+        CrawlState.bank == bank,
+        or_(
+            CrawlState.lease_owner.is_(None),
+            CrawlState.lease_owner == owner,
+            CrawlState.lease_expires_at < now,
+        ),
+    ).update(
+        {"lease_owner": owner, "lease_expires_at": now + datetime.timedelta(seconds=ttl)},
+        synchronize_session=False,
+    )
+    db.session.commit()
+    return acquired == 1
+
+
+def renew_bank_lease(bank, owner=WORKER_ID, ttl=BANK_LEASE_TTL):
+    """Extend our lease of a bank, committed by the caller; return whether we still hold it"""
+    renewed = CrawlState.query.filter_by(bank=bank, lease_owner=owner).update(
+        {"lease_expires_at": datetime.datetime.utcnow() + datetime.timedelta(seconds=ttl)},
+        synchronize_session=False,
+    )
+    return renewed == 1
+
+
+def release_bank_lease(bank, owner=WORKER_ID):
+    CrawlState.query.filter_by(bank=bank, lease_owner=owner).update(
+        {"lease_owner": None, "lease_expires_at": None}, synchronize_session=False
+    )
+    db.session.commit()
+
+
+def acquire_lock(name, owner=WORKER_ID, ttl=SCRAPE_LOCK_TTL):
+    """Take or renew a named lock shared by all workers; return whether we hold it"""
+    if db.session.get(ScrapeLock, name) is None:
+        try:
+            db.session.add(ScrapeLock(name=name))
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+    now = datetime.datetime.utcnow()
+    acquired = ScrapeLock.query.filter(
+        ScrapeLock.name == name,
+        or_(ScrapeLock.owner.is_(None), ScrapeLock.owner == owner, ScrapeLock.expires_at < now),
+    ).update(
+        {"owner": owner, "expires_at": now + datetime.timedelta(seconds=ttl)},
+        synchronize_session=False,
+    )
+    db.session.commit()
+    return acquired == 1
+
+
+def release_lock(name, owner=WORKER_ID):
+    ScrapeLock.query.filter_by(name=name, owner=owner).update(
+        {"owner": None, "expires_at": None}, synchronize_session=False
+    )
+    db.session.commit()
@@ -0,0 +1,69 @@
+import os
+import json
+import logging
+
+from app.scrapers_of_projects.detail_workers import DETAIL_WORKERS
+
+
+# Seconds a single bank may spend before it stops after the current page, unless its schedule sets a timeout
+BANK_TIME_BUDGET = int(os.environ.get("BANK_TIME_BUDGET", "3600"))
+# Hour of the day the first bank runs, and hours the bank runs are spread over
+SCHEDULE_WINDOW_START = int(os.environ.get("SCHEDULE_WINDOW_START", "0"))
+SCHEDULE_WINDOW_HOURS = int(os.environ.get("SCHEDULE_WINDOW_HOURS", "24"))
+# JSON file overriding entries of BANK_SCHEDULES, e.g. {"wb": {"cron": "0 6 * * *", "timeout": 1800}}
+BANK_SCHEDULES_FILE = os.environ.get("BANK_SCHEDULES_FILE", "")
+
+# Schedule of every bank:
+#   cron             crontab expression (minute hour day month weekday), staggered over the window when None
+#   timeout          seconds the bank may run
+#   priority         higher runs first, in a full run and in the daily window
+#   max_concurrency  browsers reading the bank's detail pages at the same time
+BANK_SCHEDULES = {
+    "wb": {"priority": 10, "timeout": 1800},
+    "afdb": {"priority": 8},
+    "adb": {"priority": 8},
+    "eib": {"priority": 6},
+    "ebrd": {"priority": 6},
+    "iadb": {"priority": 6},
+    "undp": {"priority": 5, "timeout": 5400},
+    "afd": {"priority": 4},
+    "kfw": {"priority": 4},
+    "ifc": {"priority": 4},
+    "miga": {"priority": 3},
+    "fmo": {"priority": 2},
+    "debit": {"priority": 1, "max_concurrency": 1},
+}
+
+
+def stagger_cron(slot, slots):
+    """Daily crontab of the slot-th of `slots` runs spread evenly over the schedule window"""
+    minute = SCHEDULE_WINDOW_START * 60 + slot * SCHEDULE_WINDOW_HOURS * 60 // max(slots, 1)
+    return f"{minute % 60} {(minute // 60) % 24} * * *"
+
+
+def load_bank_schedules():
+    """Return the schedule of every bank, highest priority first, with defaults and overrides applied"""
+    overrides = {}
+    if BANK_SCHEDULES_FILE:
+        try:
+            with open(BANK_SCHEDULES_FILE, encoding="utf-8") as f:
+                overrides = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.error(f"Ignoring bank schedules file {BANK_SCHEDULES_FILE}: {e}")
+
+    schedules = {}
+    for bank_id, schedule in BANK_SCHEDULES.items():
+        schedules[bank_id] = {
+            "cron": None,
+            "timeout": BANK_TIME_BUDGET,
+            "priority": 0,
+            "max_concurrency": DETAIL_WORKERS,
+            **schedule,
+            **overrides.get(bank_id, {}),
+        }
+
+    ordered = sorted(schedules, key=lambda bank_id: -schedules[bank_id]["priority"])
+    for slot, bank_id in enumerate(ordered):
+        if not schedules[bank_id]["cron"]:
+            schedules[bank_id]["cron"] = stagger_cron(slot, len(ordered))
+    return {bank_id: schedules[bank_id] for bank_id in ordered}
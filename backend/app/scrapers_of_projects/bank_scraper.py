@@ -4,24 +4,45 @@ import time
 import logging
 import atexit
 import json
-from selenium import webdriver
+import datetime
+import queue
+import asyncio
+import threading
+from urllib.parse import urlparse
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium_stealth import stealth
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from selenium.common.exceptions import (
+    WebDriverException,
     TimeoutException,
     NoSuchElementException,
     ElementClickInterceptedException,
+    StaleElementReferenceException,
 )
-import pandas as pd
-from openai import OpenAI
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
-from app.models import db, Opportunity
+from app.models import db, Opportunity, CrawlState
+from app.llm_cache import llm_cache
+from app.scrapers_of_projects.webdriver_pool import driver_pool
+from app.scrapers_of_projects.opportunity_sink import OpportunitySink, fingerprint_text
+from app.scrapers_of_projects.bank_leases import renew_bank_lease
+from app.scrapers_of_projects.detail_workers import (
+    DETAIL_WORKERS,
+    BrowserCrashed,
+    domain_limiter,
+    queue_urls,
+    run_detail_worker,
+)
+from app.scrapers_of_projects.cancellation import (
+    stop_event,
+    CrawlCancelled,
+    CancellableWait,
+    PAGE_TIME_BUDGET,
+    PAGE_RETRIES,
+)
 
 # --- Logging ---
 logging.basicConfig(
@@ -31,74 +52,495 @@ logging.basicConfig(
 )
 
 
-HEADLESS = os.environ.get("HEADLESS", "0") == "1"
 SLACK_WEBHOOK = os.environ.get("SLACK_WEBHOOK", "")
+# Consecutive already known listing rows after which an incremental crawl stops
+INCREMENTAL_STOP_AFTER = int(os.environ.get("INCREMENTAL_STOP_AFTER", "20"))
+# Newest listing URLs remembered per bank as the high-water mark of the next crawl
+HIGH_WATER_URLS = int(os.environ.get("HIGH_WATER_URLS", "50"))
+# URLs per IN (...) query when checking which listing rows are already stored
+URL_LOOKUP_CHUNK = 500
+# Seconds to wait for a page to become ready before reading it anyway
+PAGE_READY_TIMEOUT = float(os.environ.get("PAGE_READY_TIMEOUT", "20"))
+# Milliseconds without DOM mutations or new network requests after which a page counts as settled
+PAGE_QUIET_MS = int(os.environ.get("PAGE_QUIET_MS", "500"))
+PAGE_READY_POLL = 0.1
+# Seconds a single OpenAI request may take, less when the crawl's deadline is closer
+LLM_REQUEST_TIMEOUT = float(os.environ.get("LLM_REQUEST_TIMEOUT", "60"))
+
+# Returns whether the page is ready; arguments are the ready selector (or null) and the quiet period.
+# With a selector the page is ready once the document is complete and the selector matches,
+# otherwise once no request, spinner or DOM change was seen for the quiet period
+READINESS_PROBE = """
+const [readySelector, quietMs] = arguments;
+const now = performance.now();
+if (!document.documentElement) return false;
+let state = window.__scraperReadiness;
+if (!state) {
+    state = {lastChange: now, resources: 0};
+    new MutationObserver(() => { state.lastChange = performance.now(); })
+        .observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+    window.__scraperReadiness = state;
+}
+const resources = performance.getEntriesByType('resource').length;
+if (resources !== state.resources) {
+    state.resources = resources;
+    state.lastChange = now;
+}
+if (document.readyState !== 'complete') return false;
+// a page with a ready selector is ready once it shows it, without waiting for the quiet period
+if (readySelector) return document.querySelector(readySelector) !== null;
+if (window.jQuery && window.jQuery.active > 0) return false;
+for (const spinner of document.querySelectorAll('.loading, .spinner, .loader')) {
+    if (spinner.offsetParent !== null) return false;
+}
+return now - state.lastChange >= quietMs;
+"""
+
+# Opportunity fields read from notice documents, with the description given to the LLM
+EXTRACTED_FIELDS = {
+    "title": "project title",
+    "country": "applied country name",
+    "budget": "contract budget exactly as written in the document (e.g. `US$317.5 million`), or `Not defined` if no budget is mentioned",
+    "sector": "applied sector",
+    "summary": "summary of the requested services",
+    "deadline": "last deadline date",
+    "program": "related program and project",
+}
+
+# Seconds a domain found without challenge is trusted before it is probed again
+CHALLENGE_RECHECK_AFTER = int(os.environ.get("CHALLENGE_RECHECK_AFTER", "300"))
+
+# Returns the kind of CAPTCHA/challenge on the page, or null
+CHALLENGE_PROBE = """
+const selectors = [
+    ['cloudflare', "iframe[src*='challenges.cloudflare.com'], iframe[src*='cf-chl-widget'], [id*='cf-chl-widget'], [class*='cf-chl-widget'], #challenge-form, #challenge-running"],
+    ['turnstile', "iframe[src*='turnstile'], [class*='turnstile']"],
+    ['recaptcha', "iframe[src*='recaptcha'], [class*='recaptcha'], [id*='recaptcha']"],
+    ['hcaptcha', "iframe[src*='hcaptcha'], [class*='hcaptcha'], [id*='hcaptcha']"],
+    ['captcha', "iframe[src*='captcha'], [class*='captcha'], [id*='captcha']"],
+];
+for (const [kind, selector] of selectors) {
+    if (document.querySelector(selector)) return kind;
+}
+// interstitial pages are short, so the title and the start of the text are enough
+const text = (document.title + ' ' + (document.body ? document.body.innerText.slice(0, 2000) : '')).toLowerCase();
+const phrases = [
+    'just a moment', 'checking your browser', 'needs to review the security of your connection',
+    'ddos protection by cloudflare', 'verify you are human', 'prove you are not a robot',
+];
+for (const phrase of phrases) {
+    if (text.includes(phrase)) return 'cloudflare';
+}
+return null;
+"""
+
+
+class ChallengeCache:
+    """Per-domain results of challenge detection, shared by all scrapers of the process"""
+
+    def __init__(self, recheck_after=CHALLENGE_RECHECK_AFTER):
+        self.recheck_after = recheck_after
+        self.lock = threading.Lock()
+        self.clean_since = {}
+
+    def is_clean(self, domain):
+        with self.lock:
+            checked = self.clean_since.get(domain)
+        return checked is not None and time.monotonic() - checked < self.recheck_after
+
+    def record(self, domain, challenge):
+        with self.lock:
+            if challenge:
+                # challenged domains are probed on every check until they are clean again
+                self.clean_since.pop(domain, None)
+            else:
+                self.clean_since[domain] = time.monotonic()
+
+
+challenge_cache = ChallengeCache()
+
 
 class BankScraperBase:
     def __init__(self) -> None:
         """Initialize the base scraper class"""
         self.driver = None
+        # pagination cursors, subclasses advance whichever one their site uses
+        self.page_num = 0
+        self.os_num = 0
+        # monotonic time after which the scraper stops, set by the orchestrator
+        self.deadline = None
+        # monotonic time after which the detail pages of the current listing page are left for the next run
+        self.page_deadline = None
+        # cancellation token, set to stop the crawl at its next check
+        self.stop_event = stop_event
+        # set when another worker took over the bank's lease; shared with the detail workers
+        self.lease_lost = threading.Event()
+        # seconds the bank may run and browsers reading its detail pages, from its schedule
+        self.time_budget = None
+        self.detail_workers = DETAIL_WORKERS
+        # full crawls walk every listing page, incremental ones stop at the known frontier
+        self.full_crawl = False
+        self.high_water_urls = set()
+        self.seen_urls = []
+        self.last_published = None
+        self.consecutive_known = 0
+        self.new_projects = 0
+        # set when pagination ended normally, otherwise the next run resumes from the checkpoint
+        self.crawl_completed = False
+        self.resume_urls = []
+        # detail pages this full crawl extracted, so a resumed click-paginated crawl does not repeat them
+        self.done_urls = set()
+        self.sink = OpportunitySink()
+        # fingerprints of stored projects and of the documents read in this crawl, by url
+        self.stored_fingerprints = {}
+        self.document_fingerprints = {}
+        self.current_url = None
+        # detail pages that crashed a browser, requeued only once; shared with the detail workers
+        self.crashed_urls = set()
+        # set on detail workers, which hand their projects to the scraper instead of the sink
+        self.collected = None
+        # seconds spent waiting for pages to become ready
+        self.wait_seconds = 0.0
+        # the scraper and its detail workers share one session, used by one worker thread at a time
+        self.db_lock = threading.Lock()
         atexit.register(self.cleanup_webdriver)
 
+    def is_out_of_time(self):
+        """Return whether the time budget of this scraper is used up"""
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def should_stop(self):
+        """Return whether the crawl must end now: it was stopped, lost its lease or used up its time budget"""
+        return self.stop_event.is_set() or self.lease_lost.is_set() or self.is_out_of_time()
+
+    def is_page_out_of_time(self):
+        return self.page_deadline is not None and time.monotonic() >= self.page_deadline
+
+    def start_page(self):
+        """Start the time budget of one listing page and its detail pages"""
+        self.page_deadline = time.monotonic() + PAGE_TIME_BUDGET
+
+    def time_left(self):
+        """Return the seconds until the nearest deadline, None when there is none"""
+        deadlines = [deadline for deadline in (self.deadline, self.page_deadline) if deadline is not None]
+        if not deadlines:
+            return None
+        return max(min(deadlines) - time.monotonic(), 0.0)
+
+    def check_cancelled(self):
+        """Raise CrawlCancelled once the crawl was stopped or is past one of its deadlines"""
+        if self.stop_event.is_set():
+            raise CrawlCancelled(f"{self.get_name()} crawl was stopped")
+        if self.lease_lost.is_set():
+            raise CrawlCancelled(f"{self.get_name()} lease was taken over by another worker")
+        if self.is_out_of_time() or self.is_page_out_of_time():
+            raise CrawlCancelled(f"{self.get_name()} crawl ran out of time")
+
+    def wait(self, timeout, poll_frequency=0.5):
+        """WebDriverWait on the scraper's browser that gives up when the crawl is stopped or out of time"""
+        return CancellableWait(self, timeout, poll_frequency)
+
+    async def pause(self, seconds):
+        """Sleep on the event loop, waking up early to raise CrawlCancelled when the crawl is stopped"""
+        left = self.time_left()
+        end = time.monotonic() + (seconds if left is None else min(seconds, left))
+        while not self.should_stop() and time.monotonic() < end:
+            await asyncio.sleep(min(0.5, end - time.monotonic()))
+        self.check_cancelled()
+
+    async def load(self, url):
+        """Load a page in the scraper's browser without blocking the event loop"""
+        await asyncio.to_thread(self.driver.get, url)
+
+    async def run_db(self, method, *args):
+        """Run a database call on a worker thread so the event loop keeps serving the other banks"""
+        def locked():
+            with self.db_lock:
+                return method(*args)
+
+        return await asyncio.to_thread(locked)
+
+    def get_crawl_state(self):
+        state = db.session.get(CrawlState, self.get_name())
+        if state is None:
+            state = CrawlState(bank=self.get_name(), new_projects=0, finished=True)
+            db.session.add(state)
+        return state
+
+    def load_crawl_state(self):
+        """Load the high-water mark left by the previous crawl of this bank and resume it if it was cut short"""
+        state = db.session.get(CrawlState, self.get_name())
+        self.seen_urls = []
+        self.consecutive_known = 0
+        self.new_projects = 0
+        self.crawl_completed = False
+        self.resume_urls = []
+        self.done_urls = set()
+        if state is None:
+            return
+        self.high_water_urls = set(state.get_last_seen_urls())
+        self.last_published = state.last_published
+
+        if not state.finished and state.cursor:
+            cursor = state.get_cursor()
+            # an interrupted full crawl is continued as a full crawl
+            self.full_crawl = self.full_crawl or state.last_mode == "full"
+            if self.get_api_source() is not None or not self.is_next_page_by_click():
+                # click-paginated listings can only be replayed from their first page
+                self.page_num = cursor.get("page_num", self.page_num)
+                self.os_num = cursor.get("os_num", self.os_num)
+            self.resume_urls = state.get_pending_urls()
+            if self.full_crawl:
+                self.done_urls = set(state.get_done_urls())
+            logging.info(
+                f"Resuming {self.get_name()} at page {self.page_num}/{self.os_num} "
+                f"with {len(self.resume_urls)} pending and {len(self.done_urls)} finished detail pages"
+            )
+
+    def checkpoint(self, pending_urls=()):
+        """Persist the listing cursor and the detail URLs still to extract, after writing what was scraped.
+
+        A failed write raises before the cursor moves, so the checkpoint never skips unsaved projects.
+        """
+        self.sink.flush()
+        # every checkpoint proves this worker is alive; without the lease another worker owns the state
+        if not renew_bank_lease(self.get_name()):
+            db.session.rollback()
+            self.lease_lost.set()
+            raise CrawlCancelled(f"{self.get_name()} lease was taken over by another worker")
+        state = self.get_crawl_state()
+        state.cursor = json.dumps({"page_num": self.page_num, "os_num": self.os_num})
+        state.pending_urls = json.dumps(list(pending_urls))
+        state.done_urls = json.dumps(sorted(self.done_urls)) if self.done_urls else None
+        state.last_mode = "full" if self.full_crawl else "incremental"
+        state.finished = False
+        db.session.commit()
+
+    def save_crawl_state(self):
+        """Persist the newest URLs of this crawl as the high-water mark of the next one"""
+        state = self.get_crawl_state()
+        now = datetime.datetime.utcnow()
+        if self.seen_urls:
+            state.set_last_seen_urls(self.seen_urls)
+        state.last_published = self.last_published
+        state.last_mode = "full" if self.full_crawl else "incremental"
+        state.new_projects = self.new_projects
+        state.last_crawl_at = now
+        if self.crawl_completed:
+            state.cursor = None
+            state.pending_urls = None
+            state.done_urls = None
+            state.finished = True
+            if self.full_crawl:
+                state.last_full_crawl_at = now
+        # otherwise the checkpoint stays, and the next run resumes from it
+        db.session.commit()
+
+    def track_row(self, url, known, published=None):
+        """Record one listing row for the high-water mark and the incremental stop condition"""
+        if len(self.seen_urls) < HIGH_WATER_URLS:
+            self.seen_urls.append(url)
+        if published and (self.last_published is None or published > self.last_published):
+            self.last_published = published
+        if known:
+            self.consecutive_known += 1
+        else:
+            self.consecutive_known = 0
+            self.new_projects += 1
+
+    def reached_known_frontier(self):
+        """Return whether an incremental crawl has run into rows it already knows"""
+        return not self.full_crawl and self.consecutive_known >= INCREMENTAL_STOP_AFTER
+
+    async def known_urls(self, urls):
+        """Return which of the urls are already stored, resolved with one IN query per chunk.
+
+        The fingerprints of all of them are loaded too. The high-water mark of the last
+        crawl is not consulted here, it only stops pagination (see track_row's callers).
+        """
+        known = set()
+        candidates = list({url for url in urls if url})
+
+        def lookup(chunk):
+            return db.session.execute(
+                db.select(Opportunity.url, Opportunity.fingerprint).where(Opportunity.url.in_(chunk))
+            ).all()
+
+        for start in range(0, len(candidates), URL_LOOKUP_CHUNK):
+            chunk = candidates[start:start + URL_LOOKUP_CHUNK]
+            for url, fingerprint in await self.run_db(lookup, chunk):
+                known.add(url)
+                self.stored_fingerprints[url] = fingerprint
+        # projects buffered in the sink are stored with their next flush
+        for url in candidates:
+            if url in self.sink.pending:
+                known.add(url)
+                self.stored_fingerprints[url] = self.sink.pending[url]["fingerprint"]
+        return known
+
+    async def process_row_urls(self, row_urls):
+        """Extract the projects of one listing page, skipping the rows that are already stored.
+
+        Full crawls revisit stored rows too; their documents are fingerprinted so
+        that unchanged ones are not sent to the LLM again.
+        """
+        known = await self.known_urls(row_urls)
+        logging.info(f"{self.get_name()}: {len(known)} of {len(row_urls)} rows are already known")
+        detail_urls = []
+        for row_url in row_urls:
+            if self.reached_known_frontier():
+                break
+            # rows recovered from the checkpoint are new for this crawl, not the known frontier
+            frontier = row_url in known or row_url in self.high_water_urls
+            self.track_row(row_url, frontier and row_url not in self.resume_urls)
+            if row_url in known and not self.full_crawl:
+                continue
+            # a resumed full crawl replays its listing, but not the detail pages it already read
+            if row_url in self.done_urls:
+                continue
+            detail_urls.append(row_url)
+        await self.extract_details(detail_urls)
+
+    async def extract_details(self, urls):
+        """Extract detail pages spread over up to `detail_workers` browsers.
+
+        The scraper's own browser takes part, so click-paginated listings keep
+        their tab; extra browsers are leased from the pool while any are free
+        and work the queue as tasks on the same event loop.
+        """
+        await self.run_db(self.checkpoint, urls)
+        work = queue_urls(urls)
+        collected = []
+        helpers = []
+        if self.detail_workers > 1 and len(urls) > 1:
+            for _ in range(min(self.detail_workers - 1, len(urls) - 1)):
+                helpers.append(asyncio.create_task(run_detail_worker(self, work, collected)))
+
+        crashed = None
+        try:
+            await self.extract_detail_queue(work)
+        except BrowserCrashed as e:
+            # the helpers finish the queue; the page is retried on a fresh browser afterwards
+            crashed = e
+        await asyncio.gather(*helpers)
+        for project in collected:
+            await self.run_db(self.sink.add, project)
+
+        remaining = []
+        while not work.empty():
+            remaining.append(work.get_nowait())
+        if self.full_crawl:
+            self.done_urls.update(url for url in urls if url not in remaining)
+        if crashed is not None:
+            await self.run_db(self.checkpoint, remaining)
+            raise crashed
+        if remaining and self.should_stop():
+            # the next run resumes with the detail pages left over
+            await self.run_db(self.checkpoint, remaining)
+            raise CrawlCancelled(f"{self.get_name()} stopped with {len(remaining)} detail pages left")
+        if remaining:
+            logging.warning(f"{self.get_name()} page took over {PAGE_TIME_BUDGET}s, skipping {len(remaining)} detail pages")
+
+    async def extract_detail_queue(self, work):
+        """Extract queued detail pages until the queue is empty, the crawl is stopped or time is up"""
+        while not self.should_stop() and not self.is_page_out_of_time():
+            try:
+                url = work.get_nowait()
+            except queue.Empty:
+                return
+            self.current_url = url
+            try:
+                async with domain_limiter.slot(url):
+                    await self.extract_project_data(url)
+            except CrawlCancelled:
+                # left in the queue for the checkpoint
+                work.put(url)
+                return
+            except Exception as e:
+                logging.error(f"Error processing {url}: {e}")
+                if not await asyncio.to_thread(driver_pool.is_alive, self.driver):
+                    if url not in self.crashed_urls:
+                        # another browser gets the page, unless it crashes that one too
+                        self.crashed_urls.add(url)
+                        work.put(url)
+                    raise BrowserCrashed(f"browser crashed on {url}")
+            finally:
+                self.current_url = None
+                await self.close_detail_windows()
+
+    async def close_detail_windows(self):
+        """Close the detail tabs a failed or cancelled extraction left open and go back to the listing tab"""
+        def close(driver):
+            handles = driver.window_handles
+            if len(handles) < 2:
+                return
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+
+        if self.driver is None:
+            return
+        try:
+            await asyncio.to_thread(close, self.driver)
+        except WebDriverException as e:
+            # a crashed browser is replaced, its tabs go with it
+            logging.warning(f"Could not close detail tabs of {self.get_name()}: {e}")
+
+    async def stored_fields(self, url, field_names):
+        """Return the previously extracted fields of a stored project"""
+        columns = {"title": "project_name"}
+
+        def lookup():
+            opportunity = Opportunity.query.filter_by(url=url).first()
+            if opportunity is None:
+                return None
+            return {name: getattr(opportunity, columns.get(name, name)) or "" for name in field_names}
+
+        return await self.run_db(lookup)
+
     def cleanup_webdriver(self):
         """Cleanup WebDriver on exit"""
         if self.driver:
-            try:
-                self.driver.quit()
-                logging.info("WebDriver cleaned up.")
-            except Exception as e:
-                logging.error(f"Error during WebDriver cleanup: {e}")
+            driver_pool.release(self.driver, discard=True)
+            self.driver = None
+            logging.info("WebDriver cleaned up.")
         else:
             logging.info("No WebDriver instance to clean up.")
 
     async def setup_driver(self, proxy=None):
-        """Set up the Firefox driver with necessary configurations"""
-        options = FirefoxOptions()
-        if HEADLESS:
-            options.add_argument("--headless")
-
-        # Enhanced stealth settings
-        options.set_preference("dom.webdriver.enabled", False)
-        options.set_preference("useAutomationExtension", False)
-        options.set_preference(
-            "general.useragent.override",
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        )
-
-        # Additional stealth preferences
-        options.set_preference("dom.webnotifications.enabled", False)
-        options.set_preference("media.volume_scale", "0.0")
-        options.set_preference("network.proxy.type", 0)
-        options.set_preference("privacy.resistFingerprinting", False)
-        options.set_preference("browser.cache.disk.enable", False)
-        options.set_preference("browser.cache.memory.enable", False)
-
-        # Create the Firefox driver
-        self.driver = webdriver.Firefox(options=options)
-
-        # Enhanced stealth: remove webdriver properties
-        self.driver.execute_script(
-            "Object.defineProperty(navigator, 'webdriver', {get: ()=> undefined})"
-        )
-        self.driver.execute_script(
-            "Object.defineProperty(navigator, 'plugins', {get: ()=> [1, 2, 3, 4, 5]})"
-        )
-        self.driver.execute_script(
-            "Object.defineProperty(navigator, 'languages', {get: ()=> ['en-US', 'en']})"
-        )
+        """Lease a stealth-configured Firefox driver from the shared pool"""
+        while True:
+            if self.should_stop():
+                raise CrawlCancelled(f"{self.get_name()} stopped while waiting for a browser")
+            try:
+                # browsers start and are waited for on a worker thread
+                self.driver = await asyncio.to_thread(driver_pool.acquire, 5)
+                return
+            except TimeoutError:
+                continue
 
-        print("-- Driver set up for scraping --")
+    async def release_driver(self, discard=False):
+        """Hand the leased driver back to the pool, discarding it if it is broken"""
+        if self.driver:
+            driver, self.driver = self.driver, None
+            await asyncio.to_thread(driver_pool.release, driver, discard)
+            logging.info(f"Driver of {self.get_name()} released")
 
     async def handle_cloudflare_captcha(self):
         """Handle Cloudflare CAPTCHA"""
         start_time = time.time()
-        
+
+        # clean domains are answered from the cache without touching the page
+        if not await self.is_cloudflare_captcha_present(30):
+            return
+
         # Keep solving CAPTCHA until the timeout is reached or CAPTCHA disappears
-        while await self.is_cloudflare_captcha_present(30):
+        while await self.is_cloudflare_captcha_present(30, use_cache=False):
             await self.solve_cloudflare_captcha()
             
             # Sleep to allow for the CAPTCHA solving to process
-            time.sleep(2)  # You can adjust this depending on how long CAPTCHA solving takes
+            await self.pause(2)  # You can adjust this depending on how long CAPTCHA solving takes
 
             # Check if CAPTCHA is still present after attempting to solve it
             if time.time() - start_time > 180:  # If it takes longer than 3 minutes, break the loop
@@ -106,7 +548,7 @@ class BankScraperBase:
                 break
             
         # Verify if CAPTCHA was solved successfully
-        if not await self.is_cloudflare_captcha_present(30):
+        if not await self.is_cloudflare_captcha_present(30, use_cache=False):
             print("CAPTCHA solved successfully.")
         else:
             print("Failed to solve CAPTCHA.")
@@ -117,7 +559,7 @@ class BankScraperBase:
             print("Attempting to solve Cloudflare CAPTCHA...")
             
             # Wait for page to load and check for CAPTCHA elements
-            wait = WebDriverWait(self.driver, 15)
+            wait = self.wait(15)
             
             # Multiple selectors for Cloudflare challenge elements
             cloudflare_selectors = [
@@ -131,7 +573,7 @@ class BankScraperBase:
             challenge_frame = None
             for selector in cloudflare_selectors:
                 try:
-                    challenge_frame = wait.until(
+                    challenge_frame = await wait.until(
                         EC.presence_of_element_located((By.CSS_SELECTOR, selector))
                     )
                     print(f"Found Cloudflare challenge frame with selector: {selector}")
@@ -144,7 +586,7 @@ class BankScraperBase:
                 return False
             
             # Switch to the challenge frame
-            self.driver.switch_to.frame(challenge_frame)
+            await asyncio.to_thread(self.driver.switch_to.frame, challenge_frame)
             
             # Multiple selectors for the checkbox
             checkbox_selectors = [
@@ -160,17 +602,17 @@ class BankScraperBase:
             checkbox_clicked = False
             for selector in checkbox_selectors:
                 try:
-                    checkbox = WebDriverWait(self.driver, 10).until(
+                    checkbox = await self.wait(10).until(
                         EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
                     )
                     print(f"Found checkbox with selector: {selector}")
                     
                     # Scroll to element if needed
-                    self.driver.execute_script("arguments[0].scrollIntoView(true);", checkbox)
-                    time.sleep(1)
+                    await asyncio.to_thread(self.driver.execute_script, "arguments[0].scrollIntoView(true);", checkbox)
+                    await self.pause(1)
                     
                     # Click the checkbox
-                    checkbox.click()
+                    await asyncio.to_thread(checkbox.click)
                     checkbox_clicked = True
                     print("CAPTCHA checkbox clicked successfully")
                     break
@@ -178,7 +620,7 @@ class BankScraperBase:
                     continue
             
             # Switch back to default content
-            self.driver.switch_to.default_content()
+            await asyncio.to_thread(self.driver.switch_to.default_content)
             
             if not checkbox_clicked:
                 print("No clickable checkbox found in challenge frame")
@@ -191,8 +633,8 @@ class BankScraperBase:
             for i in range(30):
                 try:
                     # Check if challenge frame is gone (indicator of completion)
-                    self.driver.find_element(By.CSS_SELECTOR, "iframe[src*='challenges.cloudflare.com']")
-                except:
+                    await asyncio.to_thread(self.driver.find_element, By.CSS_SELECTOR, "iframe[src*='challenges.cloudflare.com']")
+                except Exception:
                     print("Challenge frame disappeared - CAPTCHA likely completed")
                     return True
                 
@@ -204,229 +646,125 @@ class BankScraperBase:
                         "div[class*='turnstile-success']"
                     ]
                     for selector in success_elements:
-                        if self.driver.find_element(By.CSS_SELECTOR, selector):
+                        if await asyncio.to_thread(self.driver.find_element, By.CSS_SELECTOR, selector):
                             print("CAPTCHA completed successfully")
                             return True
-                except:
+                except Exception:
                     pass
                 
-                time.sleep(1)
+                await self.pause(1)
             
             print("CAPTCHA completion timeout - may need manual intervention")
             return False
             
+        except CrawlCancelled:
+            await asyncio.to_thread(self.driver.switch_to.default_content)
+            raise
         except Exception as e:
             print(f"Error solving Cloudflare CAPTCHA: {e}")
             # Ensure we're back to default content
             try:
-                self.driver.switch_to.default_content()
-            except:
+                await asyncio.to_thread(self.driver.switch_to.default_content)
+            except Exception:
                 pass
             return False
 
-    async def wait_for_captcha_completion(self, timeout=30):
-        """Wait for CAPTCHA to complete with better detection"""
-        print("Waiting for CAPTCHA to complete...")
-        
-        for i in range(timeout):
-            try:
-                # Check if challenge frame is gone (indicator of completion)
-                self.driver.find_element(By.CSS_SELECTOR, "iframe[src*='challenges.cloudflare.com']")
-            except:
-                print("Challenge frame disappeared - CAPTCHA likely completed")
-                return True
-            
-            # Check for success indicators
-            try:
-                success_elements = [
-                    "div[class*='cf-chl-widget'][class*='success']",
-                    "div[class*='challenge-success']",
-                    "div[class*='turnstile-success']"
-                ]
-                for selector in success_elements:
-                    if self.driver.find_element(By.CSS_SELECTOR, selector):
-                        print("CAPTCHA completed successfully")
-                        return True
-            except:
-                pass
-            
-            time.sleep(1)
-        
-        print("CAPTCHA completion timeout - may need manual intervention")
-        return False
+    async def detect_challenge(self, use_cache=True):
+        """Classify the CAPTCHA/challenge on the current page with one script call.
 
-    
-    async def is_cloudflare_captcha_present(self, timeout=50):
-        """Check if Cloudflare CAPTCHA is present with multiple detection methods"""
+        Returns 'cloudflare', 'turnstile', 'recaptcha', 'hcaptcha', 'captcha' or None.
+        A domain found clean is not probed again for CHALLENGE_RECHECK_AFTER seconds,
+        unless use_cache is False.
+        """
         try:
-            # Method 1: Check for specific Cloudflare elements
-            cloudflare_selectors = [
-                "iframe[src*='challenges.cloudflare.com']",
-                "iframe[src*='cf-chl-widget']",
-                "iframe[id*='cf-chl-widget']",
-                "iframe[class*='cf-chl-widget']",
-                "iframe[src*='turnstile']",
-                "div[class*='cf-chl-widget']",
-                "div[id*='cf-chl-widget']",
-                "div[class*='challenge']",
-                "div[id*='challenge']"
-            ]
-            
-            for selector in cloudflare_selectors:
-                try:
-                    WebDriverWait(self.driver, 2).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                    print(f"Cloudflare CAPTCHA detected with selector: {selector}")
-                    return True
-                except TimeoutException:
-                    continue
-            
-            # Method 2: Check page source for Cloudflare indicators
-            page_source = self.driver.page_source.lower()
-            cloudflare_indicators = [
-                "challenges.cloudflare.com",
-                "cf-chl-widget",
-                "cloudflare challenge",
-                "checking your browser",
-                "please wait while we check your browser",
-                "ddos protection by cloudflare",
-                "security check",
-                "turnstile"
-            ]
-            
-            for indicator in cloudflare_indicators:
-                if indicator in page_source:
-                    print(f"Cloudflare CAPTCHA detected in page source: {indicator}")
-                    return True
-            
-            # Method 3: Check for specific text patterns
-            text_patterns = [
-                "www.adb.org needs to review the security of your connection before proceeding",
-                "just a moment",
-                "checking your browser",
-                "please wait",
-                "security check",
-                "ddos protection"
-            ]
-            
-            for pattern in text_patterns:
-                if pattern.lower() in page_source:
-                    print(f"Cloudflare CAPTCHA detected with text pattern: {pattern}")
-                    return True
-            
-            return False
-            
+            domain = urlparse(await asyncio.to_thread(lambda: self.driver.current_url)).netloc
+            if use_cache and challenge_cache.is_clean(domain):
+                return None
+            challenge = await asyncio.to_thread(self.driver.execute_script, CHALLENGE_PROBE)
         except Exception as e:
-            print(f"Error checking for Cloudflare CAPTCHA: {e}")
-            return False
+            print(f"Error checking for CAPTCHA: {e}")
+            return None
+
+        challenge_cache.record(domain, challenge)
+        if challenge:
+            logging.info(f"{challenge} challenge detected on {domain}")
+        return challenge
 
-    async def is_captcha_present(self):
+    async def is_cloudflare_captcha_present(self, timeout=50, use_cache=True):
+        """Check if Cloudflare CAPTCHA is present"""
+        return await self.detect_challenge(use_cache) in ("cloudflare", "turnstile")
+
+    async def is_captcha_present(self, use_cache=True):
         """Check if any CAPTCHA is present (Cloudflare, reCAPTCHA, hCaptcha, etc.)"""
+        return await self.detect_challenge(use_cache) is not None
+
+    async def wait_until_ready(self, ready_selector=None, timeout=PAGE_READY_TIMEOUT):
+        """Poll the page until it is loaded and shows ready_selector, or is quiet without one; return the seconds waited.
+
+        One script call per poll checks the document state and the selector, or else
+        pending jQuery requests, visible spinners, new network resources and DOM
+        mutations, so a ready page is detected within one poll instead of after fixed sleeps.
+        """
+        started = time.monotonic()
         try:
-            # Check for various CAPTCHA types
-            captcha_selectors = [
-                # reCAPTCHA
-                "iframe[src*='recaptcha']",
-                "div[class*='recaptcha']",
-                "div[id*='recaptcha']",
-                # hCaptcha
-                "iframe[src*='hcaptcha']",
-                "div[class*='hcaptcha']",
-                "div[id*='hcaptcha']",
-                # Cloudflare
-                "iframe[src*='challenges.cloudflare.com']",
-                "iframe[src*='cf-chl-widget']",
-                "div[class*='cf-chl-widget']",
-                # Turnstile
-                "iframe[src*='turnstile']",
-                "div[class*='turnstile']",
-                # Generic CAPTCHA
-                "iframe[src*='captcha']",
-                "div[class*='captcha']",
-                "div[id*='captcha']",
-                "input[type='checkbox'][id*='captcha']",
-                "input[type='checkbox'][class*='captcha']"
-            ]
-            
-            for selector in captcha_selectors:
-                try:
-                    WebDriverWait(self.driver, 2).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                    print(f"CAPTCHA detected with selector: {selector}")
-                    return True
-                except TimeoutException:
-                    continue
-            
-            # Check page source for CAPTCHA indicators
-            page_source = self.driver.page_source.lower()
-            captcha_indicators = [
-                "recaptcha",
-                "hcaptcha",
-                "cloudflare",
-                "turnstile",
-                "captcha",
-                "challenge",
-                "security check",
-                "verify you are human",
-                "prove you are not a robot"
-            ]
-            
-            for indicator in captcha_indicators:
-                if indicator in page_source:
-                    print(f"CAPTCHA detected in page source: {indicator}")
-                    return True
-            
-            return False
-            
-        except Exception as e:
-            print(f"Error checking for CAPTCHA: {e}")
-            return False
-        
-    async def wait_for_completed_loading(self, timeout=30):
-        """Wait for dynamic content (AJAX) to load"""
-        try:
-            self.driver.execute_script(
-                "window.scrollTo(0, document.body.scrollHeight);"
-            )  # Scroll to bottom
-
-            # Wait for page to load completely
-            WebDriverWait(self.driver, 50).until(
-                lambda d: d.execute_script("return document.readyState")
-                == "complete"
+            await self.wait(timeout, poll_frequency=PAGE_READY_POLL).until(
+                lambda d: d.execute_script(READINESS_PROBE, ready_selector, PAGE_QUIET_MS)
             )
+        except TimeoutException:
+            url = await asyncio.to_thread(lambda: self.driver.current_url)
+            logging.warning(f"{self.get_name()} page was not ready after {timeout}s: {url}")
+        waited = time.monotonic() - started
+        self.wait_seconds += waited
+        return waited
 
-            self.driver.execute_script(
-                "window.scrollTo(0, document.body.scrollHeight);"
-            )  # Scroll to bottom
-            WebDriverWait(self.driver, timeout).until(
-                lambda d: d.execute_script("return jQuery.active == 0")
-            )
-        except Exception:
-            pass  # jQuery might not be available, continue
+    async def wait_for_completed_loading(self, timeout=PAGE_READY_TIMEOUT):
+        """Wait for dynamic content (AJAX) of the listing page to load"""
+        # scroll to the bottom so lazily loaded rows are requested
+        await asyncio.to_thread(self.driver.execute_script, "window.scrollTo(0, document.body.scrollHeight);")
+        waited = await self.wait_until_ready(self.get_ready_selector(), timeout)
+        logging.info(f"Waited {waited:.1f}s for the {self.get_name()} page to be ready")
+
+    async def click_next_page(self, element):
+        """Click a next page control and wait until the listing's first row was replaced.
+
+        The rows of the old page already match the ready selector, so wait_until_ready
+        alone would return before the click had any effect.
+        """
+        rows = await asyncio.to_thread(self.driver.find_elements, By.CSS_SELECTOR, self.get_ready_selector())
+        first_row = rows[0] if rows else None
+        first_text = await asyncio.to_thread(lambda: first_row.text) if first_row is not None else None
+        await asyncio.to_thread(element.click)
+        if first_row is None:
+            return
+
+        def listing_changed(driver):
+            try:
+                return first_row.text != first_text
+            except StaleElementReferenceException:
+                return True
 
         try:
-            loading_selectors = [
-                ".loading", ".spinner", ".loader", "[class*='loading']",
-                "[class*='spinner']", "[class*='loader']"
-            ]
-            for selector in loading_selectors:
-                try:
-                    WebDriverWait(self.driver, 5).until(
-                        EC.invisibility_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                except Exception:
-                    pass
-        except Exception:
-            pass
-        # Allow additional time for animations or content loading
-        time.sleep(2)
+            await self.wait(PAGE_READY_TIMEOUT, poll_frequency=PAGE_READY_POLL).until(listing_changed)
+        except TimeoutException:
+            logging.warning(f"{self.get_name()} listing did not change after clicking next page")
+
+    async def open_detail_page(self, url, ready_selector=None):
+        """Open a project detail page in a new tab and wait until it is ready"""
+        def open_tab(driver):
+            driver.execute_script("window.open('');")
+            driver.switch_to.window(driver.window_handles[-1])
 
-    def export_excel(self, filename, data_array):
-        """Export data to an Excel file"""
-        df = pd.DataFrame(data_array)
-        df.to_excel(filename, index=False)
+        await asyncio.to_thread(open_tab, self.driver)
+        await self.load(url)
+        await self.wait_until_ready(ready_selector)
+
+    async def close_detail_page(self):
+        """Close the detail tab opened by open_detail_page and go back to the listing tab"""
+        def close_tab(driver):
+            driver.close()
+            driver.switch_to.window(driver.window_handles[0])
+
+        await asyncio.to_thread(close_tab, self.driver)
 
     def notify_error(self, message):
         """Notify via Slack in case of an error"""
@@ -446,141 +784,278 @@ class BankScraperBase:
         except Exception as e:
             print(f"Error printing HTML for {description}: {e}")
             
-    async def opportunity_of_url(self, input_url):
-        # Query for the first match (returns None if no match is found)
-        opportunity = Opportunity.query.filter_by(url=input_url).first()
-        print("Opportunity is ",opportunity)
-        return opportunity
-
     async def save_to_database(self, project):
-        """Save project data to the database"""
-        print("saving database now.")
-        existing_opportunity=await self.opportunity_of_url(project["url"]);
-        if existing_opportunity is not None:
-            print("URL already exists. Updating the existing project...")
-    
-            # Update the fields with new data from the project dictionary
-            existing_opportunity.project_name = project["title"]
-            existing_opportunity.client = project["client"]
-            existing_opportunity.country = project["country"]
-            existing_opportunity.sector = project["sector"]
-            existing_opportunity.summary = project["summary"]
-            existing_opportunity.deadline = project["deadline"]
-            existing_opportunity.program = project["program"]
-            existing_opportunity.budget = project["budget"]
-            existing_opportunity.found = False  # You can modify this as needed
-            
-            # Reset the three_matched_scores_and_recommended_partners_ids field
-            existing_opportunity.set_three_matched_scores_and_recommended_partners_ids([])
+        """Queue project data for the next bulk write to the database"""
+        fingerprint = self.document_fingerprints.pop(project.get("url"), None)
+        if fingerprint:
+            project.setdefault("fingerprint", fingerprint)
+        if self.collected is not None:
+            self.collected.append(project)
+            return
+        # a full buffer is flushed right away
+        await self.run_db(self.sink.add, project)
 
-            # Save the updates to the database
-            db.session.commit()
 
-            print("Existing project updated successfully.")
-        else:
-            print("adding new project to database")
-            try:
-                opp = Opportunity(
-                    project_name=project["title"],
-                    client=project["client"],
-                    country=project["country"],
-                    sector=project["sector"],
-                    summary=project["summary"],
-                    deadline=project["deadline"],
-                    program=project["program"],
-                    budget=project["budget"],
-                    url=project["url"],
-                    found=False,
-                )
+    async def get_openai_response(self, prompt, query, temperature=0.7, json_output=False):
+        """Get response from OpenAI API, served from the LLM cache when the same call was made before"""
+        model = "gpt-4o-mini"  # You can use "gpt-4", "gpt-3.5-turbo", etc.
+        options = {"response_format": {"type": "json_object"}} if json_output else {}
 
-                print("Saving project to database...")
-                # Custom function to convert Opportunity object to dictionary
-                def opportunity_to_dict(opp):
-                    return {
-                        "project_name": opp.project_name,
-                        "client": opp.client,
-                        "country": opp.country,
-                        "sector": opp.sector,
-                        "summary": opp.summary,
-                        "deadline": opp.deadline,
-                        "program": opp.program,
-                        "budget": opp.budget,
-                        "url": opp.url,
-                        "found": opp.found,
-                    }
-
-                opp.set_three_matched_scores_and_recommended_partners_ids([])  # Initialize with empty list
-                opp_json = json.dumps(opportunity_to_dict(opp), indent=4)
-
-                print(opp_json)
-                db.session.add(opp)
-                db.session.commit()
-            except Exception as e:
-                print("Error in saving database", e)
+        self.check_cancelled()
+        left = self.time_left()
+        timeout = LLM_REQUEST_TIMEOUT if left is None else max(min(LLM_REQUEST_TIMEOUT, left), 1.0)
 
+        async def fetch():
+            # a request cut by the deadline fails instead of keeping the crawl alive
+            async with AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), timeout=timeout, max_retries=1) as client:
+                response = await client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": prompt},
+                        {"role": "user", "content": query},
+                    ],
+                    temperature=temperature,
+                    **options,
+                )
+            return response.choices[0].message.content
+
+        return await llm_cache.acached(model, prompt, query, fetch, temperature=temperature, **options)
 
-            print("Project saved successfully.")
+    async def extract_fields_with_openai(self, document_text, field_names=None, hints=""):
+        """Extract several Opportunity fields from one document with a single OpenAI call"""
+        field_names = field_names or list(EXTRACTED_FIELDS)
 
+        url = self.current_url
+        if url:
+            fingerprint = fingerprint_text(document_text)
+            self.document_fingerprints[url] = fingerprint
+            if self.stored_fingerprints.get(url) == fingerprint:
+                fields = await self.stored_fields(url, field_names)
+                if fields is not None:
+                    logging.info(f"Document of {url} is unchanged, reusing its extracted fields")
+                    return fields
 
-    async def get_openai_response(self, prompt, query):
-        """Get response from OpenAI API"""
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",  # You can use "gpt-4", "gpt-3.5-turbo", etc.
-            messages=[
-                {"role": "system", "content": prompt},
-                {"role": "user", "content": query},
-            ],
-            temperature=0.7,
+        keys = "\n".join(f"- `{name}`: {EXTRACTED_FIELDS[name]}" for name in field_names)
+        prompt = (
+            "I will upload contract content. Plz analyze it and return a JSON object with exactly these keys:\n"
+            f"{keys}\n"
+            "Every value must be a plain string without any comment and prefix such as `title:`. "
+            "If the document does not contain a value, use an empty string. "
+            f"{hints}"
         )
-        return response.choices[0].message.content
-    
+        response = await self.get_openai_response(prompt, document_text, temperature=0, json_output=True)
+
+        try:
+            data = json.loads(response)
+        except (TypeError, json.JSONDecodeError) as e:
+            raise ValueError(f"OpenAI returned invalid JSON for extracted fields: {e}")
+        if not isinstance(data, dict):
+            raise ValueError("OpenAI returned a JSON value that is not an object")
+
+        fields = {}
+        for name in field_names:
+            value = data.get(name)
+            if isinstance(value, (list, dict)):
+                value = json.dumps(value, ensure_ascii=False)
+            fields[name] = "" if value is None else str(value).strip()
+        return fields
 
 
     async def scrape_page(self):
-        """Main function to scrape projects with proper pagination"""
+        """Main function to scrape projects, preferring the bank's API over the browser"""
+        if self.stop_event.is_set():
+            logging.info(f"Scraping was stopped, skipping {self.get_name()}")
+            return
+        await self.run_db(self.load_crawl_state)
+        logging.info(f"Starting {'full' if self.full_crawl else 'incremental'} crawl of {self.get_name()}")
+        try:
+            api_source = self.get_api_source()
+            if api_source is not None:
+                try:
+                    await self.scrape_with_api(api_source)
+                    return
+                except CrawlCancelled:
+                    raise
+                except Exception as e:
+                    logging.warning(f"API source of {self.get_name()} failed, falling back to browser: {e}")
+                    print(f"API source of {self.get_name()} failed, falling back to browser: {e}")
+
+            await self.scrape_with_browser()
+        except CrawlCancelled as e:
+            # the checkpoint stays, and the next run resumes from it
+            logging.info(f"{e}, keeping its checkpoint")
+            print(f"{e}, keeping its checkpoint")
+        finally:
+            await self.run_db(self.finish_crawl)
+            logging.info(f"{self.get_name()} crawl found {self.new_projects} new projects, written: {self.sink.stats()}")
+            logging.info(f"{self.get_name()} spent {self.wait_seconds:.1f}s waiting for pages")
+
+    def finish_crawl(self):
+        """Write the buffered projects and the crawl state, dropping the projects if that fails"""
+        try:
+            self.sink.flush()
+            if not self.lease_lost.is_set():
+                self.save_crawl_state()
+        except Exception as e:
+            db.session.rollback()
+            # the crawl state was not saved either, so the next run redoes the lost projects
+            dropped = self.sink.discard()
+            logging.error(f"Failed to save crawl results of {self.get_name()}, dropped {dropped} projects: {e}")
+
+    async def scrape_with_api(self, api_source):
+        """Scrape projects from the bank's public feed without starting a browser"""
+        async with api_source.open_client() as client:
+            while not self.should_stop():
+                self.start_page()
+                projects = await api_source.list_projects(client, self.page_num)
+                if not projects:
+                    logging.info(f"No more projects in the {self.get_name()} API, ending pagination.")
+                    self.crawl_completed = True
+                    break
+
+                logging.info(f"Processing {len(projects)} projects of {self.get_name()} API page {self.page_num}")
+                known_urls = await self.known_urls([project["url"] for project in projects])
+                for project in projects:
+                    known = project["url"] in known_urls
+                    frontier = known or project["url"] in self.high_water_urls
+                    self.track_row(project["url"], frontier, project.get("published"))
+                    if not known or self.full_crawl:
+                        await self.save_to_database(project)
+                    if self.reached_known_frontier():
+                        break
+                if self.reached_known_frontier():
+                    logging.info(f"Reached already known projects of {self.get_name()}, stopping.")
+                    self.crawl_completed = True
+                    break
+                self.page_num += 1
+                await self.run_db(self.checkpoint)
+
+    async def scrape_with_browser(self):
+        """Scrape projects with Selenium, page by page"""
 
+        # click-paginated sites are already on the next page after find_and_click_next_page
+        navigated_by_click = False
+        # failed tries of the current listing page, it is skipped after PAGE_RETRIES of them
+        page_failures = 0
         try:
+            if self.resume_urls:
+                # finish the detail pages the interrupted crawl had queued
+                self.start_page()
+                await self.setup_driver()
+                known = await self.known_urls(self.resume_urls)
+                await self.extract_details([url for url in self.resume_urls if url not in known])
+
             while True:
-                if not self.is_next_page_by_click():
-                    await self.setup_driver()
-                elif self.page_num == 0:
+                if self.stop_event.is_set():
+                    print(f"Scraping of {self.get_name()} was stopped.")
+                    logging.info(f"Scraping of {self.get_name()} was stopped.")
+                    break
+                if self.lease_lost.is_set():
+                    logging.warning(f"{self.get_name()} lease was taken over by another worker, stopping.")
+                    break
+                if self.is_out_of_time():
+                    print(f"Time budget of {self.get_name()} is used up, stopping.")
+                    logging.warning(f"Time budget of {self.get_name()} is used up, stopping.")
+                    break
+                self.start_page()
+
+                if self.driver is None:
                     await self.setup_driver()
+                    navigated_by_click = False
 
                 try:
-                    self.driver.get(self.get_url())
+                    if not navigated_by_click:
+                        await self.load(self.get_url())
                     # Wait for all of page to load
                     await self.wait_for_completed_loading()
 
                     # Print page title and URL for debugging
-                    print(f"Page title: {self.driver.title}")
-                    print(f"Current URL: {self.driver.current_url}")
+                    title, url = await asyncio.to_thread(lambda: (self.driver.title, self.driver.current_url))
+                    print(f"Page title: {title}")
+                    print(f"Current URL: {url}")
 
                     await self.extract_projects_data();
+                    worn = driver_pool.count_page(self.driver)
+
+                    if self.reached_known_frontier():
+                        logging.info(f"Reached already known projects of {self.get_name()}, stopping.")
+                        self.crawl_completed = True
+                        break
+                    if self.should_stop():
+                        # stay on the checkpoint of this page instead of moving to the next one
+                        continue
 
                     # Check for next page
                     print("Checking for next page...")
                     if await self.find_and_click_next_page():
                         print("Successfully navigated to next page")
-                        time.sleep(3)  # Wait before next page
+                        await self.run_db(self.checkpoint)
+                        page_failures = 0
+                        navigated_by_click = self.is_next_page_by_click()
+                        if worn and not navigated_by_click:
+                            # URL-paginated sites can move to a fresh browser between pages
+                            await self.release_driver()
                         continue
                     else:
                         print(f"No next page available in {self.get_name()}, ending pagination.")
                         logging.info("No next page button found, ending.")
+                        self.crawl_completed = True
                         break
 
+                except CrawlCancelled:
+                    if self.should_stop():
+                        raise
+                    logging.warning(f"Page {self.os_num} of {self.get_name()} took over {PAGE_TIME_BUDGET}s")
+                    page_failures += 1
                 except Exception as e:
                     logging.error(f"Error scraping page {self.os_num}: {e}")
                     print(f"Error on page {self.os_num}: {e}")
+                    page_failures += 1
+                    if self.driver is not None and not await asyncio.to_thread(driver_pool.is_alive, self.driver):
+                        # Browser crashed, lease a fresh one for the retry
+                        await self.release_driver(discard=True)
+
+                if page_failures > PAGE_RETRIES:
+                    if not await self.skip_page():
+                        break
+                    page_failures = 0
+                    navigated_by_click = self.is_next_page_by_click()
 
+        except CrawlCancelled:
+            raise
         except Exception as e:
             logging.error(f"Fatal error in scrape_page: {e}")
             print(f"Fatal error: {e}")
         finally:
-            if self.driver:
-                self.driver.quit()
-                print("Driver closed")
+            await self.release_driver()
+
+
+    async def skip_page(self):
+        """Give up on the current listing page after PAGE_RETRIES failed tries and checkpoint past it.
+
+        Returns False when the next page cannot be reached, which ends the crawl
+        with the checkpoint on the skipped page.
+        """
+        logging.warning(f"Skipping page {self.os_num} of {self.get_name()} after {PAGE_RETRIES + 1} failed tries")
+        self.start_page()
+        try:
+            if await self.find_and_click_next_page():
+                await self.run_db(self.checkpoint)
+                return True
+        except CrawlCancelled:
+            raise
+        except Exception as e:
+            logging.error(f"Could not move past page {self.os_num} of {self.get_name()}: {e}")
+        logging.warning(f"{self.get_name()} cannot reach the page after {self.os_num}, stopping.")
+        return False
+
+    def get_api_source(self):
+        """Return an ApiSource for banks with a public project feed, None to scrape with the browser"""
+        return None
 
+    def get_ready_selector(self):
+        """Return a CSS selector present once the listing rows are rendered, None to rely on the generic checks"""
+        return None
 
     # class that must be implemented
 
@@ -1,7 +1,5 @@
 import logging
-import time
 
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 
@@ -19,6 +17,9 @@ class AsianDevelopmentBankScraper(BankScraperBase):
     def get_name(self):
         return "Asian Development Bank"
 
+    def get_ready_selector(self):
+        return ".views-element-container .list .item.linked .item-title a"
+
 
     async def extract_projects_data(self):
 
@@ -27,7 +28,7 @@ class AsianDevelopmentBankScraper(BankScraperBase):
         rows = []
 
         try:
-            rows =  WebDriverWait(self.driver, 10).until(
+            rows =  await self.wait(10).until(
                 EC.presence_of_all_elements_located(
                     (
                         By.CSS_SELECTOR,
@@ -43,6 +44,7 @@ class AsianDevelopmentBankScraper(BankScraperBase):
 
         # Process each row
 
+        row_urls = []
         for i, row in enumerate(rows):
             try:
                 # finding row url
@@ -55,13 +57,14 @@ class AsianDevelopmentBankScraper(BankScraperBase):
                     if link:
                         row_url = link.get_attribute("href")
 
-                if await self.opportunity_of_url(row_url) is None:
-                    await self.extract_project_data(row_url)
+                row_urls.append(row_url)
 
             except Exception as e:
                 print(f"Error processing row {i+1}: {e}")
                 continue
         
+        await self.process_row_urls(row_urls)
+
         # finished founding new projects
 
 
@@ -73,8 +76,6 @@ class AsianDevelopmentBankScraper(BankScraperBase):
         """Find and click the next page button, return True if successful"""
         try:
             self.page_num += 1
-            self.driver.quit()
-            self.driver = None
             return True
 
         except Exception as e:
@@ -82,15 +83,12 @@ class AsianDevelopmentBankScraper(BankScraperBase):
             return False
 
     async def extract_project_data(self, url):
-        self.driver.execute_script("window.open('');")
-        self.driver.switch_to.window(self.driver.window_handles[-1])
-        self.driver.get(url)
-        time.sleep(2)
+        await self.open_detail_page(url, ".x1f")
         fields = {}
         # title
         try:
             print("scraping project title")
-            title_elem = WebDriverWait(self.driver, 10).until(
+            title_elem = await self.wait(10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".x1f"))
             )
             fields["title"] = title_elem.text.strip()
@@ -108,46 +106,43 @@ class AsianDevelopmentBankScraper(BankScraperBase):
 
         # budget
         try:
-            budget_elem = WebDriverWait(self.driver, 10).until(
+            budget_elem = await self.wait(10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, "#rlConsultingBudget"))
             )
-            prompt = "I will upload contract content. Plz analyze it and then give me applied sector only. Output must be only applied sector without any comment and prefix such as `sector:`"
             fields["budget"] = budget_elem.text.strip()
 
         except Exception as e:
             print(f"Error extracting text: {e}")
 
-        # Wait until the element is clickable, then click it
-        link_element = WebDriverWait(self.driver, 10).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, "#lnk_tor"))
-        )
-        link_element.click()
-
-        main_container = WebDriverWait(self.driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "#slTor"))
-        )
-
-        main_container_text = main_container.text.strip()
-        # sector
+        # sector and summary of requested services, from the terms of reference
         try:
-            prompt = "I will upload contract content. Plz analyze it and then give me applied sector only. Output must be only applied sector without any comment and prefix such as `sector:`"
-            fields["sector"] = self.getOpenAIResponse(prompt, main_container_text)
+            # Wait until the element is clickable, then click it
+            link_element = await self.wait(10).until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, "#lnk_tor"))
+            )
+            link_element.click()
 
-        except Exception as e:
-            print(f"Error extracting text: {e}")
+            main_container = await self.wait(10).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "#slTor"))
+            )
 
-        # Summary of requested services
-        try:
-            prompt = "I will upload contract content. Plz analyze it and then give me summary only. Output must be only summary without any comment and prefix such as `summary:`"
-            fields["summary"] = self.getOpenAIResponse(prompt, main_container_text)
+            main_container_text = main_container.text.strip()
+            fields.update(
+                await self.extract_fields_with_openai(
+                    main_container_text, field_names=["sector", "summary"]
+                )
+            )
 
         except Exception as e:
-            print("Error:", e)
+            # notices without terms of reference are still saved with the other fields
+            print(f"Error extracting text: {e}")
+            fields.setdefault("sector", "")
+            fields.setdefault("summary", "")
 
         # Submission deadline
         # .main-detail, fifth .row, third li, p
         try:
-            element = WebDriverWait(self.driver, 10).until(
+            element = await self.wait(10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, "#POATable\\:POAEndDateInput\\:0"))
             )
             fields["deadline"] = element.text.strip()
@@ -160,8 +155,7 @@ class AsianDevelopmentBankScraper(BankScraperBase):
 
         # Project URL
         fields["url"] = url
-        self.driver.close()
-        self.driver.switch_to.window(self.driver.window_handles[0])
+        await self.close_detail_page()
         await self.save_to_database(fields)
         return fields
 
@@ -1,7 +1,5 @@
 import logging
-import time
 
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 
@@ -19,6 +17,9 @@ class FrenchDevelopmentAgencyScraper(BankScraperBase):
     def get_name(self):
         return "French Development Agency"
 
+    def get_ready_selector(self):
+        return ".fr-card__link"
+
 
     async def extract_projects_data(self):
         
@@ -37,6 +38,7 @@ class FrenchDevelopmentAgencyScraper(BankScraperBase):
 
         # Process each row
 
+        row_urls = []
         for i, row in enumerate(rows):
             try:
                 # finding row url
@@ -49,13 +51,14 @@ class FrenchDevelopmentAgencyScraper(BankScraperBase):
                     if link:
                         row_url = link.get_attribute("href")
 
-                if await self.opportunity_of_url(row_url) is None:
-                    await self.extract_project_data(row_url)
+                row_urls.append(row_url)
 
             except Exception as e:
                 print(f"Error processing row {i+1}: {e}")
                 continue
         
+        await self.process_row_urls(row_urls)
+
         # finished founding new projects
 
     def is_next_page_by_click(self):
@@ -66,8 +69,6 @@ class FrenchDevelopmentAgencyScraper(BankScraperBase):
         """Find and click the next page button, return True if successful"""
         try:
             self.page_num += 1
-            self.driver.quit()
-            self.driver = None
             return True
 
         except Exception as e:
@@ -75,10 +76,7 @@ class FrenchDevelopmentAgencyScraper(BankScraperBase):
             return False
 
     async def extract_project_data(self, url):
-        self.driver.execute_script("window.open('');")
-        self.driver.switch_to.window(self.driver.window_handles[-1])
-        self.driver.get(url)
-        time.sleep(2)
+        await self.open_detail_page(url)
         fields = {}
         # title
         try:
@@ -111,7 +109,7 @@ class FrenchDevelopmentAgencyScraper(BankScraperBase):
 
         # Summary of requested services
         try:
-            summary_elements = WebDriverWait(self.driver, 10).until(
+            summary_elements = await self.wait(10).until(
                 EC.presence_of_all_elements_located(
                     (By.CSS_SELECTOR, ".my-8.print-para-space")
                 )
@@ -136,8 +134,7 @@ class FrenchDevelopmentAgencyScraper(BankScraperBase):
 
         # Project URL
         fields["url"] = url
-        self.driver.close()
-        self.driver.switch_to.window(self.driver.window_handles[0])
+        await self.close_detail_page()
         await self.save_to_database(fields)
         return fields
 
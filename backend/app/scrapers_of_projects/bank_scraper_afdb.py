@@ -1,11 +1,10 @@
 import logging
-import time
 
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 
 from .bank_scraper import BankScraperBase
+from .document_text import fetch_pdf_text, pdf_url_of_viewer
 
 class AfricanDevelopmeBankScraper(BankScraperBase):
     def __init__(self) -> None:
@@ -20,13 +19,16 @@ class AfricanDevelopmeBankScraper(BankScraperBase):
     def get_name(self):
         return "African Development Bank"
 
+    def get_ready_selector(self):
+        return ".view-content .field-content a"
+
 
     async def extract_projects_data(self):
         
         rows = []
 
         try:
-            rows = WebDriverWait(self.driver, 10).until(
+            rows = await self.wait(10).until(
                 EC.presence_of_all_elements_located(
                     (By.CSS_SELECTOR, ".view-content .field-content a")
                 )
@@ -39,6 +41,7 @@ class AfricanDevelopmeBankScraper(BankScraperBase):
 
         # Process each row
 
+        row_urls = []
         for i, row in enumerate(rows):
             try:
                 # finding row url
@@ -51,13 +54,14 @@ class AfricanDevelopmeBankScraper(BankScraperBase):
                     if link:
                         row_url = link.get_attribute("href")
 
-                if await self.opportunity_of_url(row_url) is None:
-                    await self.extract_project_data(row_url)
+                row_urls.append(row_url)
 
             except Exception as e:
                 print(f"Error processing row {i+1}: {e}")
                 continue
         
+        await self.process_row_urls(row_urls)
+
         # finished founding new projects
 
 
@@ -68,8 +72,6 @@ class AfricanDevelopmeBankScraper(BankScraperBase):
         """Find and click the next page button, return True if successful"""
         try:
             self.page_num += 1
-            self.driver.quit()
-            self.driver = None
             return True
 
         except Exception as e:
@@ -77,82 +79,31 @@ class AfricanDevelopmeBankScraper(BankScraperBase):
             return False
 
     async def extract_project_data(self, url):
-        self.driver.execute_script("window.open('');")
-        self.driver.switch_to.window(self.driver.window_handles[-1])
-        self.driver.get(url)
+        await self.open_detail_page(url, "iframe.pdf")
         fields = {}
 
         try:
-            # Wait for page to load completely
-            WebDriverWait(self.driver, 50).until(
-                lambda d: d.execute_script("return document.readyState") == "complete"
-            )
-
             # Wait until iframe with class "pdf" is present
-            iframe = WebDriverWait(self.driver, 20).until(
+            iframe = await self.wait(20).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, "iframe.pdf"))
             )
 
-            # Switch into iframe
-            self.driver.switch_to.frame(iframe)
-
-            # Wait for the PDF viewer to be present
-            viewer_elem = WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "#viewer"))
-            )
-            # CRITICAL: Wait for PDF content to fully load and render
-            # PDF viewers typically need time to convert PDF to HTML
-            print("Waiting for PDF content to fully render...")
-            # print(viewer_elem.text.strip())
-
-            # Wait for PDF rendering to complete - look for actual content
-            WebDriverWait(self.driver, 60).until(
-                lambda d: len(d.find_elements(By.CSS_SELECTOR, "*"))
-                > 10  # Wait for multiple elements to appear
-            )
-
-            # Additional wait for PDF-specific content to appear
-            try:
-                # Wait for text content to be available (PDF converted to HTML)
-                WebDriverWait(self.driver, 30).until(
-                    lambda d: len(d.find_element(By.CSS_SELECTOR, "#viewer").text.strip()) > 50
-                )
-                print("PDF content has rendered with sufficient text")
-            except Exception as e:
-                print(f"Warning: PDF text content may not be fully loaded: {e}")
-
-            # Now extract the rendered HTML content
-            viewer_elem = self.driver.find_element(By.CSS_SELECTOR, "#viewer")
-            print("Element with id 'viewer':")
-            # print(viewer_elem.text)
-
-            pdf_text = viewer_elem.text
+            # Download and parse the notice itself instead of waiting for the viewer to render it
+            pdf_text = ""
+            pdf_url = pdf_url_of_viewer(iframe.get_attribute("src"), self.driver.current_url)
+            if pdf_url:
+                try:
+                    pdf_text = await fetch_pdf_text(pdf_url)
+                except Exception as e:
+                    print(f"Failed to read PDF {pdf_url}, falling back to the viewer: {e}")
+            if len(pdf_text.strip()) <= 50:
+                # scanned or unreachable documents are read from the rendered viewer
+                pdf_text = await self.read_pdf_viewer(iframe)
             print(pdf_text)
 
-            prompt = "I will upload contract content. Plz analyze it and then give me project title only. Output must be only project title without any comment and prefix such as `project title:`"
-            fields["title"] = await self.get_openai_response(prompt, pdf_text)
-
+            fields.update(await self.extract_fields_with_openai(pdf_text))
             fields["client"] = "African Development Bank"
 
-            prompt = "I will upload contract content. Plz analyze it and then give me applied country only. Output must be only country name without any comment and prefix such as `country:`"
-            fields["country"] = await self.get_openai_response(prompt, pdf_text)
-
-            prompt = "You are given a contract document. Extract the contract budget only.  Return the budget amount exactly as written in the document (e.g., `US$317.5 million`).  If no budget is mentioned, return only `Not defined`.  Do not add any comments, explanations, or prefixes."
-            fields["budget"] = await self.get_openai_response(prompt, pdf_text)
-
-            prompt = "I will upload contract content. Plz analyze it and then give me applied sector only. Output must be only applied sector without any comment and prefix such as `sector:`"
-            fields["sector"] = await self.get_openai_response(prompt, pdf_text)
-
-            prompt = "I will upload contract content. Plz analyze it and then give me summary only. Output must be only summary without any comment and prefix such as `summary:`"
-            fields["summary"] = await self.get_openai_response(prompt, pdf_text)
-
-            prompt = "I will upload contract content. Plz analyze it and then give me last deadline date only. Output must be only last deadline date without any comment and prefix such as `deadline date:`"
-            fields["deadline"] = await self.get_openai_response(prompt, pdf_text)
-
-            prompt = "I will upload contract content. Plz analyze it and then give me related program and project only. Output must be only related program and project without any comment and prefix such as `related program/project:`"
-            fields["program"] = await self.get_openai_response(prompt, pdf_text)
-
-
             fields["url"]=url
 
         except Exception as e:
@@ -161,11 +112,41 @@ class AfricanDevelopmeBankScraper(BankScraperBase):
         # Always switch back to top-level document
         self.driver.switch_to.default_content()
 
-        self.driver.close()
-        self.driver.switch_to.window(self.driver.window_handles[0])
+        await self.close_detail_page()
         await self.save_to_database(fields)
         return fields
 
+    async def read_pdf_viewer(self, iframe):
+        """Read the text of the PDF as rendered by the browser's viewer"""
+        # Switch into iframe
+        self.driver.switch_to.frame(iframe)
+
+        # Wait for the PDF viewer to be present
+        await self.wait(20).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "#viewer"))
+        )
+        # CRITICAL: Wait for PDF content to fully load and render
+        # PDF viewers typically need time to convert PDF to HTML
+        print("Waiting for PDF content to fully render...")
+
+        # Wait for PDF rendering to complete - look for actual content
+        await self.wait(60).until(
+            lambda d: len(d.find_elements(By.CSS_SELECTOR, "*"))
+            > 10  # Wait for multiple elements to appear
+        )
+
+        # Additional wait for PDF-specific content to appear
+        try:
+            # Wait for text content to be available (PDF converted to HTML)
+            await self.wait(30).until(
+                lambda d: len(d.find_element(By.CSS_SELECTOR, "#viewer").text.strip()) > 50
+            )
+            print("PDF content has rendered with sufficient text")
+        except Exception as e:
+            print(f"Warning: PDF text content may not be fully loaded: {e}")
+
+        # Now extract the rendered HTML content
+        return self.driver.find_element(By.CSS_SELECTOR, "#viewer").text
 
 
 if __name__ == "__main__":
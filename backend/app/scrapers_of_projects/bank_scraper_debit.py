@@ -1,7 +1,5 @@
 import logging
-import time
 
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 
@@ -19,10 +17,13 @@ class DevelopmentBankScraper(BankScraperBase):
     def get_name(self):
         return "Development Bank"
 
+    def get_ready_selector(self):
+        return ".view-content .field-content a"
+
 
     async def extract_projects_data(self):
         try:
-            rows = WebDriverWait(self.driver, 10).until(
+            rows = await self.wait(10).until(
                 EC.presence_of_all_elements_located(
                     (By.CSS_SELECTOR, ".view-content .field-content a")
                 )
@@ -35,6 +36,7 @@ class DevelopmentBankScraper(BankScraperBase):
 
         # Process each row
 
+        row_urls = []
         for i, row in enumerate(rows):
             try:
                 # finding row url
@@ -47,13 +49,14 @@ class DevelopmentBankScraper(BankScraperBase):
                     if link:
                         row_url = link.get_attribute("href")
 
-                if await self.opportunity_of_url(row_url) is None:
-                    await self.extract_project_data(row_url)
+                row_urls.append(row_url)
 
             except Exception as e:
                 print(f"Error processing row {i+1}: {e}")
                 continue
         
+        await self.process_row_urls(row_urls)
+
         # finished founding new projects
 
     def is_next_page_by_click(self):
@@ -63,15 +66,15 @@ class DevelopmentBankScraper(BankScraperBase):
         """Find and click the next page button, return True if successful"""
         try:
             # Wait until the element is clickable
-            next_span = WebDriverWait(self.driver, 10).until(
+            next_span = await self.wait(10).until(
                 EC.element_to_be_clickable(
                     (By.XPATH, "//span[@class='sr-only' and text()='Next']")
                 )
             )
 
             # Click the span element
-            next_span.click()
-            print("No next page button found or clickable")
+            await self.click_next_page(next_span)
+            print("Clicked next page button")
             return True
 
         except Exception as e:
@@ -79,10 +82,7 @@ class DevelopmentBankScraper(BankScraperBase):
             return False
 
     async def extract_project_data(self, url):
-        self.driver.execute_script("window.open('');")
-        self.driver.switch_to.window(self.driver.window_handles[-1])
-        self.driver.get(url)
-        time.sleep(2)
+        await self.open_detail_page(url)
         fields = {}
         # title
         try:
@@ -104,7 +104,7 @@ class DevelopmentBankScraper(BankScraperBase):
         # country
         try:
             # Wait until at least one country link is present
-            WebDriverWait(self.driver, 10).until(
+            await self.wait(10).until(
                 EC.presence_of_all_elements_located(
                     (By.CSS_SELECTOR, "a.dropdown-item[href*='/country/']")
                 )
@@ -123,7 +123,7 @@ class DevelopmentBankScraper(BankScraperBase):
         # budget
         try:
             # Wait until the main-detail element is present
-            main_detail = WebDriverWait(self.driver, 10).until(
+            main_detail = await self.wait(10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".main-detail"))
             )
 
@@ -152,7 +152,7 @@ class DevelopmentBankScraper(BankScraperBase):
         # sector
         try:
             # Wait until the main-detail element is present
-            main_detail = WebDriverWait(self.driver, 10).until(
+            main_detail = await self.wait(10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".main-detail"))
             )
 
@@ -184,7 +184,7 @@ class DevelopmentBankScraper(BankScraperBase):
         # 1. Try clicking the "Show more" button if it exists
         try:
             # Wait until the <a> element is clickable
-            show_more_link = WebDriverWait(self.driver, 10).until(
+            show_more_link = await self.wait(10).until(
                 EC.element_to_be_clickable(
                     (
                         By.XPATH,
@@ -198,7 +198,7 @@ class DevelopmentBankScraper(BankScraperBase):
             print(f"Failed to click the link: {e}")
         try:
             # Wait until #abstract is present
-            abstract = WebDriverWait(self.driver, 10).until(
+            abstract = await self.wait(10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, "#abstract"))
             )
 
@@ -245,7 +245,7 @@ class DevelopmentBankScraper(BankScraperBase):
         # .main-detail, fifth .row, third li, p
         try:
             # Wait until .main-detail is present
-            main_detail = WebDriverWait(self.driver, 10).until(
+            main_detail = await self.wait(10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".main-detail"))
             )
 
@@ -282,8 +282,7 @@ class DevelopmentBankScraper(BankScraperBase):
 
         # Project URL
         fields["url"] = url
-        self.driver.close()
-        self.switch_to.window(self.driver.window_handles[0])
+        await self.close_detail_page()
         await self.save_to_database(fields)
         return fields
 
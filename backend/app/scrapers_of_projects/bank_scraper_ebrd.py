@@ -1,7 +1,6 @@
+import asyncio
 import logging
-import time
 
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException, ElementClickInterceptedException, StaleElementReferenceException
@@ -20,6 +19,9 @@ class EuropeanBankScraper(BankScraperBase):
 	def get_name(self):
 		return "European Bank"
 
+	def get_ready_selector(self):
+		return ".search-result__result-card"
+
 
 	async def extract_projects_data(self):
 		# Try multiple approaches to find project data
@@ -27,7 +29,7 @@ class EuropeanBankScraper(BankScraperBase):
 
 		rows = []
 		try:
-			rows = WebDriverWait(self.driver, 10).until(
+			rows = await self.wait(10).until(
 				EC.presence_of_all_elements_located(
 					(By.CSS_SELECTOR, ".search-result__result-card")
 				)
@@ -40,6 +42,7 @@ class EuropeanBankScraper(BankScraperBase):
 
 		# Process each row
 
+		row_urls = []
 		for i, row in enumerate(rows):
 			try:
 				# finding row url
@@ -52,13 +55,14 @@ class EuropeanBankScraper(BankScraperBase):
 					if link:
 						row_url = link.get_attribute("href")
 
-				if await self.opportunity_of_url(row_url) is None:
-					await self.extract_project_data(row_url)
+				row_urls.append(row_url)
 
 			except Exception as e:
 				print(f"Error processing row {i+1}: {e}")
 				continue
 		
+		await self.process_row_urls(row_urls)
+
 		# finished founding new projects
 		
 	def is_next_page_by_click(self):
@@ -69,14 +73,14 @@ class EuropeanBankScraper(BankScraperBase):
 		try:
 			# Try to close cookie banner if present (per provided HTML structure)
 			try:
-				banner = self.driver.find_elements(By.CSS_SELECTOR, "#cookie-banner")
-				if banner and banner[0].is_displayed():
+				banner = await asyncio.to_thread(self.driver.find_elements, By.CSS_SELECTOR, "#cookie-banner")
+				if banner and await asyncio.to_thread(banner[0].is_displayed):
 					try:
-						accept_btn = WebDriverWait(self.driver, 3).until(
+						accept_btn = await self.wait(3).until(
 							EC.presence_of_element_located((By.CSS_SELECTOR, "#acceptCookie, .cookie-consent #acceptCookie, #cookie-banner .btn-with-border.green-bg"))
 						)
-						self.driver.execute_script("arguments[0].click();", accept_btn)
-						WebDriverWait(self.driver, 5).until(
+						await asyncio.to_thread(self.driver.execute_script, "arguments[0].click();", accept_btn)
+						await self.wait(5).until(
 							EC.invisibility_of_element_located((By.CSS_SELECTOR, "#cookie-banner"))
 						)
 					except TimeoutException:
@@ -87,10 +91,12 @@ class EuropeanBankScraper(BankScraperBase):
 			# Capture current active page number to verify change after click
 			current_page_marker = None
 			try:
-				active_li = WebDriverWait(self.driver, 5).until(
+				active_li = await self.wait(5).until(
 					EC.presence_of_element_located((By.CSS_SELECTOR, "#pagination li.active"))
 				)
-				current_page_marker = active_li.get_attribute("data-page") or active_li.text.strip()
+				current_page_marker = await asyncio.to_thread(
+					lambda: active_li.get_attribute("data-page") or active_li.text.strip()
+				)
 			except TimeoutException:
 				# If not found, proceed but fallback to card count later
 				pass
@@ -105,7 +111,7 @@ class EuropeanBankScraper(BankScraperBase):
 			arrow_right = None
 			for selector in next_selectors:
 				try:
-					arrow_right = WebDriverWait(self.driver, 5).until(
+					arrow_right = await self.wait(5).until(
 						EC.presence_of_element_located((By.CSS_SELECTOR, selector))
 					)
 					if arrow_right:
@@ -119,19 +125,19 @@ class EuropeanBankScraper(BankScraperBase):
 
 			# Scroll into view before clicking
 			try:
-				self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", arrow_right)
+				await asyncio.to_thread(self.driver.execute_script, "arguments[0].scrollIntoView({block: 'center'});", arrow_right)
 			except Exception:
 				pass
 
 			# Try clicking the li; if that fails, click its inner span
 			clicked = False
 			try:
-				self.driver.execute_script("arguments[0].click();", arrow_right)
+				await asyncio.to_thread(self.driver.execute_script, "arguments[0].click();", arrow_right)
 				clicked = True
 			except Exception:
 				try:
-					inner = arrow_right.find_element(By.CSS_SELECTOR, "span")
-					self.driver.execute_script("arguments[0].click();", inner)
+					inner = await asyncio.to_thread(arrow_right.find_element, By.CSS_SELECTOR, "span")
+					await asyncio.to_thread(self.driver.execute_script, "arguments[0].click();", inner)
 					clicked = True
 				except Exception:
 					clicked = False
@@ -145,7 +151,7 @@ class EuropeanBankScraper(BankScraperBase):
 			# Wait for page change: prefer active page change; fallback to card list change
 			old_count = 0
 			try:
-				old_count = len(self.driver.find_elements(By.CSS_SELECTOR, ".search-result__result-card.project-card"))
+				old_count = len(await asyncio.to_thread(self.driver.find_elements, By.CSS_SELECTOR, ".search-result__result-card.project-card"))
 			except Exception:
 				pass
 
@@ -164,8 +170,7 @@ class EuropeanBankScraper(BankScraperBase):
 				except Exception:
 					return False
 
-			WebDriverWait(self.driver, 15).until(page_changed)
-			time.sleep(0.5)
+			await self.wait(15).until(page_changed)
 			self.page_num += 1
 			return True
 
@@ -176,10 +181,7 @@ class EuropeanBankScraper(BankScraperBase):
     
 
 	async def extract_project_data(self, url):
-		self.driver.execute_script("window.open('');")
-		self.driver.switch_to.window(self.driver.window_handles[-1])
-		self.driver.get(url)
-		time.sleep(2)
+		await self.open_detail_page(url)
 		fields = {}
 		# title
 		try:
@@ -200,25 +202,25 @@ class EuropeanBankScraper(BankScraperBase):
 
 		try:
 			# Wait until the <li> tab is clickable
-			tab_li = WebDriverWait(self.driver, 10).until(
+			tab_li = await self.wait(10).until(
 				EC.element_to_be_clickable(
 					(By.CSS_SELECTOR, ".show-desktop-only.tabs-toggle__list.dropdownlist-mobile li")
 				)
 			)
 
-			tab_li = WebDriverWait(self.driver, 10).until(
+			tab_li = (await self.wait(10).until(
 				EC.presence_of_all_elements_located((By.CSS_SELECTOR, ".show-desktop-only.tabs-toggle__list.dropdownlist-mobile li"))
-			)[1]
+			))[1]
 			# Click on the element
 			tab_li.click()
 
-			wait = WebDriverWait(self.driver, 10)
+			wait = self.wait(10)
 		except Exception:
 			print("Error in waiting for clicking tab")
 
 		# country
 		try:
-			elements = WebDriverWait(self.driver, 10).until(
+			elements = await self.wait(10).until(
 				EC.presence_of_all_elements_located(
 					(By.CSS_SELECTOR, ".project-overview__card-description")
 				)
@@ -232,7 +234,7 @@ class EuropeanBankScraper(BankScraperBase):
 
 		# budget
 		try:
-			elements = WebDriverWait(self.driver, 20).until(
+			elements = await self.wait(20).until(
 				EC.presence_of_all_elements_located(
 					(By.CSS_SELECTOR, ".text-block__details")
 				)
@@ -252,7 +254,7 @@ class EuropeanBankScraper(BankScraperBase):
 
 		# sector
 		try:
-			elements = WebDriverWait(self.driver, 10).until(
+			elements = await self.wait(10).until(
 				EC.presence_of_all_elements_located(
 					(By.CSS_SELECTOR, ".project-overview__card-description")
 				)
@@ -275,7 +277,7 @@ class EuropeanBankScraper(BankScraperBase):
 		# Submission deadline
 		# .main-detail, fifth .row, third li, p
 		try:
-			elements = WebDriverWait(self.driver, 10).until(
+			elements = await self.wait(10).until(
 				EC.presence_of_all_elements_located(
 					(By.CSS_SELECTOR, ".project-overview__card-description")
 				)
@@ -292,8 +294,7 @@ class EuropeanBankScraper(BankScraperBase):
 
 		# Project URL
 		fields["url"] = url
-		self.driver.close()
-		self.driver.switch_to.window(self.driver.window_handles[0])
+		await self.close_detail_page()
 		await self.save_to_database(fields)
 		return fields
 
@@ -1,7 +1,5 @@
 import logging
-import time
 
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 
@@ -19,6 +17,9 @@ class EuropeanInvestmentBankScraper(BankScraperBase):
     def get_name(self):
         return "European Invement Bank"
 
+    def get_ready_selector(self):
+        return ".search-filter__results .row-title a"
+
 
     async def extract_projects_data(self):
         # Try multiple approaches to find project data
@@ -40,7 +41,7 @@ class EuropeanInvestmentBankScraper(BankScraperBase):
                 )
 
                 # Wait to appear project url.
-                WebDriverWait(self.driver, 15).until(
+                await self.wait(15).until(
                     EC.presence_of_all_elements_located(
                         (By.CSS_SELECTOR, ".search-filter__results .row-title a")
                     )
@@ -65,6 +66,7 @@ class EuropeanInvestmentBankScraper(BankScraperBase):
 
         # Process each row
 
+        row_urls = []
         for i, row in enumerate(rows):
             try:
                 # finding row url
@@ -78,13 +80,14 @@ class EuropeanInvestmentBankScraper(BankScraperBase):
                         row_url = link.get_attribute("href")
 
                 print(row_url)
-                if await self.opportunity_of_url(row_url) is None:
-                    await self.extract_project_data(row_url)
+                row_urls.append(row_url)
 
             except Exception as e:
                 print(f"Error processing row {i+1}: ", e)
                 continue
         
+        await self.process_row_urls(row_urls)
+
         # finished founding new projects
     def is_next_page_by_click(self):
         return True
@@ -94,13 +97,13 @@ class EuropeanInvestmentBankScraper(BankScraperBase):
         try:
             
             # Wait until the span element is clickable
-            span_element = WebDriverWait(self.driver, 10).until(
+            span_element = await self.wait(10).until(
                 EC.element_to_be_clickable((By.CSS_SELECTOR, "span.fa.fa-arrow-right"))
             )
 
             # Click the span element
-            span_element.click()
-            print("No next page button found or clickable")
+            await self.click_next_page(span_element)
+            print("Clicked next page button")
             return True
 
         except Exception as e:
@@ -108,19 +111,17 @@ class EuropeanInvestmentBankScraper(BankScraperBase):
             return False
 
     async def extract_project_data(self, url):
-        self.driver.execute_script("window.open('');")
-        self.driver.switch_to.window(self.driver.window_handles[-1])
-        self.driver.get(url)
+        await self.open_detail_page(url)
         fields = {}
 
         try:
             # title
             # Wait for page to load completely
-            WebDriverWait(self.driver, 50).until(
+            await self.wait(50).until(
                 lambda d: d.execute_script("return document.readyState") == "complete"
             )
             # Wait for the element to be present and visible on the page
-            title_elem = WebDriverWait(self.driver, 10).until(
+            title_elem = await self.wait(10).until(
                 EC.visibility_of_element_located(
                     (By.CSS_SELECTOR, ".eib-typography__title")
                 )
@@ -134,7 +135,7 @@ class EuropeanInvestmentBankScraper(BankScraperBase):
             # country
             # #pipeline-overview, first .bulleted-list--blue, a
             # Wait until the #pipeline-overview element is present
-            pipeline_overview = WebDriverWait(self.driver, 10).until(
+            pipeline_overview = await self.wait(10).until(
                 EC.presence_of_element_located((By.ID, "pipeline-overview"))
             )
             # Within that element, find the first .bulleted-list--blue
@@ -188,7 +189,7 @@ class EuropeanInvestmentBankScraper(BankScraperBase):
             # deadline
             # .pipeline-ref, 4th span
             # Wait until the .pipeline-ref div is present
-            pipeline_ref = WebDriverWait(self.driver, 10).until(
+            pipeline_ref = await self.wait(10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".pipeline-ref"))
             )
             # Find all span elements inside .pipeline-ref
@@ -212,8 +213,7 @@ class EuropeanInvestmentBankScraper(BankScraperBase):
         # Always switch back to top-level document
         self.driver.switch_to.default_content()
 
-        self.driver.close()
-        self.driver.switch_to.window(self.driver.window_handles[0])
+        await self.close_detail_page()
         print(fields)
         await self.save_to_database(fields)
 
@@ -1,7 +1,5 @@
 import logging
-import time
 
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 
@@ -20,6 +18,9 @@ class DutchEnterpreneurialDevelopmentBankScraper(BankScraperBase):
     def get_name(self):
         return "Dutch Enterpreneurial Development Bank"
 
+    def get_ready_selector(self):
+        return ".ProjectList__projectLink"
+
 
     async def extract_projects_data(self):
         # Try multiple approaches to find project data
@@ -27,7 +28,7 @@ class DutchEnterpreneurialDevelopmentBankScraper(BankScraperBase):
 
         rows = []
         try:
-            rows = WebDriverWait(self.driver, 10).until(
+            rows = await self.wait(10).until(
                 EC.presence_of_all_elements_located(
                     (By.CSS_SELECTOR, ".ProjectList__projectLink")
                 )
@@ -40,6 +41,7 @@ class DutchEnterpreneurialDevelopmentBankScraper(BankScraperBase):
 
         # Process each row
 
+        row_urls = []
         for i, row in enumerate(rows):
             try:
                 # finding row url
@@ -52,13 +54,14 @@ class DutchEnterpreneurialDevelopmentBankScraper(BankScraperBase):
                     if link:
                         row_url = link.get_attribute("href")
 
-                if await self.opportunity_of_url(row_url) is None:
-                    await self.extract_project_data(row_url)
+                row_urls.append(row_url)
 
             except Exception as e:
                 print(f"Error processing row {i+1}: {e}")
                 continue
         
+        await self.process_row_urls(row_urls)
+
         # finished founding new projects
 
     def is_next_page_by_click(self):
@@ -68,8 +71,6 @@ class DutchEnterpreneurialDevelopmentBankScraper(BankScraperBase):
         """Find and click the next page button, return True if successful"""
         try:
             self.page_num += 1
-            self.driver.quit()
-            self.driver = None
             return True
 
         except Exception as e:
@@ -77,10 +78,7 @@ class DutchEnterpreneurialDevelopmentBankScraper(BankScraperBase):
             return False
 
     async def extract_project_data(self, url):
-        self.driver.execute_script("window.open('');")
-        self.driver.switch_to.window(self.driver.window_handles[-1])
-        self.driver.get(url)
-        time.sleep(2)
+        await self.open_detail_page(url)
         fields = {}
         # title
         try:
@@ -101,7 +99,7 @@ class DutchEnterpreneurialDevelopmentBankScraper(BankScraperBase):
 
         # finding elements
 
-        container_elems = WebDriverWait(self.driver, 10).until(
+        container_elems = await self.wait(10).until(
             EC.presence_of_all_elements_located(
                 (By.CSS_SELECTOR, ".ProjectDetail__asideInner")
             )
@@ -133,7 +131,7 @@ class DutchEnterpreneurialDevelopmentBankScraper(BankScraperBase):
 
         # Summary of requested services
         try:
-            summary_elem = WebDriverWait(self.driver, 10).until(
+            summary_elem = await self.wait(10).until(
                 EC.element_to_be_clickable(
                     (
                         By.CSS_SELECTOR,
@@ -156,8 +154,7 @@ class DutchEnterpreneurialDevelopmentBankScraper(BankScraperBase):
 
         # Project URL
         fields["url"] = url
-        self.driver.close()
-        self.driver.switch_to.window(self.driver.window_handles[0])
+        await self.close_detail_page()
         await self.save_to_database(fields)
         return fields
 
@@ -1,7 +1,5 @@
 import logging
-import time
 
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 
@@ -20,6 +18,9 @@ class InterAmericanDevelopmentBankScraper(BankScraperBase):
     def get_name(self):
         return "Inter American Development Bank"
 
+    def get_ready_selector(self):
+        return ".views-element-container tbody a"
+
 
     async def extract_projects_data(self):
         # Try multiple approaches to find project data
@@ -41,7 +42,7 @@ class InterAmericanDevelopmentBankScraper(BankScraperBase):
                 )
 
                 # Wait to appear project url.
-                WebDriverWait(self.driver, 15).until(
+                await self.wait(15).until(
                     EC.presence_of_all_elements_located(
                         (By.CSS_SELECTOR, '.views-element-container tbody a')
                     )
@@ -66,6 +67,7 @@ class InterAmericanDevelopmentBankScraper(BankScraperBase):
 
         # Process each row
 
+        row_urls = []
         for i, row in enumerate(rows):
             try:
                 # finding row url
@@ -78,13 +80,14 @@ class InterAmericanDevelopmentBankScraper(BankScraperBase):
                     if link:
                         row_url = link.get_attribute("href")
 
-                if await self.opportunity_of_url(row_url) is None:
-                    await self.extract_project_data(row_url)
+                row_urls.append(row_url)
 
             except Exception as e:
                 print(f"Error processing row {i+1}: {e}")
                 continue
         
+        await self.process_row_urls(row_urls)
+
         # finished founding new projects
 
     def is_next_page_by_click(self):
@@ -94,8 +97,6 @@ class InterAmericanDevelopmentBankScraper(BankScraperBase):
         """Find and click the next page button, return True if successful"""
         try:
             self.page_num += 1
-            self.driver.quit()
-            self.driver = None
             return True
 
         except Exception as e:
@@ -103,10 +104,7 @@ class InterAmericanDevelopmentBankScraper(BankScraperBase):
             return False
 
     async def extract_project_data(self, url):
-        self.driver.execute_script("window.open('');")
-        self.driver.switch_to.window(self.driver.window_handles[-1])
-        self.driver.get(url)
-        time.sleep(2)
+        await self.open_detail_page(url)
         fields = {}
         # title
         try:
@@ -141,7 +139,7 @@ class InterAmericanDevelopmentBankScraper(BankScraperBase):
 
         # Summary of requested services
         try:
-            summary_elem = WebDriverWait(self.driver, 10).until(
+            summary_elem = await self.wait(10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, "idb-styled-text"))
             )
             fields["summary"] = summary_elem.text.strip()
@@ -160,8 +158,7 @@ class InterAmericanDevelopmentBankScraper(BankScraperBase):
 
         # Project URL
         fields["url"] = url
-        self.driver.close()
-        self.driver.switch_to.window(self.driver.window_handles[0])
+        await self.close_detail_page()
         await self.save_to_database(fields)
         return fields
 
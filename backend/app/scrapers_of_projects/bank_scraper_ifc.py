@@ -1,7 +1,5 @@
 import logging
-import time
 
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 
@@ -19,13 +17,16 @@ class InternationalFinanceCorporationScraper(BankScraperBase):
     def get_name(self):
         return "International Finance Corporation"
 
+    def get_ready_selector(self):
+        return ".row.margin-top15.projects .col-12.padding-top5 a"
+
 
     async def extract_projects_data(self):
 
         rows = []
         try:
             # Wait until at least one <a> inside .projects inside .row.margin-top15 exists
-            rows = WebDriverWait(self.driver, 10).until(
+            rows = await self.wait(10).until(
                 EC.presence_of_all_elements_located(
                     (
                         By.CSS_SELECTOR,
@@ -41,6 +42,7 @@ class InternationalFinanceCorporationScraper(BankScraperBase):
 
         # Process each row
 
+        row_urls = []
         for i, row in enumerate(rows):
             try:
                 # finding row url
@@ -54,13 +56,14 @@ class InternationalFinanceCorporationScraper(BankScraperBase):
                         row_url = link.get_attribute("href")
 
                 print(row_url)
-                if await self.opportunity_of_url(row_url) is None:
-                    await self.extract_project_data(row_url)
+                row_urls.append(row_url)
 
             except Exception as e:
                 print(f"Error processing row {i+1}: {e}")
                 continue
         
+        await self.process_row_urls(row_urls)
+
         # finished founding new projects
 
     def is_next_page_by_click(self):
@@ -70,13 +73,13 @@ class InternationalFinanceCorporationScraper(BankScraperBase):
         """Find and click the next page button, return True if successful"""
         try:
             # Wait until the element is clickable
-            element = WebDriverWait(self.driver, 10).until(
+            element = await self.wait(10).until(
                 EC.element_to_be_clickable((By.CSS_SELECTOR, "span.fa.fa-chevron-right"))
             )
 
             # Click the element
-            element.click()
-            print("No next page button found or clickable")
+            await self.click_next_page(element)
+            print("Clicked next page button")
             return True
 
         except Exception as e:
@@ -84,92 +87,44 @@ class InternationalFinanceCorporationScraper(BankScraperBase):
             return False
 
     async def extract_project_data(self, url):
-        self.driver.execute_script("window.open('');")
-        self.driver.switch_to.window(self.driver.window_handles[-1])
-        self.driver.get(url)
-        time.sleep(2)
+        await self.open_detail_page(url, ".container.project-detail.padding-large0")
         fields = {}
 
         try:
-            # Use the base class waiting method
-            await self.wait_for_completed_loading()
-
-            # Wait for the specific container to be present and visible
-            container = WebDriverWait(self.driver, 30).until(
-                EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, ".container.project-detail.padding-large0")
-                )
+            # open_detail_page has waited for the container, the network and the DOM to settle
+            container = self.driver.find_element(
+                By.CSS_SELECTOR, ".container.project-detail.padding-large0"
             )
-            
+
             # Wait for the container to be visible
-            WebDriverWait(self.driver, 30).until(
+            await self.wait(30).until(
                 EC.visibility_of(container)
             )
 
-            # Additional wait to ensure all dynamic content is loaded
-            # Wait for any loading indicators to disappear
-            try:
-                WebDriverWait(self.driver, 10).until(
-                    EC.invisibility_of_element_located((By.CSS_SELECTOR, ".loading, .spinner, .loader"))
-                )
-            except:
-                pass  # No loading indicators found, continue
-
-            # Wait for any AJAX requests to complete
-            WebDriverWait(self.driver, 20).until(
-                lambda d: d.execute_script("return window.jQuery ? jQuery.active == 0 : true")
-            )
-
-            # Wait for any pending network requests to complete
-            WebDriverWait(self.driver, 20).until(
-                lambda d: d.execute_script("""
-                    return window.performance.getEntriesByType('navigation')[0].loadEventEnd > 0
-                """)
-            )
-
-            # Additional wait for any dynamic content that might be loading
-            time.sleep(3)
-
             # Scroll to ensure all content is loaded
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(1)
+            await self.wait_until_ready(".container.project-detail.padding-large0")
             self.driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(1)
 
             # Now get the outerHTML
             outer_html = self.driver.execute_script("return arguments[0].outerHTML;", container)
             container_text = outer_html
 
             # print(container_text)
-            # title
-            prompt = "I will upload contract content. Plz analyze it and then give me project title only. First sentence before `back to search` is project title. Output must be only project title without any comment and prefix such as `project title:`"
-            fields["title"] = await self.get_openai_response(prompt, container_text)
-
-            prompt = "I will upload contract content. Plz analyze it and then give me applied country only. Country is next of `Country` word. Output must be only country name without any comment and prefix such as `country:`"
-            fields["country"] = await self.get_openai_response(prompt, container_text)
-
-            prompt = "You are given a contract document. Extract the contract budget only.  Return the budget amount exactly as written in the document (e.g., `US$317.5 million`).  If no budget is mentioned, return only `Not defined`.  Do not add any comments, explanations, or prefixes."
-            fields["budget"] = await self.get_openai_response(prompt, container_text)
-
-            prompt = "I will upload contract content. Plz analyze it and then give me applied sector only. Output must be only applied sector without any comment and prefix such as `sector:`"
-            fields["sector"] = await self.get_openai_response(prompt, container_text)
-
-            prompt = "I will upload contract content. Plz analyze it and then give me summary only. Summary must be detailed. Output must be only summary without any comment and prefix such as `summary:`"
-            fields["summary"] = await self.get_openai_response(prompt, container_text)
-
-            prompt = "I will upload contract content. Plz analyze it and then give me last deadline date only. Output must be only last deadline date without any comment and prefix such as `deadline date:`"
-            fields["deadline"] = await self.get_openai_response(prompt, container_text)
-
-            prompt = "I will upload contract content. Plz analyze it and then give me related program and project only. Output must be only related program and project without any comment and prefix such as `related program/project:`"
-            fields["program"] = await self.get_openai_response(prompt, container_text)        
+            fields.update(
+                await self.extract_fields_with_openai(
+                    container_text,
+                    hints="The first sentence before `back to search` is the project title, the country is next to the `Country` word and the summary must be detailed.",
+                )
+            )
+            fields["client"] = self.get_name()
 
             # Project URL
             fields["url"] = url
         except Exception as e:
             print(f"Failed to scrape container content", e)
         print(fields)
-        self.driver.close()
-        self.driver.switch_to.window(self.driver.window_handles[0])
+        await self.close_detail_page()
         await self.save_to_database(fields)
         return fields
 
@@ -1,7 +1,5 @@
 import logging
-import time
 
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 
@@ -19,6 +17,9 @@ class KfWEntwicklungsBankScraper(BankScraperBase):
     def get_name(self):
         return "KfW Entwicklungsbank"
 
+    def get_ready_selector(self):
+        return ".search-result-content--default .search-result-item .title a"
+
 
     async def extract_projects_data(self):
         # Try multiple approaches to find project data
@@ -40,7 +41,7 @@ class KfWEntwicklungsBankScraper(BankScraperBase):
                 )
 
                 # Wait to appear project url.
-                WebDriverWait(self.driver, 15).until(
+                await self.wait(15).until(
                     EC.presence_of_all_elements_located(
                         (By.CSS_SELECTOR, ".search-result-content--default .search-result-item .title a")
                     )
@@ -65,6 +66,7 @@ class KfWEntwicklungsBankScraper(BankScraperBase):
 
         # Process each row
 
+        row_urls = []
         for i, row in enumerate(rows):
             try:
                 # finding row url
@@ -79,13 +81,14 @@ class KfWEntwicklungsBankScraper(BankScraperBase):
                 
                 print(row_url)
 
-                if await self.opportunity_of_url(row_url) is None:
-                    await self.extract_project_data(row_url)
+                row_urls.append(row_url)
 
             except Exception as e:
                 print(f"Error processing row {i+1}: {e}")
                 continue
         
+        await self.process_row_urls(row_urls)
+
         # finished founding new projects
 
     def is_next_page_by_click(self):
@@ -95,8 +98,6 @@ class KfWEntwicklungsBankScraper(BankScraperBase):
         """Find and click the next page button, return True if successful"""
         try:
             self.page_num += 1
-            self.driver.quit()
-            self.driver = None
             return True
 
         except Exception as e:
@@ -104,16 +105,13 @@ class KfWEntwicklungsBankScraper(BankScraperBase):
             return False
 
     async def extract_project_data(self, url):
-        self.driver.execute_script("window.open('');")
-        self.driver.switch_to.window(self.driver.window_handles[-1])
-        self.driver.get(url)
-        time.sleep(2)
+        await self.open_detail_page(url)
         fields = {}
         # title
         try:
             print("scraping project title")
             # Wait until an element with class hl-1 is present in the DOM
-            hl1_elem = WebDriverWait(self.driver, 10).until(
+            hl1_elem = await self.wait(10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".hl-1"))
             )
             # Get its text
@@ -127,28 +125,24 @@ class KfWEntwicklungsBankScraper(BankScraperBase):
         # country
         try:
             fields["country"] = (
-                WebDriverWait(self.driver, 10)
-                .until(
+                await self.wait(10).until(
                     EC.presence_of_element_located(
                         (By.CSS_SELECTOR, "table tr:first-of-type td")
                     )
                 )
-                .text
-            )
+            ).text
         except Exception:
             fields["country"] = ""
 
         # budget
         try:
             fields["budget"] = (
-                WebDriverWait(self.driver, 10)
-                .until(
+                await self.wait(10).until(
                     EC.presence_of_element_located(
                         (By.CSS_SELECTOR, "table tr:nth-of-type(8) td")
                     )
                 )
-                .text
-            )
+            ).text
 
         except Exception as e:
             print(f"Error extracting text: {e}")
@@ -156,21 +150,19 @@ class KfWEntwicklungsBankScraper(BankScraperBase):
         # sector
         try:
             fields["sector"] = (
-                WebDriverWait(self.driver, 10)
-                .until(
+                await self.wait(10).until(
                     EC.presence_of_element_located(
                         (By.CSS_SELECTOR, "table tr:nth-of-type(4) td")
                     )
                 )
-                .text
-            )
+            ).text
         except Exception as e:
             print(f"Error extracting text: {e}")
 
         # Summary of requested services
         try:
             # Wait until at least one .text-image-text element is present
-            elem = WebDriverWait(self.driver, 10).until(
+            elem = await self.wait(10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".text-image-text"))
             )
             # Get and clean its visible text
@@ -188,21 +180,18 @@ class KfWEntwicklungsBankScraper(BankScraperBase):
         # Program/Project
         try:
             fields["program"] = (
-                WebDriverWait(self.driver, 10)
-                .until(
+                await self.wait(10).until(
                     EC.presence_of_element_located(
                         (By.CSS_SELECTOR, "table tr:nth-of-type(11) td")
                     )
                 )
-                .text
-            )
+            ).text
         except Exception as e:
             print(f"Error extracting text: {e}")
 
         # Project URL
         fields["url"] = url
-        self.driver.close()
-        self.driver.switch_to.window(self.driver.window_handles[0])
+        await self.close_detail_page()
         await self.save_to_database(fields)
         return fields
 
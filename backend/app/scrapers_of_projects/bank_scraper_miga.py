@@ -1,7 +1,5 @@
 import logging
-import time
 
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 
@@ -19,6 +17,9 @@ class WorldBankGroupGuaranteesScraper(BankScraperBase):
     def get_name(self):
         return "World Bank Group Guarantees"
 
+    def get_ready_selector(self):
+        return ".teaser-list.view.view-featured-projects .view-content .page-title a"
+
 
     async def extract_projects_data(self):
         # Try multiple approaches to find project data
@@ -40,7 +41,7 @@ class WorldBankGroupGuaranteesScraper(BankScraperBase):
                 )
 
                 # Wait to appear project url.
-                WebDriverWait(self.driver, 15).until(
+                await self.wait(15).until(
                     EC.presence_of_all_elements_located(
                         (By.CSS_SELECTOR, ".teaser-list.view.view-featured-projects .view-content .page-title a")
                     )
@@ -65,6 +66,7 @@ class WorldBankGroupGuaranteesScraper(BankScraperBase):
 
         # Process each row
 
+        row_urls = []
         for i, row in enumerate(rows):
             try:
                 # finding row url
@@ -77,13 +79,14 @@ class WorldBankGroupGuaranteesScraper(BankScraperBase):
                     if link:
                         row_url = link.get_attribute("href")
 
-                if await self.opportunity_of_url(row_url) is None:
-                    await self.extract_project_data(row_url)
+                row_urls.append(row_url)
 
             except Exception as e:
                 print(f"Error processing row {i+1}: {e}")
                 continue
         
+        await self.process_row_urls(row_urls)
+
         # finished founding projects
         
     def is_next_page_by_click(self):
@@ -93,8 +96,6 @@ class WorldBankGroupGuaranteesScraper(BankScraperBase):
         """Find and click the next page button, return True if successful"""
         try:
             self.page_num += 1
-            self.driver.quit()
-            self.driver = None
             return True
 
         except Exception as e:
@@ -102,10 +103,7 @@ class WorldBankGroupGuaranteesScraper(BankScraperBase):
             return False
 
     async def extract_project_data(self, url):
-        self.driver.execute_script("window.open('');")
-        self.driver.switch_to.window(self.driver.window_handles[-1])
-        self.driver.get(url)
-        time.sleep(2)
+        await self.open_detail_page(url, ".paragraph__column")
         fields = {}
 
         try:
@@ -116,33 +114,14 @@ class WorldBankGroupGuaranteesScraper(BankScraperBase):
 
             container_text = container_elem.text.strip()
             print(container_text)
-            prompt = "I will upload contract content. Plz analyze it and then give me project title only. Output must be only project title without any comment and prefix such as `project title:`"
-            fields["title"] = await self.get_openai_response(prompt, container_text)
-
-            prompt = "I will upload contract content. Plz analyze it and then give me applied country only. Output must be only country name without any comment and prefix such as `country:`"
-            fields["country"] = await self.get_openai_response(prompt, container_text)
-
-            prompt = "You are given a contract document. Extract the contract budget only.  Return the budget amount exactly as written in the document (e.g., `US$317.5 million`).  If no budget is mentioned, return only `Not defined`.  Do not add any comments, explanations, or prefixes."
-            fields["budget"] = await self.get_openai_response(prompt, container_text)
-
-            prompt = "I will upload contract content. Plz analyze it and then give me applied sector only. Output must be only applied sector without any comment and prefix such as `sector:`"
-            fields["sector"] = await self.get_openai_response(prompt, container_text)
-
-            prompt = "I will upload contract content. Plz analyze it and then give me summary only. Output must be only summary without any comment and prefix such as `summary:`"
-            fields["summary"] = await self.get_openai_response(prompt, container_text)
-
-            prompt = "I will upload contract content. Plz analyze it and then give me last deadline date only. Output must be only last deadline date without any comment and prefix such as `deadline date:`"
-            fields["deadline"] = await self.get_openai_response(prompt, container_text)
-
-            prompt = "I will upload contract content. Plz analyze it and then give me related program and project only. Output must be only related program and project without any comment and prefix such as `related program/project:`"
-            fields["program"] = await self.get_openai_response(prompt, container_text)
+            fields.update(await self.extract_fields_with_openai(container_text))
+            fields["client"] = self.get_name()
 
             # Project URL
             fields["url"] = url
         except Exception:
             print("error in scraping fields")
-        self.driver.close()
-        self.driver.switch_to.window(self.driver.window_handles[0])
+        await self.close_detail_page()
         await self.save_to_database(fields)
         return fields
 
@@ -1,7 +1,6 @@
+import asyncio
 import logging
-import time
 
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 
@@ -18,6 +17,9 @@ class UnitedNationsDevelopmentProgrammeScraper(BankScraperBase):
     def get_name(self):
         return "United Nations Development Programme"
 
+    def get_ready_selector(self):
+        return ".vacanciesTable a"
+
 
     async def extract_projects_data(self):
         # Try multiple approaches to find project data
@@ -39,7 +41,7 @@ class UnitedNationsDevelopmentProgrammeScraper(BankScraperBase):
                 )
 
                 # Wait to appear project url.
-                WebDriverWait(self.driver, 15).until(
+                await self.wait(15).until(
                     EC.presence_of_all_elements_located(
                         (By.CSS_SELECTOR, ".vacanciesTable a")
                     )
@@ -64,6 +66,7 @@ class UnitedNationsDevelopmentProgrammeScraper(BankScraperBase):
 
         # Process each row
 
+        row_urls = []
         for i, row in enumerate(rows):
             try:
                 # finding row url
@@ -76,13 +79,14 @@ class UnitedNationsDevelopmentProgrammeScraper(BankScraperBase):
                     if link:
                         row_url = link.get_attribute("href")
 
-                if await self.opportunity_of_url(row_url) is None:
-                    await self.extract_project_data(row_url)
+                row_urls.append(row_url)
 
             except Exception as e:
                 print(f"Error processing row {i+1}: {e}")
                 continue
         
+        await self.process_row_urls(row_urls)
+
         # finished founding projects
 
     def is_next_page_by_click(self):
@@ -107,22 +111,19 @@ class UnitedNationsDevelopmentProgrammeScraper(BankScraperBase):
 
             for selector_type, selector in next_selectors:
                 try:
-                    next_btn = self.driver.find_element(selector_type, selector)
-                    if next_btn.is_enabled() and next_btn.is_displayed():
+                    next_btn = await asyncio.to_thread(self.driver.find_element, selector_type, selector)
+                    if await asyncio.to_thread(lambda: next_btn.is_enabled() and next_btn.is_displayed()):
                         print(f"Found next page button: {selector}")
 
                         # Scroll to the button to ensure it's clickable
-                        self.driver.execute_script(
-                            "arguments[0].scrollIntoView(true);", next_btn
+                        await asyncio.to_thread(
+                            self.driver.execute_script, "arguments[0].scrollIntoView(true);", next_btn
                         )
-                        time.sleep(1)
 
                         # Try to click the button
-                        next_btn.click()
+                        await self.click_next_page(next_btn)
                         print("Clicked next page button")
-
-                        # Wait for page to load
-                        time.sleep(3)
+                        # the scraping loop waits for the next page to be ready
                         return True
 
                 except Exception as e:
@@ -137,12 +138,9 @@ class UnitedNationsDevelopmentProgrammeScraper(BankScraperBase):
             return False
 
     async def extract_project_data(self, url):
-        self.driver.execute_script("window.open('');")
-        self.driver.switch_to.window(self.driver.window_handles[-1])
-        self.driver.get(url)
-        time.sleep(2)
+        await self.open_detail_page(url, ".grid-container.fluid.mt-h")
         fields = {}
-        container = WebDriverWait(self.driver, 10).until(
+        container = await self.wait(10).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, ".grid-container.fluid.mt-h"))
         )
 
@@ -150,7 +148,7 @@ class UnitedNationsDevelopmentProgrammeScraper(BankScraperBase):
         try:
             print("scraping project title")
             # Wait for the <nav> element with class 'breadcrumb' containing the <ul> and second <li>
-            title_elem = WebDriverWait(self.driver, 10).until(
+            title_elem = await self.wait(10).until(
                 EC.presence_of_element_located(
                     (By.CSS_SELECTOR, "nav.breadcrumb ul li:nth-of-type(2)")
                 )
@@ -165,7 +163,7 @@ class UnitedNationsDevelopmentProgrammeScraper(BankScraperBase):
         # country
         try:
             # Wait for the first .postMetadata__category inside .postMetadata to be present
-            p_elem = WebDriverWait(self.driver, 10).until(
+            p_elem = await self.wait(10).until(
                 EC.presence_of_element_located(
                     (
                         By.CSS_SELECTOR,
@@ -186,7 +184,7 @@ class UnitedNationsDevelopmentProgrammeScraper(BankScraperBase):
 
         # sector
         try:
-            container = WebDriverWait(self.driver, 10).until(
+            container = await self.wait(10).until(
                 EC.presence_of_element_located(
                     (
                         By.CSS_SELECTOR,
@@ -204,7 +202,7 @@ class UnitedNationsDevelopmentProgrammeScraper(BankScraperBase):
 
         # Summary of requested services
         try:
-            summary_elems = WebDriverWait(self.driver, 10).until(
+            summary_elems = await self.wait(10).until(
                 EC.presence_of_all_elements_located(
                     (By.CSS_SELECTOR, ".cell.large-8.medium-offset-1.medium-10.postContent")
                 )
@@ -218,7 +216,7 @@ class UnitedNationsDevelopmentProgrammeScraper(BankScraperBase):
 
         # Submission deadline
         try:
-            p_elem = WebDriverWait(self.driver, 10).until(
+            p_elem = await self.wait(10).until(
                 EC.presence_of_element_located(
                     (
                         By.CSS_SELECTOR,
@@ -238,8 +236,7 @@ class UnitedNationsDevelopmentProgrammeScraper(BankScraperBase):
 
         # Project URL
         fields["url"] = url
-        self.driver.close()
-        self.driver.switch_to.window(self.driver.window_handles[0])
+        await self.close_detail_page()
         await self.save_to_database(fields)
         return fields
 
@@ -1,12 +1,61 @@
 import logging
-import time
 
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 
 
 from .bank_scraper import BankScraperBase
+from .api_source import ApiSource, format_amount
+
+
+def first_text(value):
+    """World Bank API fields are either a string, a list of strings or a {'Name'/'cdata': ...} dict"""
+    if isinstance(value, list):
+        value = value[0] if value else ""
+    if isinstance(value, dict):
+        value = value.get("Name") or value.get("cdata") or ""
+    return str(value or "").strip()
+
+
+class WorldBankApiSource(ApiSource):
+    API_URL = "https://search.worldbank.org/api/v2/projects"
+    ROWS = 100
+
+    async def list_projects(self, client, page):
+        data = await self.get_json(
+            client,
+            self.API_URL,
+            params={
+                "format": "json",
+                "fl": "id,project_name,countryshortname,totalcommamt,sector1,project_abstract,pdo,closingdate,boardapprovaldate",
+                "rows": self.ROWS,
+                "os": page * self.ROWS,
+                "srt": "boardapprovaldate",
+                "order": "desc",
+            },
+        )
+
+        projects = []
+        for record in (data.get("projects") or {}).values():
+            if not record.get("id"):
+                continue
+            projects.append(
+                {
+                    "title": first_text(record.get("project_name")),
+                    "client": "World Bank",
+                    "country": first_text(record.get("countryshortname")),
+                    "sector": first_text(record.get("sector1")),
+                    "summary": first_text(record.get("project_abstract")) or first_text(record.get("pdo")),
+                    # the feed has no submission deadline; closingdate is when the project itself closes
+                    "deadline": "",
+                    "closing_date": first_text(record.get("closingdate")),
+                    "program": "",
+                    "budget": format_amount(record.get("totalcommamt")),
+                    "url": f"https://projects.worldbank.org/en/projects-operations/project-detail/{record['id']}",
+                    "published": first_text(record.get("boardapprovaldate")),
+                }
+            )
+        return projects
 
 
 class WorldBankScraper(BankScraperBase):
@@ -20,6 +69,12 @@ class WorldBankScraper(BankScraperBase):
     def get_name(self):
         return "World Bank";
 
+    def get_ready_selector(self):
+        return "tr.ng-tns-c1-0.ng-star-inserted"
+
+    def get_api_source(self):
+        return WorldBankApiSource()
+
     async def extract_projects_data(self):
         # Try multiple approaches to find project data
         # project_data = None
@@ -40,7 +95,7 @@ class WorldBankScraper(BankScraperBase):
         #         )
 
         #         # Wait to appear project url.
-        #         WebDriverWait(self.driver, 15).until(
+        #         self.wait(15).until(
         #             EC.presence_of_all_elements_located(
         #                 (By.CSS_SELECTOR, ".project_recentdata a")
         #             )
@@ -57,7 +112,7 @@ class WorldBankScraper(BankScraperBase):
 
 
         try:
-            rows = WebDriverWait(self.driver, 50).until(
+            rows = await self.wait(50).until(
                 EC.presence_of_all_elements_located(
                     (By.CSS_SELECTOR, "tr.ng-tns-c1-0.ng-star-inserted")
                 )
@@ -70,6 +125,7 @@ class WorldBankScraper(BankScraperBase):
 
         # Process each row
 
+        row_urls = []
         for i, row in enumerate(rows):
             try:
                 tdElements = row.find_elements(By.CSS_SELECTOR, "td")
@@ -77,13 +133,14 @@ class WorldBankScraper(BankScraperBase):
                 row_url = f"https://projects.worldbank.org/en/projects-operations/project-detail/{tdElements[2].text}"
                 print(row_url)
 
-                if await self.opportunity_of_url(row_url) is None:
-                    await self.extract_project_data(row_url)
+                row_urls.append(row_url)
 
             except Exception as e:
                 print(f"Error processing row {i+1}: {e}")
                 continue
         
+        await self.process_row_urls(row_urls)
+
         # finished founding projects
 
     def is_next_page_by_click(self):
@@ -91,8 +148,6 @@ class WorldBankScraper(BankScraperBase):
 
     async def find_and_click_next_page(self):
         """Find and click the next page button, return True if successful"""
-        self.driver.quit()
-        self.driver = None
         try:
             self.os_num += 20
             return True
@@ -104,10 +159,7 @@ class WorldBankScraper(BankScraperBase):
 
     async def extract_project_data(self, url):
 
-        self.driver.execute_script("window.open('');")
-        self.driver.switch_to.window(self.driver.window_handles[-1])
-        self.driver.get(url)
-        time.sleep(2)
+        await self.open_detail_page(url)
         fields = {}
         # title
         try:
@@ -129,7 +181,7 @@ class WorldBankScraper(BankScraperBase):
         # country
         try:
             # Wait until at least one country link is present
-            # WebDriverWait(self.driver, 10).until(
+            # self.wait(10).until(
             #     EC.presence_of_all_elements_located(
             #         (By.CSS_SELECTOR, "a.dropdown-item[href*='/country/']")
             #     )
@@ -152,7 +204,7 @@ class WorldBankScraper(BankScraperBase):
         # budget
         try:
             # Wait until the main-detail element is present
-            main_detail = WebDriverWait(self.driver, 10).until(
+            main_detail = await self.wait(10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".main-detail"))
             )
 
@@ -183,7 +235,7 @@ class WorldBankScraper(BankScraperBase):
         # sector
         try:
             # Wait until the main-detail element is present
-            development_objective = WebDriverWait(self.driver, 10).until(
+            development_objective = await self.wait(10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, "#development-objective"))
             )
 
@@ -202,14 +254,14 @@ class WorldBankScraper(BankScraperBase):
         # 1. Try clicking the "Show more" button if it exists
         try:
             # Wait until the <a> element is clickable
-            show_more_link = abstract = WebDriverWait(self.driver, 10).until(
+            show_more_link = abstract = await self.wait(10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, "#abstract a"))
             )
             show_more_link.click()
             print("Clicked the 'Show More' link inside abstract.")
             try:
                 # Wait until #abstract is present
-                abstract = WebDriverWait(self.driver, 10).until(
+                abstract = await self.wait(10).until(
                     EC.presence_of_element_located((By.CSS_SELECTOR, "#abstract"))
                 )
 
@@ -229,19 +281,22 @@ class WorldBankScraper(BankScraperBase):
             except Exception as e:
                 print("Error:", e)
         except Exception as e:
-            development_objective = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "#development-objective"))
-            )
-
-            fields["summary"]=development_objective.text.strip()
             print(f"Failed to click the link: {e}")
+            try:
+                development_objective = await self.wait(10).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "#development-objective"))
+                )
+                fields["summary"] = development_objective.text.strip()
+            except Exception as e:
+                print(f"No development objective found: {e}")
+                fields["summary"] = ""
         
 
         # Submission deadline
         # .main-detail, fifth .row, third li, p
         try:
             # Wait until .main-detail is present
-            main_detail = WebDriverWait(self.driver, 10).until(
+            main_detail = await self.wait(10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".main-detail"))
             )
 
@@ -279,8 +334,7 @@ class WorldBankScraper(BankScraperBase):
 
         # Project URL
         fields["url"] = url
-        self.driver.close()
-        self.driver.switch_to.window(self.driver.window_handles[0])
+        await self.close_detail_page()
         await self.save_to_database(fields)
         return fields
 
@@ -0,0 +1,61 @@
+import os
+import time
+import asyncio
+import threading
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+
+# Set by stop_scraping (e.g. on SIGTERM); every crawl checks it and stops at the next wait, page or LLM call
+stop_event = threading.Event()
+
+# Seconds a listing page may take with its detail pages before the rest of them is left for the next run
+PAGE_TIME_BUDGET = int(os.environ.get("PAGE_TIME_BUDGET", "900"))
+# Times a listing page that failed or ran out of its time budget is tried again before it is skipped
+PAGE_RETRIES = int(os.environ.get("PAGE_RETRIES", "2"))
+
+
+class CrawlCancelled(BaseException):
+    """Raised inside a crawl once it was stopped or ran past one of its deadlines.
+
+    Like asyncio.CancelledError it is a BaseException, so the scrapers' broad
+    `except Exception` fallbacks never swallow it and save a half-read page.
+    """
+
+
+class CancellableWait:
+    """Awaitable counterpart of WebDriverWait: polls a condition on a worker thread and sleeps on the event loop.
+
+    It never waits past its scraper's deadlines and raises CrawlCancelled between
+    polls once the crawl must stop.
+    """
+
+    def __init__(self, scraper, timeout, poll_frequency=0.5):
+        left = scraper.time_left()
+        if left is not None:
+            timeout = min(timeout, left)
+        self.scraper = scraper
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+
+    async def poll(self, method, expected, message):
+        end = time.monotonic() + self.timeout
+        while True:
+            self.scraper.check_cancelled()
+            try:
+                value = await asyncio.to_thread(method, self.scraper.driver)
+                if bool(value) == expected:
+                    return value
+            except NoSuchElementException:
+                # like WebDriverWait: an element missing so far counts as not there yet
+                if not expected:
+                    return True
+            if time.monotonic() > end:
+                raise TimeoutException(message)
+            await asyncio.sleep(self.poll_frequency)
+
+    async def until(self, method, message=""):
+        return await self.poll(method, True, message)
+
+    async def until_not(self, method, message=""):
+        return await self.poll(method, False, message)
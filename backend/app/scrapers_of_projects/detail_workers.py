@@ -0,0 +1,97 @@
+import os
+import copy
+import time
+import queue
+import asyncio
+import logging
+import threading
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+from app.scrapers_of_projects.webdriver_pool import driver_pool
+
+
+# Browsers extracting the detail pages of one listing page, the scraper's own browser included
+DETAIL_WORKERS = int(os.environ.get("DETAIL_WORKERS", "3"))
+# Detail pages of one site loading at the same time, over all banks
+DOMAIN_CONCURRENCY = int(os.environ.get("DOMAIN_CONCURRENCY", "2"))
+# Minimum seconds between two page loads on the same site
+DOMAIN_MIN_INTERVAL = float(os.environ.get("DOMAIN_MIN_INTERVAL", "1.0"))
+
+
+class BrowserCrashed(Exception):
+    """Raised by a detail worker whose browser stopped answering; its current page went back to the queue"""
+
+
+class DomainLimiter:
+    """Politeness limit per site: a few pages in flight and a minimum gap between page loads.
+
+    Waiting happens on the event loop; the state is guarded by thread locks, so
+    banks scraped on different event loops share the same limits.
+    """
+
+    def __init__(self, concurrency=DOMAIN_CONCURRENCY, min_interval=DOMAIN_MIN_INTERVAL):
+        self.concurrency = concurrency
+        self.min_interval = min_interval
+        self.lock = threading.Lock()
+        self.semaphores = {}
+        self.next_start = {}
+
+    @asynccontextmanager
+    async def slot(self, url):
+        """Hold one of the site's slots while its page is loaded and read"""
+        domain = urlparse(url).netloc
+        with self.lock:
+            semaphore = self.semaphores.setdefault(domain, threading.BoundedSemaphore(self.concurrency))
+        while not semaphore.acquire(blocking=False):
+            await asyncio.sleep(0.05)
+        try:
+            with self.lock:
+                now = time.monotonic()
+                start = max(now, self.next_start.get(domain, 0.0))
+                self.next_start[domain] = start + self.min_interval
+            if start > now:
+                await asyncio.sleep(start - now)
+            yield
+        finally:
+            semaphore.release()
+
+
+domain_limiter = DomainLimiter()
+
+
+async def run_detail_worker(scraper, work, collected):
+    """Extract queued detail pages on an extra browser, as a task next to the scraper's own.
+
+    The worker is a shallow copy of the scraper with its own driver; the projects
+    it scrapes are collected for the scraper to save.
+    """
+    try:
+        driver = await asyncio.to_thread(driver_pool.acquire, 0)
+    except TimeoutError:
+        # every browser is busy, the scraper works through the queue alone
+        return
+
+    worker = copy.copy(scraper)
+    worker.driver = driver
+    worker.collected = collected
+    discard = False
+    try:
+        await worker.extract_detail_queue(work)
+    except BrowserCrashed as e:
+        # the other browsers carry on with the queue, this one is retired
+        logging.warning(f"Detail worker of {scraper.get_name()} stops, {e}")
+        discard = True
+    except Exception as e:
+        logging.error(f"Detail worker of {scraper.get_name()} failed: {e}")
+        discard = True
+    finally:
+        discard = discard or not await asyncio.to_thread(driver_pool.is_alive, driver)
+        await asyncio.to_thread(driver_pool.release, driver, discard)
+
+
+def queue_urls(urls):
+    work = queue.Queue()
+    for url in urls:
+        work.put(url)
+    return work
@@ -0,0 +1,83 @@
+import io
+import os
+import asyncio
+import hashlib
+import logging
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urljoin, urlparse, parse_qs
+
+import httpx
+
+
+# Processes parsing PDF documents, shared by all scrapers
+PDF_WORKERS = int(os.environ.get("PDF_WORKERS", "2"))
+# Seconds to wait for a notice document to download
+PDF_DOWNLOAD_TIMEOUT = float(os.environ.get("PDF_DOWNLOAD_TIMEOUT", "60"))
+# Extracted text of every parsed document, by sha256 of the PDF bytes
+PDF_TEXT_CACHE_DIR = os.environ.get(
+    "PDF_TEXT_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "instance", "pdf_text"),
+)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Start the PDF parsing processes on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=PDF_WORKERS)
+        return _executor
+
+
+def parse_pdf(data):
+    """Extract the text of a PDF document; runs in a worker process"""
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(data))
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def pdf_url_of_viewer(src, page_url):
+    """Return the document url of an embedded PDF viewer (`viewer.html?file=...`) or of a direct PDF link"""
+    if not src:
+        return None
+    src = urljoin(page_url, src)
+    file_param = parse_qs(urlparse(src).query).get("file")
+    if file_param:
+        return urljoin(src, file_param[0])
+    return src if urlparse(src).path.lower().endswith(".pdf") else None
+
+
+async def pdf_text(data):
+    """Return the text of PDF bytes, parsing each distinct document only once"""
+    digest = hashlib.sha256(data).hexdigest()
+    path = os.path.join(PDF_TEXT_CACHE_DIR, f"{digest}.txt")
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    text = await asyncio.wrap_future(get_executor().submit(parse_pdf, data))
+    try:
+        os.makedirs(PDF_TEXT_CACHE_DIR, exist_ok=True)
+        # a temporary file of our own, workers reading the same notice may cache it at the same time
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=PDF_TEXT_CACHE_DIR, suffix=".tmp", delete=False) as f:
+            f.write(text)
+        os.replace(f.name, path)
+    except OSError as e:
+        logging.error(f"Failed to cache PDF text {digest}: {e}")
+    return text
+
+
+async def fetch_pdf_text(url):
+    """Download a PDF with httpx and return its text"""
+    async with httpx.AsyncClient(timeout=PDF_DOWNLOAD_TIMEOUT, follow_redirects=True) as client:
+        response = await client.get(url)
+    response.raise_for_status()
+    if not response.content.startswith(b"%PDF"):
+        raise ValueError(f"{url} is not a PDF document")
+    return await pdf_text(response.content)
@@ -0,0 +1,173 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import datetime
+
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.models import db, Opportunity
+
+
+# Scraped projects buffered before they are written with one bulk upsert
+SINK_BATCH_SIZE = int(os.environ.get("SINK_BATCH_SIZE", "50"))
+# Seconds a buffered project may wait before the buffer is flushed anyway
+SINK_FLUSH_INTERVAL = float(os.environ.get("SINK_FLUSH_INTERVAL", "60"))
+
+# Opportunity column and the scraped field it is filled from
+SCRAPED_FIELDS = {
+    "project_name": "title",
+    "client": "client",
+    "country": "country",
+    "sector": "sector",
+    "summary": "summary",
+    "deadline": "deadline",
+    "program": "program",
+    "budget": "budget",
+}
+
+UPSERT_DIALECTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
+
+def fingerprint_text(text):
+    """Hash a document with whitespace and case normalised, so cosmetic re-renders keep the hash"""
+    normalised = " ".join((text or "").split()).lower()
+    return hashlib.sha256(normalised.encode("utf-8")).hexdigest()
+
+
+def fingerprint_fields(row):
+    """Hash the scraped fields of a project, used when no document fingerprint was taken"""
+    raw = json.dumps([row.get(column) for column in SCRAPED_FIELDS], default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class OpportunitySink:
+    """Buffers scraped projects and writes them with bulk upserts keyed by url.
+
+    Projects identical to the stored row are not written at all (only a new
+    fingerprint is recorded); new and changed ones are written with
+    INSERT ... ON CONFLICT (url) DO UPDATE, which clears `found` and the matched
+    partners so that they are matched again.
+    """
+
+    def __init__(self, batch_size=SINK_BATCH_SIZE, flush_interval=SINK_FLUSH_INTERVAL):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending = {}
+        self.last_flush = time.monotonic()
+        self.inserted = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.failed = 0
+
+    def add(self, project):
+        """Buffer one scraped project, flushing on the size or time threshold"""
+        if not project.get("url") or not project.get("title"):
+            logging.warning(f"Skipping scraped project without url or title: {project.get('url')}")
+            self.failed += 1
+            return
+        row = {column: project.get(field) for column, field in SCRAPED_FIELDS.items()}
+        row["url"] = project["url"]
+        row["fingerprint"] = project.get("fingerprint") or fingerprint_fields(row)
+        # a url scraped twice before a flush keeps its latest version
+        self.pending[row["url"]] = row
+
+        if len(self.pending) >= self.batch_size or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered projects, returning the number of rows written.
+
+        If the write fails the projects stay buffered and the error is raised.
+        """
+        rows = list(self.pending.values())
+        self.pending = {}
+        self.last_flush = time.monotonic()
+        if not rows:
+            return 0
+
+        columns = [getattr(Opportunity, column) for column in SCRAPED_FIELDS]
+        stored = {
+            row.url: row
+            for row in db.session.execute(
+                db.select(Opportunity.id, Opportunity.url, Opportunity.fingerprint, *columns).where(Opportunity.url.in_([row["url"] for row in rows]))
+            )
+        }
+
+        changed = []
+        refingerprinted = []
+        inserted = updated = unchanged = 0
+        for row in rows:
+            current = stored.get(row["url"])
+            if current is None:
+                inserted += 1
+            elif any(getattr(current, column) != row[column] for column in SCRAPED_FIELDS):
+                updated += 1
+            else:
+                # same content, partners matched for it stay valid
+                unchanged += 1
+                if current.fingerprint != row["fingerprint"]:
+                    refingerprinted.append({"id": current.id, "fingerprint": row["fingerprint"]})
+                continue
+            changed.append(dict(
+                row,
+                found=False,
+                three_matched_scores_and_recommended_partners_ids=json.dumps([]),
+                # ON CONFLICT DO UPDATE does not apply the column's onupdate
+                updated_at=datetime.datetime.utcnow(),
+            ))
+
+        try:
+            if changed:
+                self.upsert(changed)
+            if refingerprinted:
+                db.session.execute(db.update(Opportunity), refingerprinted)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            # keep the rows for the next flush; the caller must not checkpoint past them
+            self.pending = {**{row["url"]: row for row in rows}, **self.pending}
+            logging.error(f"Failed to write {len(rows)} scraped projects: {e}")
+            raise
+
+        self.inserted += inserted
+        self.updated += updated
+        self.unchanged += unchanged
+        print(f"Saved scraped projects: {inserted} inserted, {updated} updated, {unchanged} unchanged")
+        return len(changed)
+
+    def upsert(self, rows):
+        """Insert or update rows by url"""
+        insert = UPSERT_DIALECTS.get(db.engine.dialect.name)
+        if insert is not None:
+            statement = insert(Opportunity).values(rows)
+            statement = statement.on_conflict_do_update(
+                index_elements=[Opportunity.url],
+                set_={name: statement.excluded[name] for name in rows[0] if name != "url"},
+            )
+            db.session.execute(statement)
+            return
+
+        # databases without ON CONFLICT fall back to one merge per row
+        for row in rows:
+            opportunity = Opportunity.query.filter_by(url=row["url"]).first() or Opportunity(url=row["url"])
+            for name, value in row.items():
+                setattr(opportunity, name, value)
+            db.session.add(opportunity)
+
+    def discard(self):
+        """Drop the buffered projects that could not be written, counting them as failed"""
+        dropped = len(self.pending)
+        self.failed += dropped
+        self.pending = {}
+        return dropped
+
+    def stats(self):
+        return {
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "failed": self.failed,
+        }
@@ -4,15 +4,13 @@ import requests
 import logging
 import asyncio
 
-from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
-from datetime import datetime
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from datetime import datetime, timedelta
+from flask import current_app
 
-import concurrent.futures
-
-import threading
-
-stop_event = threading.Event()
+from app.scrapers_of_projects.cancellation import stop_event
 
 
 # Import individual scrapers
@@ -29,16 +27,42 @@ from app.scrapers_of_projects.bank_scraper_fmo import DutchEnterpreneurialDevelo
 from app.scrapers_of_projects.bank_scraper_miga import WorldBankGroupGuaranteesScraper
 from app.scrapers_of_projects.bank_scraper_iadb import InterAmericanDevelopmentBankScraper
 from app.scrapers_of_projects.bank_scraper_debit import DevelopmentBankScraper
+from app.scrapers_of_projects.webdriver_pool import driver_pool
+from app.llm_cache import llm_cache
+from app.report_writer import materialize_reports
+from app.models import db, CrawlState
+from app.scrapers_of_projects.bank_leases import (
+    acquire_bank_lease,
+    renew_bank_lease,
+    release_bank_lease,
+    BANK_LEASE_TTL,
+    acquire_lock,
+    release_lock,
+    SCRAPE_LOCK_TTL,
+)
+from app.scrapers_of_projects.bank_schedules import load_bank_schedules
 
 
-# Global Lock to ensure that only one scraping process runs at a time
-scraping_lock = threading.Lock()
+# Distributed lock ensuring that only one full scraping run happens at a time, over all workers
+SCRAPE_ALL_LOCK = "scrape-all"
 
 # --- Config ---
 BACKEND_API = os.environ.get("BACKEND_API", "http://localhost:5000/api/opportunity")
 PROXY_API_KEY = os.environ.get("PROXY_API_KEY", "")
 SLACK_WEBHOOK = os.environ.get("SLACK_WEBHOOK", "")
 HEADLESS = os.environ.get("HEADLESS", "1") == "1"
+# Number of banks scraped at the same time (each one owns a browser)
+MAX_SCRAPER_WORKERS = int(os.environ.get("MAX_SCRAPER_WORKERS", "4"))
+# Days between full crawls of a bank, runs in between stop at the already known projects
+FULL_CRAWL_INTERVAL_DAYS = int(os.environ.get("FULL_CRAWL_INTERVAL_DAYS", "30"))
+# Timezone of the bank schedules
+SCHEDULE_TIMEZONE = os.environ.get("SCHEDULE_TIMEZONE", "UTC")
+# Seconds a missed bank run may start late (e.g. the worker was down), later ones wait for the next day
+SCHEDULE_MISFIRE_GRACE = int(os.environ.get("SCHEDULE_MISFIRE_GRACE", "21600"))
+# Random seconds added to each scheduled start, so banks sharing a site do not start in lockstep
+SCHEDULE_JITTER = int(os.environ.get("SCHEDULE_JITTER", "300"))
+# Table of the persistent APScheduler job store
+SCHEDULER_JOBS_TABLE = "apscheduler_jobs"
 
 # --- Logging ---
 logging.basicConfig(
@@ -59,204 +83,304 @@ def notify_error(message):
 
 
 
-# def start_scheduler():
-#     """Start the scheduler for daily runs"""
-#     scheduler = BackgroundScheduler()
-
-#     # Schedule scrapers at different times to avoid conflicts
-#     # World Bank at 9:00 AM
-#     scheduler.add_job(
-#         scrape_wb,
-#         CronTrigger(hour=9, minute=0),
-#         id="daily_world_bank_scrape",
-#         name="Daily World Bank Scrape",
-#         replace_existing=True,
-#     )
-
-#     # African Development Bank at 9:30 AM
-#     scheduler.add_job(
-#         scrape_afdb,
-#         CronTrigger(hour=9, minute=30),
-#         id="daily_african_development_bank_scrape",
-#         name="Daily African Development Bank Scrape",
-#         replace_existing=True,
-#     )
-
-#     # European Investment Bank at 10:00 AM
-#     scheduler.add_job(
-#         scrape_eib,
-#         CronTrigger(hour=10, minute=00),
-#         id="daily_european_investment_bank_scrape",
-#         name="Daily European Investment Bank Scrape",
-#         replace_existing=True,
-#     )
-
-#     # Agence Française de Développement at 10:30 AM
-#     scheduler.add_job(
-#         scrape_afd,
-#         CronTrigger(hour=10, minute=30),
-#         id="daily_agence_française_de_développement_scrape",
-#         name="Daily Française de Développement Scrape",
-#         replace_existing=True,
-#     )
-
-#     # Islamic Development Bank at 11:00 AM
-#     scheduler.add_job(
-#         scrape_isdb,
-#         CronTrigger(hour=11, minute=00),
-#         id="daily_islamic_development_bank_scrape",
-#         name="Daily Islamic Development Bank Scrape",
-#         replace_existing=True,
-#     )
-
-#     # Kfw Development Bank at 11:30 AM
-#     scheduler.add_job(
-#         scrape_kfw,
-#         CronTrigger(hour=11, minute=30),
-#         id="daily_kfw_development_bank_scrape",
-#         name="Daily Kfw Development Bank Scrape",
-#         replace_existing=True,
-#     )
-
-#     # United Nations Development Programme at 12:00 AM
-#     scheduler.add_job(
-#         scrape_undp,
-#         CronTrigger(hour=12, minute=00),
-#         id="daily_united_nations_developmnet_programme_scrape",
-#         name="Daily United Nations Development Programme Scrape",
-#         replace_existing=True,
-#     )
-
-#     # Asian Development Bank at 12:30 AM
-#     scheduler.add_job(
-#         scrape_adb,
-#         CronTrigger(hour=12, minute=30),
-#         id="daily_asian_development_bank_scrape",
-#         name="Daily Asian Development Bank Scrape",
-#         replace_existing=True,
-#     )
-
-#     # European Bank for Reconstruction & Development at 13:00 AM
-#     scheduler.add_job(
-#         scrape_ebrd,
-#         CronTrigger(hour=13, minute=00),
-#         id="daily_european_bank_for_reconstruction_development_scrape",
-#         name="Daily European Bank for Reconstruction & Development Scrape",
-#         replace_existing=True,
-#     )
-
-#     # International Finance Corporation(IFC) at 13:30 AM
-#     scheduler.add_job(
-#         scrape_ifc,
-#         CronTrigger(hour=13, minute=30),
-#         id="daily_international_finance_corporation_scrape",
-#         name="Daily International Finance Corporation Scrape",
-#         replace_existing=True,
-#     )
-#     # FMO at 14:00 AM
-#     scheduler.add_job(
-#         scrape_fmo,
-#         CronTrigger(hour=14, minute=00),
-#         id="daily_fmo_scrape",
-#         name="Daily FMO Scrape",
-#         replace_existing=True,
-#     )
-
-#     # Multilateral Investment Guarantee Agency(MIGA) at 14:30 AM
-#     scheduler.add_job(
-#         scrape_miga,
-#         CronTrigger(hour=14, minute=30),
-#         id="daily_multilateral_investment_guarantee_agency_scrape",
-#         name="Multilateral Investment Guarantee Agency Scrape",
-#         replace_existing=True,
-#     )
-
-#     # Inter American Development Bank at 15:00 AM
-#     scheduler.add_job(
-#         scrape_idb,
-#         CronTrigger(hour=15, minute=00),
-#         id="daily_inter_american_development_bank_scrape",
-#         name="Daily Inter American Development Bank Scrape",
-#         replace_existing=True,
-#     )
-
-#     # DeBIT Database at 15:30 AM
-#     scheduler.add_job(
-#         scrape_debit,
-#         CronTrigger(hour=15, minute=30),
-#         id="daily_debit_database_scrape",
-#         name="Daily DeBIT Database Scrape",
-#         replace_existing=True,
-#     )
-
-#     scheduler.start()
-#     logging.info("Scheduler started. Daily scrapes scheduled:")
-#     logging.info("- World Bank: 9:00 AM")
-#     logging.info("- African Development Bank: 9:30 AM")
-#     logging.info("- European Investment Bank: 10:00 AM")
-#     logging.info("- Agence Française de Développement: 10:30 AM")
-#     logging.info("- Islamic Development Bank: 11:00 AM")
-#     logging.info("- Kfw Development Bank: 11:30 AM")
-#     logging.info("- United Nations Development Programme: 12:00 AM")
-#     logging.info("- Asian Development Bank: 12:30 AM")
-#     logging.info("- European Bank for Reconstruction & Development: 13:00 AM")
-#     logging.info("- International Finance Corporation: 13:30 AM")
-#     logging.info("- FMO: 14:00 AM")
-#     logging.info("- Multilateral Investment Guarantee Agency: 14:30 AM")
-#     logging.info("- Inter American Development Bank: 15:00 AM")
-#     logging.info("- DeBIT Database: 15:30 AM")
-
-#     try:
-#         while True:
-#             time.sleep(60)
-#     except (KeyboardInterrupt, SystemExit):
-#         scheduler.shutdown()
-#         logging.info("Scheduler stopped.")
-
-
-async def run_scraping():
-    with scraping_lock:
-        # List of scraping functions
-        scrape_wb = WorldBankScraper()
-        scrape_afdb = AfricanDevelopmeBankScraper()
-        scrape_eib = EuropeanInvestmentBankScraper()
-        scrape_afd = FrenchDevelopmentAgencyScraper()
-        scrape_kfw = KfWEntwicklungsBankScraper()
-        scrape_undp = UnitedNationsDevelopmentProgrammeScraper()
-        scrape_adb = AsianDevelopmentBankScraper()
-        scrape_ebrd = EuropeanBankScraper()
-        scrape_ifc = InternationalFinanceCorporationScraper()
-        scrape_fmo = DutchEnterpreneurialDevelopmentBankScraper()
-        scrape_miga = WorldBankGroupGuaranteesScraper()
-        scrape_iadb = InterAmericanDevelopmentBankScraper()
-        #scrape_debit = DevelopmentBankScraper()
-        scrapers = [
-            scrape_wb,
-            # scrape_afdb,
-            # scrape_eib,
-            # scrape_afd,
-            # scrape_isdb,
-            # scrape_kfw,
-            # scrape_undp,
-            # scrape_adb,
-            # scrape_ebrd,
-            # scrape_ifc,
-            # scrape_fmo,
-            # scrape_miga,
-            # scrape_iadb,
-            # scrape_debit,
-        ]
-        # with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-        #     future_to_scraper = {executor.submit(scraper): scraper for scraper in scrapers}
-        #     for future in concurrent.futures.as_completed(future_to_scraper):
-        #         scraper = future_to_scraper[future]
-        #         try:
-        #             future.result()
-        #         except Exception as e:
-        #             logging.error(f"Error running {scraper.__name__}: {e}")
-        #             notify_error(f"Error running {scraper.__name__}: {e}")
-
-        # await scrape_adb.scrape_page()
+# Scraper of every bank, by the id used in its schedule
+SCRAPER_CLASSES = {
+    "wb": WorldBankScraper,
+    "afdb": AfricanDevelopmeBankScraper,
+    "eib": EuropeanInvestmentBankScraper,
+    "afd": FrenchDevelopmentAgencyScraper,
+    "kfw": KfWEntwicklungsBankScraper,
+    "undp": UnitedNationsDevelopmentProgrammeScraper,
+    "adb": AsianDevelopmentBankScraper,
+    "ebrd": EuropeanBankScraper,
+    "ifc": InternationalFinanceCorporationScraper,
+    "fmo": DutchEnterpreneurialDevelopmentBankScraper,
+    "miga": WorldBankGroupGuaranteesScraper,
+    "iadb": InterAmericanDevelopmentBankScraper,
+    "debit": DevelopmentBankScraper,
+}
+
+
+def build_scrapers(bank_ids=None):
+    """Instantiate the scrapers of the given banks (all by default), highest priority first, configured from their schedule"""
+    scrapers = []
+    for bank_id, schedule in load_bank_schedules().items():
+        if bank_id not in SCRAPER_CLASSES or (bank_ids is not None and bank_id not in bank_ids):
+            continue
+        scraper = SCRAPER_CLASSES[bank_id]()
+        scraper.time_budget = schedule["timeout"]
+        scraper.detail_workers = schedule["max_concurrency"]
+        scrapers.append(scraper)
+    return scrapers
+
+
+def is_full_crawl_due(scraper):
+    """A bank gets a full crawl when it was never fully crawled or its last full crawl is too old"""
+    state = db.session.get(CrawlState, scraper.get_name())
+    if state is None or state.last_full_crawl_at is None:
+        return True
+    return datetime.utcnow() - state.last_full_crawl_at >= timedelta(days=FULL_CRAWL_INTERVAL_DAYS)
+
+
+async def keep_bank_lease(app, scraper, done):
+    """Renew a bank's lease until `done` is set, so slow pages keep it; flags the scraper when it is lost"""
+    with app.app_context():
+        try:
+            while not done.is_set():
+                try:
+                    await asyncio.wait_for(done.wait(), BANK_LEASE_TTL / 3)
+                except asyncio.TimeoutError:
+                    held = renew_bank_lease(scraper.get_name())
+                    db.session.commit()
+                    if not held:
+                        logging.warning(f"Lost the lease of {scraper.get_name()} to another worker, stopping it")
+                        scraper.lease_lost.set()
+                        return
+        finally:
+            db.session.remove()
+
+
+async def run_bank_scraper(app, scraper):
+    """Run one bank scraper to completion as a task of the worker's event loop, in its own app context.
+
+    Returns the seconds spent, or None when another worker holds the bank's lease.
+    """
+    started = time.monotonic()
+    scraper.deadline = started + scraper.time_budget
+    with app.app_context():
+        if not acquire_bank_lease(scraper.get_name()):
+            logging.info(f"{scraper.get_name()} is being scraped by another worker, skipping.")
+            return None
+        done = asyncio.Event()
+        # in its own app context, so its commits never carry the crawl's pending changes
+        heartbeat = asyncio.create_task(keep_bank_lease(app, scraper, done))
+        try:
+            await scraper.scrape_page()
+        finally:
+            done.set()
+            await heartbeat
+            release_bank_lease(scraper.get_name())
+            db.session.remove()
+    return time.monotonic() - started
+
+
+def summarize_bank_run(scraper, outcome):
+    """Log how a bank run ended and return its result: seconds spent, None when leased elsewhere, or the exception"""
+    name = scraper.get_name()
+    if isinstance(outcome, BaseException):
+        logging.error(f"Error running {name} scraper: {outcome}")
+        notify_error(f"Error running {name} scraper: {outcome}")
+        return {"status": "failed", "error": str(outcome)}
+    if outcome is None:
+        return {"status": "leased"}
+
+    if scraper.stop_event.is_set():
+        logging.info(f"{name} scraper was stopped after {outcome:.1f}s")
+        result = {"status": "cancelled", "elapsed": round(outcome, 1)}
+    elif scraper.lease_lost.is_set():
+        logging.warning(f"{name} scraper stopped after {outcome:.1f}s, another worker took over its lease")
+        result = {"status": "lease_lost", "elapsed": round(outcome, 1)}
+    elif scraper.is_out_of_time():
+        logging.warning(f"{name} scraper stopped after its time budget of {scraper.time_budget}s")
+        result = {"status": "timeout", "elapsed": round(outcome, 1)}
+    else:
+        logging.info(f"{name} scraper finished in {outcome:.1f}s")
+        result = {"status": "ok", "elapsed": round(outcome, 1)}
+    result["mode"] = "full" if scraper.full_crawl else "incremental"
+    result["new_projects"] = scraper.new_projects
+    result.update(scraper.sink.stats())
+    result["wait_seconds"] = round(scraper.wait_seconds, 1)
+    return result
+
+
+async def run_limited(slots, app, scraper):
+    """Run a bank scraper once one of the worker's bank slots is free"""
+    async with slots:
+        return await run_bank_scraper(app, scraper)
+
+
+async def refresh_reports():
+    """Rebuild the report files, when opportunities changed, on a worker thread"""
+    try:
+        await asyncio.to_thread(materialize_reports)
+    except Exception as e:
+        logging.error(f"Error materialising reports: {e}")
+        notify_error(f"Error materialising reports: {e}")
+
+
+async def keep_lock(name, done):
+    """Renew a named lock until `done` is set, so long runs keep it while crashed ones lose it.
+
+    Losing the lock stops the run, its banks leave checkpoints for the worker that took it over.
+    """
+    while not done.is_set():
+        try:
+            await asyncio.wait_for(done.wait(), SCRAPE_LOCK_TTL / 3)
+        except asyncio.TimeoutError:
+            if not acquire_lock(name):
+                logging.warning(f"Lost the {name} lock to another worker, stopping the run")
+                stop_scraping()
+                return
+
+
+async def run_scraping(full_crawl=None):
+    """Scrape every bank; full_crawl=None picks full or incremental mode per bank from its crawl state"""
+    if not acquire_lock(SCRAPE_ALL_LOCK):
+        logging.info("Another worker is already running a full scraping run, skipping.")
+        return {}
+
+    done = asyncio.Event()
+    renewer = asyncio.create_task(keep_lock(SCRAPE_ALL_LOCK, done))
+    try:
+        app = current_app._get_current_object()
+        scrapers = build_scrapers()
+        for scraper in scrapers:
+            scraper.full_crawl = is_full_crawl_due(scraper) if full_crawl is None else full_crawl
+
+        logging.info(
+            f"Starting scraping of {len(scrapers)} banks, {MAX_SCRAPER_WORKERS} at a time"
+        )
+        # every bank is a task of this event loop, their browser and HTTP waits interleave
+        slots = asyncio.Semaphore(MAX_SCRAPER_WORKERS)
+        outcomes = await asyncio.gather(
+            *[run_limited(slots, app, scraper) for scraper in scrapers],
+            # A failing bank must not take the others down with it
+            return_exceptions=True,
+        )
+        # Browsers are not needed until the next run
+        await asyncio.to_thread(driver_pool.drain)
+        logging.info(f"LLM cache after scraping: {llm_cache.stats()}")
+
+        results = {
+            scraper.get_name(): summarize_bank_run(scraper, outcome)
+            for scraper, outcome in zip(scrapers, outcomes)
+        }
+        # Daily report files are rebuilt here, when opportunities changed
+        await refresh_reports()
+        return results
+    finally:
+        done.set()
+        await renewer
+        release_lock(SCRAPE_ALL_LOCK)
+
+
+# App the scheduled jobs run in and the banks they may scrape at once, set by start_scheduler
+scheduler_app = None
+scheduler_slots = None
+# Bank jobs running on the scheduler's event loop
+running_jobs = set()
+
+
+async def scrape_bank(bank_id):
+    """Scheduled job scraping one bank, then refreshing the reports if it wrote anything"""
+    task = asyncio.current_task()
+    running_jobs.add(task)
+    try:
+        scraper = build_scrapers([bank_id])[0]
+        with scheduler_app.app_context():
+            scraper.full_crawl = is_full_crawl_due(scraper)
+        try:
+            outcome = await run_limited(scheduler_slots, scheduler_app, scraper)
+        except Exception as e:
+            outcome = e
+        result = summarize_bank_run(scraper, outcome)
+        # browsers other jobs still use are leased, only idle ones are quit
+        await asyncio.to_thread(driver_pool.drain)
+
+        if result.get("inserted") or result.get("updated"):
+            with scheduler_app.app_context():
+                await refresh_reports()
+        logging.info(f"Scheduled scrape of {scraper.get_name()} finished: {result}")
+        return result
+    finally:
+        running_jobs.discard(task)
+
+
+def cron_trigger(expr):
+    """Build the trigger of a crontab expression, jittered so that banks sharing a slot do not start at once.
+
+    add_job ignores its jitter argument when given a trigger instance, and
+    CronTrigger.from_crontab takes none, so the fields are passed here.
+    """
+    minute, hour, day, month, day_of_week = expr.split()
+    return CronTrigger(
+        minute=minute,
+        hour=hour,
+        day=day,
+        month=month,
+        day_of_week=day_of_week,
+        timezone=SCHEDULE_TIMEZONE,
+        jitter=SCHEDULE_JITTER,
+    )
+
+
+def start_scheduler(app):
+    """Start the daily per-bank schedule, kept in a job store in the app database.
+
+    Missed runs start late within SCHEDULE_MISFIRE_GRACE, several missed runs of a
+    bank coalesce into one, and a bank never runs twice at the same time.
+    Only one worker may run the scheduler at a time (see the worker's scheduler lock).
+    Must be called from the worker's event loop, which runs the bank jobs.
+    """
+    global scheduler_app, scheduler_slots
+    scheduler_app = app
+    scheduler_slots = asyncio.Semaphore(MAX_SCRAPER_WORKERS)
+    with app.app_context():
+        engine = db.engine
+
+    scheduler = AsyncIOScheduler(
+        jobstores={"default": SQLAlchemyJobStore(engine=engine, tablename=SCHEDULER_JOBS_TABLE)},
+        job_defaults={
+            "coalesce": True,
+            "max_instances": 1,
+            "misfire_grace_time": SCHEDULE_MISFIRE_GRACE,
+        },
+        timezone=SCHEDULE_TIMEZONE,
+    )
+    # paused until stale jobs are pruned, so they cannot fire
+    scheduler.start(paused=True)
+
+    schedules = load_bank_schedules()
+    job_ids = set()
+    for bank_id, schedule in schedules.items():
+        job_id = f"scrape_{bank_id}"
+        job_ids.add(job_id)
+        trigger = cron_trigger(schedule["cron"])
+        logging.info(f"Scheduled {bank_id} at '{schedule['cron']}' (priority {schedule['priority']}, timeout {schedule['timeout']}s)")
+        stored = scheduler.get_job(job_id)
+        if stored is not None and str(stored.trigger) == str(trigger) and stored.trigger.jitter == trigger.jitter:
+            # keep the stored job and its next run time, so runs missed while no worker was up still fire
+            continue
+        scheduler.add_job(
+            "app.scrapers_of_projects.scheduled_scraper:scrape_bank",
+            trigger,
+            args=[bank_id],
+            id=job_id,
+            name=f"Scrape {bank_id}",
+            replace_existing=True,
+        )
+    for job in scheduler.get_jobs():
+        if job.id not in job_ids:
+            logging.info(f"Removing job {job.id}, its bank is no longer scheduled")
+            job.remove()
+
+    scheduler.resume()
+    logging.info(f"Scheduler started with {len(job_ids)} bank jobs")
+    return scheduler
+
+
+async def stop_scheduler(scheduler):
+    """Stop scheduling new bank jobs, stop the running ones and wait for them to end before shutting down.
+
+    The running banks stop at their next check and leave a checkpoint; with stop_event set
+    the worker then exits, and its supervisor restarts it to stand by.
+    """
+    scheduler.pause()
+    stop_scraping()
+    if running_jobs:
+        await asyncio.wait(set(running_jobs))
+    # the asyncio executor cancels jobs still running at shutdown, none are left by now
+    scheduler.shutdown(wait=False)
 
 
 def stop_scraping():
@@ -264,4 +388,7 @@ def stop_scraping():
 
 
 if __name__ == "__main__":
-    asyncio.run(run_scraping())
+    # scraping needs the app context the worker sets up
+    from app.scrapers_of_projects.worker import main
+
+    main()
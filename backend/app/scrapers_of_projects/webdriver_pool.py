@@ -0,0 +1,185 @@
+import os
+import time
+import logging
+import atexit
+import threading
+
+from selenium import webdriver
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from selenium.common.exceptions import WebDriverException
+
+
+HEADLESS = os.environ.get("HEADLESS", "0") == "1"
+# Maximum number of browsers alive at the same time, listing and detail pages together
+WEBDRIVER_POOL_SIZE = int(os.environ.get("WEBDRIVER_POOL_SIZE", "8"))
+# Listing pages a browser may serve before it is replaced by a fresh one
+WEBDRIVER_MAX_PAGES = int(os.environ.get("WEBDRIVER_MAX_PAGES", "25"))
+# Seconds a page load may block the browser, so a stopped crawl is never stuck in driver.get
+PAGE_LOAD_TIMEOUT = int(os.environ.get("PAGE_LOAD_TIMEOUT", "60"))
+
+
+def create_driver():
+    """Start a Firefox driver with the stealth configuration used by all scrapers"""
+    options = FirefoxOptions()
+    if HEADLESS:
+        options.add_argument("--headless")
+
+    # Enhanced stealth settings
+    options.set_preference("dom.webdriver.enabled", False)
+    options.set_preference("useAutomationExtension", False)
+    options.set_preference(
+        "general.useragent.override",
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    )
+
+    # Additional stealth preferences
+    options.set_preference("dom.webnotifications.enabled", False)
+    options.set_preference("media.volume_scale", "0.0")
+    options.set_preference("network.proxy.type", 0)
+    options.set_preference("privacy.resistFingerprinting", False)
+    options.set_preference("browser.cache.disk.enable", False)
+    options.set_preference("browser.cache.memory.enable", False)
+
+    # Create the Firefox driver
+    driver = webdriver.Firefox(options=options)
+    driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+
+    # Enhanced stealth: remove webdriver properties
+    driver.execute_script(
+        "Object.defineProperty(navigator, 'webdriver', {get: ()=> undefined})"
+    )
+    driver.execute_script(
+        "Object.defineProperty(navigator, 'plugins', {get: ()=> [1, 2, 3, 4, 5]})"
+    )
+    driver.execute_script(
+        "Object.defineProperty(navigator, 'languages', {get: ()=> ['en-US', 'en']})"
+    )
+    return driver
+
+
+class WebDriverPool:
+    """Thread-safe pool that leases warm browsers to scrapers and recycles worn ones"""
+
+    def __init__(self, max_size=WEBDRIVER_POOL_SIZE, max_pages=WEBDRIVER_MAX_PAGES):
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.idle = []
+        # pages served per live driver, keyed by id(driver)
+        self.pages_served = {}
+        self.condition = threading.Condition()
+        self.closed = False
+        atexit.register(self.shutdown)
+
+    def size(self):
+        """Return how many browsers are alive, leased or idle"""
+        return len(self.pages_served)
+
+    def acquire(self, timeout=None):
+        """Lease a browser, reusing an idle one or starting a new one when there is room"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.condition:
+            while True:
+                if self.closed:
+                    raise RuntimeError("WebDriver pool is shut down")
+                if self.idle:
+                    driver = self.idle.pop()
+                    if self.is_alive(driver):
+                        return driver
+                    self.forget(driver)
+                    continue
+                if self.size() < self.max_size:
+                    # reserve the slot before starting the browser outside of the lock
+                    placeholder = object()
+                    self.pages_served[id(placeholder)] = 0
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("No WebDriver available in the pool")
+                self.condition.wait(remaining)
+
+        try:
+            driver = create_driver()
+        except Exception:
+            with self.condition:
+                self.pages_served.pop(id(placeholder), None)
+                self.condition.notify()
+            raise
+
+        with self.condition:
+            self.pages_served.pop(id(placeholder), None)
+            self.pages_served[id(driver)] = 0
+        logging.info(f"Driver set up for scraping ({self.size()}/{self.max_size} in pool)")
+        return driver
+
+    def release(self, driver, discard=False):
+        """Return a leased browser; crashed or worn browsers are quit instead of reused"""
+        if driver is None:
+            return
+        with self.condition:
+            worn = self.pages_served.get(id(driver), 0) >= self.max_pages
+        if discard or worn or self.closed or not self.reset(driver):
+            self.quit(driver)
+        else:
+            with self.condition:
+                self.idle.append(driver)
+        with self.condition:
+            self.condition.notify()
+
+    def count_page(self, driver):
+        """Record a listing page served by a browser and return whether it is worn out"""
+        with self.condition:
+            served = self.pages_served.get(id(driver), 0) + 1
+            self.pages_served[id(driver)] = served
+        return served >= self.max_pages
+
+    def is_alive(self, driver):
+        """Return whether the browser still answers WebDriver commands"""
+        try:
+            driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def reset(self, driver):
+        """Close extra tabs and blank the page so the next lease starts clean"""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.switch_to.default_content()
+            driver.get("about:blank")
+            return True
+        except WebDriverException as e:
+            logging.warning(f"Discarding WebDriver that failed to reset: {e}")
+            return False
+
+    def quit(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logging.error(f"Error during WebDriver cleanup: {e}")
+        self.forget(driver)
+
+    def forget(self, driver):
+        with self.condition:
+            self.pages_served.pop(id(driver), None)
+            self.condition.notify()
+
+    def drain(self):
+        """Quit every idle browser, e.g. once a scraping run is over"""
+        with self.condition:
+            idle, self.idle = self.idle, []
+        for driver in idle:
+            self.quit(driver)
+
+    def shutdown(self):
+        """Quit every idle browser and refuse further leases"""
+        with self.condition:
+            self.closed = True
+        self.drain()
+        logging.info("WebDriver pool shut down.")
+
+
+driver_pool = WebDriverPool()
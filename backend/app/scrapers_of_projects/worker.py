@@ -0,0 +1,105 @@
+"""Standalone scraping worker, run next to the web app:
+
+    python -m app.scrapers_of_projects.worker          # scrape every bank on its schedule
+    python -m app.scrapers_of_projects.worker --once   # scrape every bank once, then exit
+    python -m app.scrapers_of_projects.worker --full   # force full crawls, with --once
+
+Several workers may run at once: one of them runs the schedule, the others
+stand by to take over, and each bank is leased to one worker at a time.
+"""
+import os
+import time
+import signal
+import asyncio
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from app import create_app
+from app.scrapers_of_projects.scheduled_scraper import (
+    run_scraping,
+    start_scheduler,
+    stop_scheduler,
+    stop_scraping,
+    stop_event,
+    MAX_SCRAPER_WORKERS,
+)
+from app.scrapers_of_projects.webdriver_pool import WEBDRIVER_POOL_SIZE
+from app.scrapers_of_projects.bank_leases import acquire_lock, release_lock, SCRAPE_LOCK_TTL
+
+
+# Distributed lock held by the worker running the schedule
+SCHEDULER_LOCK = "scheduler"
+# Threads running the blocking browser calls, page loads and reports of the event loop
+IO_THREADS = int(os.environ.get("IO_THREADS", str(WEBDRIVER_POOL_SIZE + MAX_SCRAPER_WORKERS + 4)))
+
+
+def handle_shutdown(signum, frame):
+    logging.info(f"Worker received signal {signum}, stopping after the current pages.")
+    stop_scraping()
+
+
+async def with_io_threads(coroutine):
+    """Run a coroutine with a default executor sized for every browser to have a call in flight"""
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=IO_THREADS, thread_name_prefix="scraper-io")
+    )
+    return await coroutine
+
+
+async def wait_for_stop(timeout):
+    """Sleep on the event loop, waking up early on shutdown"""
+    end = time.monotonic() + timeout
+    while not stop_event.is_set() and time.monotonic() < end:
+        await asyncio.sleep(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape the development banks for new opportunities")
+    parser.add_argument("--once", action="store_true", help="run a single scraping pass and exit")
+    parser.add_argument("--full", action="store_true", help="with --once, crawl every bank fully instead of incrementally")
+    args = parser.parse_args()
+
+    signal.signal(signal.SIGTERM, handle_shutdown)
+    signal.signal(signal.SIGINT, handle_shutdown)
+
+    app = create_app()
+    if args.once:
+        with app.app_context():
+            results = asyncio.run(with_io_threads(run_scraping(full_crawl=True if args.full else None)))
+        print(f"Scraping run finished: {results}")
+        return
+
+    asyncio.run(with_io_threads(run_schedule(app)))
+
+
+async def run_schedule(app):
+    """Run the bank schedule on this event loop while the worker holds the scheduler lock, standing by otherwise"""
+    scheduler = None
+    while not stop_event.is_set():
+        try:
+            with app.app_context():
+                leader = acquire_lock(SCHEDULER_LOCK)
+        except Exception as e:
+            logging.error(f"Failed to renew the scheduler lock: {e}")
+            leader = False
+
+        if leader and scheduler is None:
+            logging.info("Worker took the scheduler lock, starting the schedule.")
+            scheduler = start_scheduler(app)
+        elif not leader and scheduler is not None:
+            logging.warning("Worker lost the scheduler lock, stopping the schedule and exiting.")
+            await stop_scheduler(scheduler)
+            scheduler = None
+        # renewed well before it expires
+        await wait_for_stop(SCRAPE_LOCK_TTL / 3)
+
+    if scheduler is not None:
+        # running bank jobs stop at their next check and leave a checkpoint
+        await stop_scheduler(scheduler)
+        with app.app_context():
+            release_lock(SCHEDULER_LOCK)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,19 @@ import os
 import time
 import requests
 import logging
-import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from openai import OpenAI
 
 from sqlalchemy import cast, String
 
 
 from app.models import Opportunity, Partner, Match, db
+from app.llm_cache import llm_cache
+from app.scrapers_score_of_companies.embedding_ranker import PreRanker, PRERANK_TOP_K
 
-from app.scrapers_score_of_companies.matching_scorer import getOpenAIResponse, get_matched_score_between_project_and_company
+from app.scrapers_score_of_companies.matching_scorer import get_matched_scores_between_project_and_companies
 
 
 # Load environment variables from .env file
@@ -41,6 +45,17 @@ UNIPILE_DNS = os.getenv("UNIPILE_DNS")
 
 max_daily_profiles = 100
 profiles_retrieved = 0
+profiles_lock = threading.Lock()
+
+# Unipile profile fetches per second, with bursts of up to UNIPILE_BURST requests
+UNIPILE_RATE = float(os.getenv("UNIPILE_RATE", "0.5"))
+UNIPILE_BURST = int(os.getenv("UNIPILE_BURST", "3"))
+# Profiles fetched at the same time while scoring candidates
+PROFILE_FETCH_WORKERS = int(os.getenv("PROFILE_FETCH_WORKERS", "4"))
+# Companies scored by one LLM request
+SCORING_BATCH_SIZE = int(os.getenv("SCORING_BATCH_SIZE", "10"))
+# Stop scoring once the top 3 has not changed for this many batches
+STABLE_BATCHES_TO_STOP = int(os.getenv("STABLE_BATCHES_TO_STOP", "2"))
 
 
 last_day_check = datetime.datetime.now(datetime.timezone.utc)
@@ -58,6 +73,42 @@ def can_make_request():
     return profiles_retrieved < max_daily_profiles
 
 
+def reserve_profile_request():
+    """Count one profile request against the daily limit, return False when it is reached"""
+    global profiles_retrieved
+    with profiles_lock:
+        if not can_make_request():
+            return False
+        profiles_retrieved += 1
+        return True
+
+
+class TokenBucket:
+    """Thread-safe token bucket that spaces out requests to a rate-limited API"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                time.sleep((1 - self.tokens) / self.rate)
+
+
+unipile_rate_limiter = TokenBucket(UNIPILE_RATE, UNIPILE_BURST)
+
+
 def code_of_country(country_name):
     """
     Get LinkedIn location code for a country name.
@@ -236,21 +287,13 @@ def get_all_linkinurls_of_companies(country, sector):
     return total_urls
 
 
-def act_as_human_to_avoid_rate_limit():
-    num = random.randint(3, 9)
-
-    time.sleep(
-        num
-    )  # Sleep for random seconds in range{3,...,9} to mimic human behavior
-
-
 def get_companydata_from_linkedinurl(company_url):
-    global profiles_retrieved
-    act_as_human_to_avoid_rate_limit()
-
-    if can_make_request() == False:
+    if not reserve_profile_request():
         raise Exception("Daily profile request limit reached")
 
+    # Space out requests instead of sleeping a fixed random time per profile
+    unipile_rate_limiter.acquire()
+
     path = urlparse(company_url).path
     company_identifier = path.strip("/").split("/")[-1]
 
@@ -263,163 +306,199 @@ def get_companydata_from_linkedinurl(company_url):
     response = requests.get(url, headers=headers)
 
     # print(response.text)
-    profiles_retrieved += 1
     return response.json()
 
 
 def getPerplexityResponse(prompt, query):
-    client = OpenAI(
-        api_key=os.getenv("PERPLEXITY_API_KEY"), base_url="https://api.perplexity.ai"
-    )
-    response = client.chat.completions.create(
-        model="sonar-pro",  # Perplexity model name
-        messages=[
-            {"role": "system", "content": prompt},
-            {"role": "user", "content": query},
-        ],
-        temperature=0.7,
-    )
-    return response.choices[0].message.content
+    model = "sonar-pro"  # Perplexity model name
 
-
-def get_three_suitable_matched_scores_and_companies_data(project):
-    try:
-
-        # Get companies urls at linkedin
-        company_urls = get_all_linkinurls_of_companies(
-            project["country"], project["sector"]
+    def fetch():
+        client = OpenAI(
+            api_key=os.getenv("PERPLEXITY_API_KEY"), base_url="https://api.perplexity.ai"
+        )
+        response = client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": prompt},
+                {"role": "user", "content": query},
+            ],
+            temperature=0.7,
+        )
+        return response.choices[0].message.content
+
+    return llm_cache.cached(model, prompt, query, fetch, temperature=0.7)
+
+
+def save_partner(company_data):
+    """Insert or update the Partner row of a LinkedIn company profile, without committing"""
+    # Find matched partner in Partner table
+    # Try to get profile_url from linkedin_data JSON field
+    profile_url = company_data.get("profile_url") or company_data.get("url", "")
+    result = Partner.query.filter(
+        cast(Partner.linkedindata["profile_url"], String) == profile_url
+    ).all() if profile_url else []
+
+    # if there is several partners in Partner table, remove all without first one and then update first one with new data
+    if len(result) > 1:
+        # Keep the first element and delete the duplicates
+        first_partner = result[0]
+        ids_to_delete = [partner.id for partner in result[1:]]
+        Partner.query.filter(Partner.id.in_(ids_to_delete)).delete(
+            synchronize_session=False
         )
 
-        # Find three best matched urls
-        matched_scores_and_companies_data = []
-        for i, company_url in enumerate(company_urls):
-            # Extract project information
-
-            # company_data is json type.
-            # get company data of url
-            company_data = get_companydata_from_linkedinurl(company_url)
-
-            # Find matched partner in Partner table
-            # Try to get profile_url from linkedin_data JSON field
-            profile_url = company_data.get("profile_url") or company_data.get("url", "")
-            result = Partner.query.filter(
-                cast(Partner.linkedindata["profile_url"], String) == profile_url
-            ).all() if profile_url else []
-
-            # if there is several partners in Partner table, remove all without first one and then update first one with new data
-            if len(result) > 1:
-                # Error, remove another elements without one element
-                # Keep the first element
-                first_partner = result[0]
-
-                # Collect IDs of other elements to delete
-                ids_to_delete = [partner.id for partner in result[1:]]
-
-                # Delete partners with these ids from Partner table
-                Partner.query.filter(Partner.id.in_(ids_to_delete)).delete(
-                    synchronize_session=False
-                )
+        # replace linkedin data of first_partner
+        first_partner.linkedindata = company_data
+        return first_partner
+    elif len(result) == 1:
+        # update linkedindata of the existing partner
+        result[0].linkedindata = company_data
+        return result[0]
+
+    new_partner = Partner(
+        name=company_data.get("name", ""),
+        country=company_data.get("location", {}).get("country", "") if isinstance(company_data.get("location"), dict) else company_data.get("country", ""),
+        sector=company_data.get("industry", ""),
+        website=company_data.get("website", ""),
+        linkedindata=company_data,  # assign JSON data here
+    )
+    db.session.add(new_partner)
+    # flush so the new partner gets its id for ranking
+    db.session.flush()
+    return new_partner
+
+
+def partner_to_dict(company, score):
+    return {
+        "id": company.id,
+        "name": company.name,
+        "country": company.country,
+        "website": company.website,
+        "sector": company.sector,
+        "matched_score": score
+    }
 
-                # replace linkedin data of first_partner
-                first_partner.linkedindata = company_data
 
-                db.session.commit()
+def get_three_suitable_matched_scores_and_companies_data(project, progress_callback=None):
+    """Find the three best matched partners of a project.
 
-                # Now result contains only one element logically (you can reassign if needed)
-                result = [first_partner]
-            # if there is several partners in Partner table, remove all without first one
-            elif len(result) == 1:
-                # result[0] is one partner data of Partner database, so let update linkedindata if it is different from original linkedindata of Partner database.
-                result[0].linkedindata = company_data
-                db.session.commit()  # Commit changes to the database
+    progress_callback(processed, total, top_three) is called after every scored batch
+    with the number of company urls handled so far and the current top 3.
+    Errors are raised to the caller, whose job keeps the last reported top 3.
+    """
+    # Get companies urls at linkedin
+    company_urls = get_all_linkinurls_of_companies(
+        project["country"], project["sector"]
+    )
+    if progress_callback:
+        progress_callback(0, len(company_urls), [])
+
+    # Fetch profiles concurrently and score them batch by batch; the next batch
+    # is already being fetched while the current one is scored
+    matched_scores_and_companies_data = []
+    batches = [
+        company_urls[i:i + SCORING_BATCH_SIZE]
+        for i in range(0, len(company_urls), SCORING_BATCH_SIZE)
+    ]
+    top_three_ids = []
+    stable_batches = 0
+    # a shortlist as large as a batch would pass the whole first batch to the LLM
+    pre_ranker = PreRanker(project, top_k=min(PRERANK_TOP_K, max(SCORING_BATCH_SIZE // 2, 1)))
+    with ThreadPoolExecutor(max_workers=PROFILE_FETCH_WORKERS) as executor:
+        pending = [executor.submit(get_companydata_from_linkedinurl, url) for url in batches[0]] if batches else []
+        for batch_index in range(len(batches)):
+            fetched = pending
+            if batch_index + 1 < len(batches):
+                pending = [executor.submit(get_companydata_from_linkedinurl, url) for url in batches[batch_index + 1]]
+
+            partners = []
+            for future in fetched:
+                try:
+                    partners.append(save_partner(future.result()))
+                except Exception as e:
+                    logging.error(f"Error fetching company profile: {e}")
+            # only candidates close to the project in embedding space reach the LLM
+            partners = pre_ranker.shortlist(partners)
+            db.session.commit()
 
-            else:
-                new_partner = Partner(
-                    # Assign other fields as needed, example:
-                    name=company_data.get("name", ""),
-                    country=company_data.get("location", {}).get("country", "") if isinstance(company_data.get("location"), dict) else company_data.get("country", ""),
-                    sector=company_data.get("industry", ""),
-                    website=company_data.get("website", ""),
-                    linkedindata=company_data,  # assign JSON data here
+            scores = get_matched_scores_between_project_and_companies(project, partners)
+            for partner, matched_score in zip(partners, scores):
+                matched_scores_and_companies_data.append(
+                    {"matched_score": matched_score, "company_data": partner}
                 )
-                db.session.add(new_partner)
-                db.session.commit()
-                result.append(new_partner)
+                print("matching score is ", matched_score)
 
-
-            # if there is data in Partner database, update it.
-            matched_score = get_matched_score_between_project_and_company(
-                project, result[0]
-            )
-            matched_scores_and_companies_data.append(
-                {"matched_score": matched_score, "company_data": result[0]}
+            # stop early once the top 3 stops changing
+            ranking = sorted(
+                matched_scores_and_companies_data,
+                key=lambda x: x["matched_score"],
+                reverse=True,
             )
-            print("matching score is ", matched_score)
+            new_top_three_ids = [item["company_data"].id for item in ranking[:3]]
+            if len(new_top_three_ids) == 3 and new_top_three_ids == top_three_ids:
+                stable_batches += 1
+            else:
+                stable_batches = 0
+            top_three_ids = new_top_three_ids
+            if progress_callback:
+                progress_callback(
+                    min((batch_index + 1) * SCORING_BATCH_SIZE, len(company_urls)),
+                    len(company_urls),
+                    [partner_to_dict(item["company_data"], item["matched_score"]) for item in ranking[:3]],
+                )
+            if stable_batches >= STABLE_BATCHES_TO_STOP:
+                print("Top 3 partners are stable, stopping early.")
+                for future in pending:
+                    future.cancel()
+                break
+
+    # finally get 3 top matched company data
+    sorted_data = sorted(
+        matched_scores_and_companies_data,
+        key=lambda x: x["matched_score"],
+        reverse=True,
+    )
 
-        # finally get 3 top matched company data
-        sorted_data = sorted(
-            matched_scores_and_companies_data,
-            key=lambda x: x["matched_score"],
-            reverse=True,
-        )
+    three_suitable_matched_scores_and_companies_data = sorted_data[:3]
 
-        three_suitable_matched_scores_and_companies_data = sorted_data[:3]
+    three_companies=[]
 
-        three_companies=[]
+    # Only save matches if project has an id (existing opportunity)
+    project_id = project.get("id") if isinstance(project, dict) else (project.id if hasattr(project, "id") else None)
+    
+    if project_id:
+        # find matches of project and then delete all
+        Match.query.filter_by(opportunity=project_id).delete()
+        db.session.commit()
+
+        for item in three_suitable_matched_scores_and_companies_data:
+            score = item["matched_score"]
+            company = item["company_data"]
+
+            new_match = Match(
+                opportunity=project_id,
+                partner=company.id,
+                score=score
+            )
+            db.session.add(new_match)
 
-        # Only save matches if project has an id (existing opportunity)
-        project_id = project.get("id") if isinstance(project, dict) else (project.id if hasattr(project, "id") else None)
-        
-        if project_id:
-            # find matches of project and then delete all
-            Match.query.filter_by(opportunity=project_id).delete()
-            db.session.commit()
+            three_companies.append(partner_to_dict(company, score))
 
-            for item in three_suitable_matched_scores_and_companies_data:
-                score = item["matched_score"]
-                company = item["company_data"]
+        # Commit once after the loop
+        db.session.commit()
 
-                new_match = Match(
-                    opportunity=project_id,
-                    partner=company.id,
-                    score=score
-                )
-                db.session.add(new_match)
-
-                three_companies.append({
-                    "id": company.id,
-                    "name": company.name,
-                    "country": company.country,
-                    "website": company.website,
-                    "sector": company.sector,
-                    "matched_score": score
-                })
-
-            # Commit once after the loop
-            db.session.commit()
+        # set found of project to true.
+        Opportunity.query.filter_by(id=project_id).update({"found": True})
+        db.session.commit()
+    else:
+        # If no project id, just return the companies without saving matches
+        for item in three_suitable_matched_scores_and_companies_data:
+            score = item["matched_score"]
+            company = item["company_data"]
 
-            # set found of project to true.
-            Opportunity.query.filter_by(id=project_id).update({"found": True})
-            db.session.commit()
-        else:
-            # If no project id, just return the companies without saving matches
-            for item in three_suitable_matched_scores_and_companies_data:
-                score = item["matched_score"]
-                company = item["company_data"]
-
-                three_companies.append({
-                    "id": company.id,
-                    "name": company.name,
-                    "country": company.country,
-                    "website": company.website,
-                    "sector": company.sector,
-                    "matched_score": score
-                })
-
-        return three_companies
-    except Exception as e:
-        logging.error(f"Error in get_3suitable_companies_data: {e}")
-        return []
+            three_companies.append(partner_to_dict(company, score))
+
+    return three_companies
 
 
 if __name__ == "__main__":
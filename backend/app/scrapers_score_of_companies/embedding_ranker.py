@@ -0,0 +1,131 @@
+import os
+import re
+import zlib
+import heapq
+import hashlib
+
+import numpy as np
+
+from app.models import Embedding, db
+
+
+# Size of the hashed feature vectors
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "1024"))
+# Candidates per search that are passed on to the LLM scorer, below the scoring batch size so the
+# first batch is already filtered
+PRERANK_TOP_K = int(os.getenv("PRERANK_TOP_K", "5"))
+# Hard cap on the candidates of one search passed on to the LLM scorer, over all its batches
+PRERANK_MAX_SCORED = int(os.getenv("PRERANK_MAX_SCORED", str(2 * PRERANK_TOP_K)))
+
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "its", "of", "on", "or", "our", "the", "this", "to", "we", "with", "will", "your",
+}
+
+
+def tokenize(text):
+    return [token for token in re.findall(r"[a-z0-9]+", text.lower()) if token not in STOP_WORDS and len(token) > 1]
+
+
+def embed_text(text):
+    """Embed text locally with signed feature hashing of unigrams and bigrams (no model, no network)"""
+    tokens = tokenize(text or "")
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    for feature in features:
+        h = zlib.crc32(feature.encode("utf-8"))
+        vector[h % EMBEDDING_DIM] += 1.0 if h & 0x80000000 else -1.0
+    # dampen repeated words, then normalise so a dot product is the cosine similarity
+    vector = np.sign(vector) * np.log1p(np.abs(vector))
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def as_text(value):
+    if isinstance(value, list):
+        return " ".join(as_text(item) for item in value)
+    if isinstance(value, dict):
+        return " ".join(as_text(item) for item in value.values())
+    return str(value or "")
+
+
+def opportunity_text(project):
+    fields = ("project_name", "sector", "summary", "program", "country")
+    if isinstance(project, dict):
+        return " ".join(as_text(project.get(name)) for name in fields)
+    return " ".join(as_text(getattr(project, name, "")) for name in fields)
+
+
+def partner_text(partner):
+    linkedindata = partner.linkedindata if isinstance(partner.linkedindata, dict) else {}
+    parts = [
+        partner.name,
+        partner.sector,
+        linkedindata.get("tagline"),
+        linkedindata.get("description"),
+        linkedindata.get("industry"),
+        linkedindata.get("specialities") or linkedindata.get("specialties"),
+        [hashtag.get("title", "") for hashtag in linkedindata.get("hashtags") or [] if isinstance(hashtag, dict)],
+    ]
+    return " ".join(as_text(part) for part in parts)
+
+
+def get_embedding(owner_type, owner_id, text):
+    """Return the embedding of an opportunity or partner, reusing the stored vector while its text is unchanged"""
+    text_hash = hashlib.sha256(f"{EMBEDDING_DIM}:{text}".encode("utf-8")).hexdigest()
+    if owner_id is None:
+        return embed_text(text)
+
+    row = Embedding.query.filter_by(owner_type=owner_type, owner_id=owner_id).first()
+    if row is not None and row.text_hash == text_hash:
+        return np.frombuffer(row.vector, dtype=np.float32)
+
+    vector = embed_text(text)
+    if row is None:
+        row = Embedding(owner_type=owner_type, owner_id=owner_id)
+        db.session.add(row)
+    row.text_hash = text_hash
+    row.vector = vector.tobytes()
+    return vector
+
+
+class PreRanker:
+    """Shortlists partner candidates of one search by cosine similarity before LLM scoring.
+
+    Candidates arrive in batches and the top_k most similar seen so far are kept
+    in a size-k heap; a candidate is shortlisted when it enters that heap. The cap
+    is approximate: a later batch may still beat earlier shortlisted candidates, so
+    more than top_k can be scored over a search, but never more than max_scored.
+    """
+
+    def __init__(self, project, top_k=PRERANK_TOP_K, max_scored=PRERANK_MAX_SCORED):
+        project_id = project.get("id") if isinstance(project, dict) else getattr(project, "id", None)
+        self.project_vector = get_embedding("opportunity", project_id, opportunity_text(project))
+        self.top_k = top_k
+        self.max_scored = max(max_scored, top_k)
+        self.best = []
+        self.scored = 0
+
+    def shortlist(self, partners):
+        if not partners or self.scored >= self.max_scored:
+            return []
+        vectors = np.vstack([get_embedding("partner", partner.id, partner_text(partner)) for partner in partners])
+        similarities = vectors @ self.project_vector
+
+        shortlisted = []
+        # most similar first, so one batch alone never passes more than top_k
+        for index in np.argsort(-similarities, kind="stable"):
+            similarity = float(similarities[index])
+            if len(self.best) < self.top_k:
+                heapq.heappush(self.best, similarity)
+            elif similarity > self.best[0]:
+                heapq.heapreplace(self.best, similarity)
+            else:
+                # the rest of the batch is less similar still
+                break
+            shortlisted.append(partners[index])
+            self.scored += 1
+            if self.scored >= self.max_scored:
+                break
+        return shortlisted
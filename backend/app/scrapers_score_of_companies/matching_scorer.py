@@ -1,44 +1,60 @@
 from openai import OpenAI
 from dotenv import load_dotenv
 import os
+import re
+import json
 import logging
 
+from app.llm_cache import llm_cache
+
 # Load environment variables from .env file
 load_dotenv()
 
 
-def getOpenAIResponse(prompt, query):
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+def getOpenAIResponse(prompt, query, json_output=False):
+    model = "gpt-4o-mini"  # You can use "gpt-4o", "gpt-3.5-turbo", etc.
+    options = {"response_format": {"type": "json_object"}} if json_output else {}
+
+    def fetch():
+        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+        # Send a chat completion request
+        response = client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": prompt},
+                {"role": "user", "content": query},
+            ],
+            temperature=0.7,  # Controls creativity; 0.0 = strict, 1.0 = more creative
+            **options,
+        )
+        return response.choices[0].message.content
+
+    # Identical prompts are answered from the persistent LLM cache
+    return llm_cache.cached(model, prompt, query, fetch, temperature=0.7, **options)
+
 
-    # Send a chat completion request
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",  # You can use "gpt-4o", "gpt-3.5-turbo", etc.
-        messages=[
-            {"role": "system", "content": prompt},
-            {"role": "user", "content": query},
-        ],
-        temperature=0.7,  # Controls creativity; 0.0 = strict, 1.0 = more creative
-    )
+def field_of(item, name):
+    """Read a field from an ORM object or a dict"""
+    return getattr(item, name) if hasattr(item, name) else item.get(name, '')
 
-    # Print the result
-    return response.choices[0].message.content
+
+def format_project(project):
+    return f"Project: {field_of(project, 'project_name')} - {field_of(project, 'summary')} - Country: {field_of(project, 'country')} - Sector: {field_of(project, 'sector')}"
+
+
+def format_company(company):
+    return f"Company: {field_of(company, 'name')} - Country: {field_of(company, 'country')} - Sector: {field_of(company, 'sector')}"
 
 
 def get_matched_score_between_project_and_company(project, company):
     try:
         prompt = "I will upload project and company data. Please analyze it and then give me matching score only. Output must be only the score as an integer (min:1, max:100). For example, output is '50'. Output must be only the integer number, nothing else."
-        
-        # Format project data
-        project_str = f"Project: {project.project_name if hasattr(project, 'project_name') else project.get('project_name', '')} - {project.summary if hasattr(project, 'summary') else project.get('summary', '')} - Country: {project.country if hasattr(project, 'country') else project.get('country', '')} - Sector: {project.sector if hasattr(project, 'sector') else project.get('sector', '')}"
-        
-        # Format company data
-        company_str = f"Company: {company.name if hasattr(company, 'name') else company.get('name', '')} - Country: {company.country if hasattr(company, 'country') else company.get('country', '')} - Sector: {company.sector if hasattr(company, 'sector') else company.get('sector', '')}"
-        
-        data = f"{project_str}. {company_str}."
+
+        data = f"{format_project(project)}. {format_company(company)}."
         response = getOpenAIResponse(prompt, data)
         
         # Extract numeric score from response
-        import re
         score_match = re.search(r'\d+', str(response))
         if score_match:
             score = int(score_match.group())
@@ -51,3 +67,29 @@ def get_matched_score_between_project_and_company(project, company):
     except Exception as e:
         logging.error(f"Error getting matched score: {e}")
         return 1
+
+
+def get_matched_scores_between_project_and_companies(project, companies):
+    """Score several companies against one project with a single LLM call"""
+    if not companies:
+        return []
+    try:
+        prompt = "I will upload project data and a numbered list of companies. Please analyze them and then give me a matching score for every company. Output must be a JSON object like {\"scores\": [50, 80]} with one integer (min:1, max:100) per company, in the same order as the list, nothing else."
+
+        company_lines = "\n".join(
+            f"{i + 1}. {format_company(company)}" for i, company in enumerate(companies)
+        )
+        data = f"{format_project(project)}.\nCompanies:\n{company_lines}"
+        response = getOpenAIResponse(prompt, data, json_output=True)
+
+        scores = json.loads(response).get("scores")
+        if not isinstance(scores, list) or len(scores) != len(companies):
+            raise ValueError(f"expected {len(companies)} scores, got {scores}")
+        return [max(1, min(100, int(score))) for score in scores]
+    except Exception as e:
+        # Fall back to one call per company so a malformed batch answer does not lose the scores
+        logging.warning(f"Batch scoring failed, scoring companies one by one: {e}")
+        return [
+            get_matched_score_between_project_and_company(project, company)
+            for company in companies
+        ]
@@ -0,0 +1,42 @@
+"""Add partner_job table
+
+Revision ID: 3a1c9e4b7d21
+Revises: f86990301e3b
+Create Date: 2026-10-17 10:12:41.203518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3a1c9e4b7d21'
+down_revision = 'f86990301e3b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'partner_job',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('key', sa.String(length=128), nullable=False),
+        sa.Column('opportunity_id', sa.Integer(), nullable=True),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('processed', sa.Integer(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('partner_job', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_partner_job_key'), ['key'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('partner_job', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_partner_job_key'))
+
+    op.drop_table('partner_job')
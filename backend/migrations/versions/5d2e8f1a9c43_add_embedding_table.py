@@ -0,0 +1,33 @@
+"""Add embedding table
+
+Revision ID: 5d2e8f1a9c43
+Revises: 3a1c9e4b7d21
+Create Date: 2026-10-17 11:03:27.518964
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2e8f1a9c43'
+down_revision = '3a1c9e4b7d21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'embedding',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('owner_type', sa.String(length=32), nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('text_hash', sa.String(length=64), nullable=False),
+        sa.Column('vector', sa.LargeBinary(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('owner_type', 'owner_id', name='uq_embedding_owner')
+    )
+
+
+def downgrade():
+    op.drop_table('embedding')
@@ -0,0 +1,34 @@
+"""Add crawl_state table
+
+Revision ID: 7b4f2c8d1e65
+Revises: 5d2e8f1a9c43
+Create Date: 2026-10-17 14:21:09.342817
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b4f2c8d1e65'
+down_revision = '5d2e8f1a9c43'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'crawl_state',
+        sa.Column('bank', sa.String(length=128), nullable=False),
+        sa.Column('last_seen_urls', sa.Text(), nullable=True),
+        sa.Column('last_published', sa.String(length=64), nullable=True),
+        sa.Column('last_mode', sa.String(length=16), nullable=True),
+        sa.Column('new_projects', sa.Integer(), nullable=False),
+        sa.Column('last_crawl_at', sa.DateTime(), nullable=True),
+        sa.Column('last_full_crawl_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('bank')
+    )
+
+
+def downgrade():
+    op.drop_table('crawl_state')
@@ -0,0 +1,26 @@
+"""Add fingerprint to opportunity
+
+Revision ID: 9c6a1d3e5f87
+Revises: 7b4f2c8d1e65
+Create Date: 2026-10-17 15:02:44.718302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c6a1d3e5f87'
+down_revision = '7b4f2c8d1e65'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('opportunity', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('fingerprint', sa.String(length=64), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('opportunity', schema=None) as batch_op:
+        batch_op.drop_column('fingerprint')
@@ -0,0 +1,70 @@
+"""Add full-text search index of opportunity
+
+Revision ID: a3f9d5b1c8e4
+Revises: e6b1f3a7c9d2
+Create Date: 2026-10-17 21:40:26.183905
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f9d5b1c8e4'
+down_revision = 'e6b1f3a7c9d2'
+branch_labels = None
+depends_on = None
+
+# PostgreSQL weight of each indexed column, same as app.opportunity_search.PG_WEIGHTS
+PG_WEIGHTS = {'project_name': 'A', 'sector': 'B', 'country': 'C', 'summary': 'D'}
+
+FTS_COLUMNS = 'project_name, country, sector, summary'
+FTS_VALUES = 'new.project_name, new.country, new.sector, new.summary'
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute(f"CREATE VIRTUAL TABLE opportunity_fts USING fts5({FTS_COLUMNS})")
+        op.execute(
+            f"INSERT INTO opportunity_fts (rowid, {FTS_COLUMNS}) "
+            f"SELECT id, {FTS_COLUMNS} FROM opportunity"
+        )
+        # the triggers keep the index in sync with every write, bulk upserts included
+        op.execute(
+            f"CREATE TRIGGER opportunity_fts_insert AFTER INSERT ON opportunity BEGIN "
+            f"INSERT INTO opportunity_fts (rowid, {FTS_COLUMNS}) VALUES (new.id, {FTS_VALUES}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER opportunity_fts_update AFTER UPDATE OF {FTS_COLUMNS} ON opportunity BEGIN "
+            f"DELETE FROM opportunity_fts WHERE rowid = old.id; "
+            f"INSERT INTO opportunity_fts (rowid, {FTS_COLUMNS}) VALUES (new.id, {FTS_VALUES}); END"
+        )
+        op.execute(
+            "CREATE TRIGGER opportunity_fts_delete AFTER DELETE ON opportunity BEGIN "
+            "DELETE FROM opportunity_fts WHERE rowid = old.id; END"
+        )
+    elif dialect == 'postgresql':
+        vector = " || ".join(
+            f"setweight(to_tsvector('simple', coalesce({column}, '')), '{weight}')"
+            for column, weight in PG_WEIGHTS.items()
+        )
+        op.execute(
+            f"ALTER TABLE opportunity ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({vector}) STORED"
+        )
+        op.create_index(
+            'ix_opportunity_search_vector', 'opportunity', ['search_vector'], unique=False, postgresql_using='gin'
+        )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS opportunity_fts_delete")
+        op.execute("DROP TRIGGER IF EXISTS opportunity_fts_update")
+        op.execute("DROP TRIGGER IF EXISTS opportunity_fts_insert")
+        op.execute("DROP TABLE IF EXISTS opportunity_fts")
+    elif dialect == 'postgresql':
+        op.drop_index('ix_opportunity_search_vector', table_name='opportunity')
+        with op.batch_alter_table('opportunity', schema=None) as batch_op:
+            batch_op.drop_column('search_vector')
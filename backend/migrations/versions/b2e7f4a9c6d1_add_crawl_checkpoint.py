@@ -0,0 +1,30 @@
+"""Add crawl checkpoint to crawl_state
+
+Revision ID: b2e7f4a9c6d1
+Revises: 9c6a1d3e5f87
+Create Date: 2026-10-17 16:38:12.905126
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2e7f4a9c6d1'
+down_revision = '9c6a1d3e5f87'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('crawl_state', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('cursor', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('pending_urls', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('finished', sa.Boolean(), nullable=False, server_default=sa.true()))
+
+
+def downgrade():
+    with op.batch_alter_table('crawl_state', schema=None) as batch_op:
+        batch_op.drop_column('finished')
+        batch_op.drop_column('pending_urls')
+        batch_op.drop_column('cursor')
@@ -0,0 +1,29 @@
+"""Add updated_at to opportunity
+
+Revision ID: c7e2a4f8b3d6
+Revises: a3f9d5b1c8e4
+Create Date: 2026-10-17 22:18:53.604172
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e2a4f8b3d6'
+down_revision = 'a3f9d5b1c8e4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('opportunity', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_opportunity_updated_at'), ['updated_at'], unique=False)
+    op.execute("UPDATE opportunity SET updated_at = CURRENT_TIMESTAMP")
+
+
+def downgrade():
+    # plain ALTER TABLE: a batch copy of the table on SQLite would drop its full-text triggers
+    op.drop_index('ix_opportunity_updated_at', table_name='opportunity')
+    op.drop_column('opportunity', 'updated_at')
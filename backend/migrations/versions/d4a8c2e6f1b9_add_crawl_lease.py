@@ -0,0 +1,28 @@
+"""Add bank lease to crawl_state
+
+Revision ID: d4a8c2e6f1b9
+Revises: b2e7f4a9c6d1
+Create Date: 2026-10-17 18:05:41.227830
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a8c2e6f1b9'
+down_revision = 'b2e7f4a9c6d1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('crawl_state', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('lease_owner', sa.String(length=128), nullable=True))
+        batch_op.add_column(sa.Column('lease_expires_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('crawl_state', schema=None) as batch_op:
+        batch_op.drop_column('lease_expires_at')
+        batch_op.drop_column('lease_owner')
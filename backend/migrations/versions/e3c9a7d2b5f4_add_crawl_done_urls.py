@@ -0,0 +1,26 @@
+"""Add done_urls to crawl_state
+
+Revision ID: e3c9a7d2b5f4
+Revises: c7e2a4f8b3d6
+Create Date: 2026-10-17 23:41:07.318254
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3c9a7d2b5f4'
+down_revision = 'c7e2a4f8b3d6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('crawl_state', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('done_urls', sa.Text(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('crawl_state', schema=None) as batch_op:
+        batch_op.drop_column('done_urls')
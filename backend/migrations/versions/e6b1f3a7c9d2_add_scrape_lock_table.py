@@ -0,0 +1,30 @@
+"""Add scrape_lock table
+
+Revision ID: e6b1f3a7c9d2
+Revises: d4a8c2e6f1b9
+Create Date: 2026-10-17 19:12:08.540317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6b1f3a7c9d2'
+down_revision = 'd4a8c2e6f1b9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'scrape_lock',
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('owner', sa.String(length=128), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('scrape_lock')
@@ -0,0 +1,33 @@
+"""Add unique index on the key of active partner jobs
+
+Revision ID: f2b8d4c6a1e9
+Revises: e3c9a7d2b5f4
+Create Date: 2026-10-18 00:12:36.584190
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2b8d4c6a1e9'
+down_revision = 'e3c9a7d2b5f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # jobs queued before the upgrade died with their process, and may hold a key twice
+    op.execute(
+        "UPDATE partner_job SET status = 'failed', error = 'worker stopped before the search finished' "
+        "WHERE status IN ('queued', 'running')"
+    )
+    op.create_index(
+        'uq_partner_job_active_key', 'partner_job', ['key'], unique=True,
+        sqlite_where=sa.text("status IN ('queued', 'running')"),
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+
+
+def downgrade():
+    op.drop_index('uq_partner_job_active_key', table_name='partner_job')
@@ -0,0 +1,49 @@
+import queue
+import asyncio
+import threading
+
+import pytest
+
+try:
+    from app.scrapers_of_projects.bank_scraper import BankScraperBase
+    from app.scrapers_of_projects.detail_workers import queue_urls
+except ImportError as e:
+    pytest.skip(f"scraper dependencies are not installed: {e}", allow_module_level=True)
+
+
+class StoppedDuringDetailScraper(BankScraperBase):
+    """Detail page handler written like the bank subclasses: a broad fallback around its waits"""
+
+    def get_name(self):
+        return "Test Bank"
+
+    async def extract_project_data(self, url):
+        fields = {"url": url, "title": "Half read"}
+        try:
+            # the crawl is stopped while the page is being read
+            self.stop_event.set()
+            await self.pause(1)
+        except Exception as e:
+            print(f"Failed to scrape pdf content: {e}")
+        await self.save_to_database(fields)
+        return fields
+
+
+def test_cancelled_detail_page_is_not_saved_and_stays_queued():
+    scraper = StoppedDuringDetailScraper()
+    scraper.stop_event = threading.Event()
+    scraper.collected = []
+    work = queue_urls(["https://example.org/project/1", "https://example.org/project/2"])
+
+    asyncio.run(scraper.extract_detail_queue(work))
+
+    assert scraper.collected == []
+    assert scraper.sink.pending == {}
+    left = []
+    while True:
+        try:
+            left.append(work.get_nowait())
+        except queue.Empty:
+            break
+    # both pages are left for the checkpoint, the interrupted one included
+    assert sorted(left) == ["https://example.org/project/1", "https://example.org/project/2"]
@@ -0,0 +1,73 @@
+import types
+
+import pytest
+
+try:
+    import numpy as np
+
+    from app.scrapers_score_of_companies import embedding_ranker
+    from app.scrapers_score_of_companies.embedding_ranker import PreRanker
+except ImportError as e:
+    pytest.skip(f"app dependencies are not installed: {e}", allow_module_level=True)
+
+
+def make_partner(partner_id):
+    return types.SimpleNamespace(id=partner_id, name=f"Partner {partner_id}", sector="", linkedindata={})
+
+
+@pytest.fixture
+def similarities(monkeypatch):
+    """Give every partner the similarity stored under its id, against a project on the first axis"""
+    values = {}
+
+    def fake_embedding(owner_type, owner_id, text):
+        if owner_type == "opportunity":
+            return np.array([1.0, 0.0], dtype=np.float32)
+        similarity = values[owner_id]
+        return np.array([similarity, np.sqrt(1.0 - similarity ** 2)], dtype=np.float32)
+
+    monkeypatch.setattr(embedding_ranker, "get_embedding", fake_embedding)
+    return values
+
+
+def run_batches(ranker, similarities, batches):
+    """Feed batches of similarities to the ranker, returning the ids shortlisted per batch"""
+    shortlisted = []
+    next_id = 0
+    for batch in batches:
+        partners = []
+        for similarity in batch:
+            similarities[next_id] = similarity
+            partners.append(make_partner(next_id))
+            next_id += 1
+        shortlisted.append([partner.id for partner in ranker.shortlist(partners)])
+    return shortlisted
+
+
+def test_single_batch_passes_the_top_k(similarities):
+    ranker = PreRanker({"project_name": "Solar"}, top_k=3, max_scored=10)
+    shortlisted = run_batches(ranker, similarities, [[0.1, 0.9, 0.5, 0.7, 0.3]])
+    assert shortlisted == [[1, 3, 2]]
+
+
+def test_later_worse_batches_are_not_scored(similarities):
+    ranker = PreRanker({"project_name": "Solar"}, top_k=3, max_scored=10)
+    batches = [[0.9, 0.8, 0.7, 0.6], [0.5, 0.4, 0.3, 0.2], [0.1, 0.05, 0.02, 0.01]]
+    shortlisted = run_batches(ranker, similarities, batches)
+    assert [len(ids) for ids in shortlisted] == [3, 0, 0]
+    assert ranker.scored == 3
+
+
+def test_improving_batches_are_capped_at_max_scored(similarities):
+    ranker = PreRanker({"project_name": "Solar"}, top_k=3, max_scored=7)
+    batches = [[0.1 + 0.2 * batch + 0.01 * i for i in range(4)] for batch in range(4)]
+    shortlisted = run_batches(ranker, similarities, batches)
+    # every batch beats the previous one, but the search never scores more than max_scored
+    assert [len(ids) for ids in shortlisted] == [3, 3, 1, 0]
+    assert ranker.scored == 7
+
+
+def test_default_shortlist_filters_the_first_batch(similarities):
+    ranker = PreRanker({"project_name": "Solar"})
+    shortlisted = run_batches(ranker, similarities, [[0.05 * i for i in range(1, 11)]])
+    assert len(shortlisted[0]) < 10